@@ -0,0 +1,284 @@
+import asyncio
+import json
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Optional
+
+from fastapi import Depends, HTTPException, Request
+
+from api.auth import get_current_user
+from api.config import settings
+from api.metrics import ADMISSION_ACTIVE, ADMISSION_QUEUED, ADMISSION_SHED, ADMISSION_WAIT, RATE_LIMITED
+
+# ==========================================
+# Admission Control
+# ==========================================
+# Under NullPool every in-flight request holds its own Postgres connection, so a spike turns
+# into more connections than PgBouncer / Supabase allow and then every request fails. The
+# AdmissionMiddleware lets ADMISSION_MAX_CONCURRENT requests per process run; the next
+# ADMISSION_MAX_QUEUE wait in FIFO order for at most ADMISSION_QUEUE_TIMEOUT seconds, and the
+# rest are shed at once with 503 + Retry-After. Admitted requests then see at most
+# (timeout + their own run time) of latency however deep the overload, and a shed request
+# costs no connection at all. A slot is held until the response is fully sent (streamed
+# exports read the database while they send). Paths that don't touch the database (health,
+# metrics, docs) and the long-lived /api/live streams are not counted.
+#
+# Volunteer writes (join, feedback, bookmarks) also go through token buckets, one per user
+# and one per client IP (limit_writes), answered 429 + Retry-After when empty:
+#   - memory: per process (fine for one worker; N workers allow N times the rate)
+#   - redis:  one bucket shared by every worker and serverless instance (Redis 5+)
+# A backend failure lets the write through: rate limiting must never take the API down.
+
+EXEMPT_PREFIXES = ("/api/health", "/api/metrics", "/api/live", "/api/docs", "/api/openapi.json")
+
+def is_exempt(scope) -> bool:
+    path = scope["path"]
+    return scope["method"] == "OPTIONS" or not path.startswith("/api/") or path == "/api/" or path.startswith(EXEMPT_PREFIXES)
+
+class ConcurrencyLimiter:
+    """A FIFO semaphore with a bounded, timed queue. Used from the event loop only."""
+
+    def __init__(self):
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.queued = 0
+        self.shed = {"queue_full": 0, "timeout": 0}
+
+    async def acquire(self) -> Optional[str]:
+        """None once a slot is held (release it), else why the request is shed."""
+        if self.active < settings.ADMISSION_MAX_CONCURRENT:
+            self.active += 1
+            self.admitted += 1
+            return None
+        if len(self._waiters) >= settings.ADMISSION_MAX_QUEUE:
+            return self._shed("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        ADMISSION_QUEUED.inc()
+        try:
+            await asyncio.wait((waiter,), timeout=settings.ADMISSION_QUEUE_TIMEOUT)
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        finally:
+            ADMISSION_QUEUED.dec()
+        if waiter.done():
+            self.admitted += 1
+            return None
+        self._abandon(waiter)
+        return self._shed("timeout")
+
+    def release(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # The slot passes straight to the oldest waiter
+                return
+        self.active -= 1
+
+    def _abandon(self, waiter: asyncio.Future):
+        if waiter.done():  # Handed a slot just as it gave up: pass it on
+            self.release()
+        else:
+            waiter.cancel()
+            self._waiters.remove(waiter)
+
+    def _shed(self, reason: str) -> str:
+        self.shed[reason] += 1
+        ADMISSION_SHED.inc(reason)
+        return reason
+
+    def stats(self) -> dict:
+        return {
+            "maxConcurrent": settings.ADMISSION_MAX_CONCURRENT,
+            "maxQueue": settings.ADMISSION_MAX_QUEUE,
+            "queueTimeoutSeconds": settings.ADMISSION_QUEUE_TIMEOUT,
+            "active": self.active,
+            "waiting": len(self._waiters),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed": dict(self.shed),
+        }
+
+limiter = ConcurrencyLimiter()
+
+class AdmissionMiddleware:
+    """Pure ASGI, like SQLInstrumentationMiddleware. Added inside CORS so a 503 still carries its headers."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or settings.ADMISSION_MAX_CONCURRENT <= 0 or is_exempt(scope):
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        if await limiter.acquire() is not None:
+            await overloaded(send)
+            return
+        ADMISSION_WAIT.observe(time.perf_counter() - started)
+        ADMISSION_ACTIVE.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            ADMISSION_ACTIVE.dec()
+            limiter.release()
+
+async def overloaded(send):
+    body = json.dumps({"detail": "Server is busy, please retry shortly"}).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("ascii")),
+            (b"retry-after", str(settings.ADMISSION_RETRY_AFTER).encode("ascii")),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+# ==========================================
+# Token Buckets (volunteer writes)
+# ==========================================
+
+class TokenBucketBackend:
+    name = "base"
+
+    async def take(self, key: str, per_second: float, burst: int) -> float:
+        """Takes one token: 0 when there was one, else the seconds until there is."""
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        return {}
+
+class MemoryTokenBuckets(TokenBucketBackend):
+    """Per-process buckets: key -> (tokens, monotonic time of the last update), LRU-bounded."""
+
+    name = "memory"
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (tokens, updated)
+
+    async def take(self, key: str, per_second: float, burst: int) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (float(burst), now))
+        tokens = min(float(burst), tokens + (now - updated) * per_second)
+        wait = 0.0 if tokens >= 1 else (1 - tokens) / per_second
+        self._buckets[key] = (tokens - 1 if not wait else tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)  # A dropped bucket comes back full
+        return wait
+
+    def stats(self) -> dict:
+        return {"buckets": len(self._buckets)}
+
+class RedisTokenBuckets(TokenBucketBackend):
+    """
+    Shared buckets for multi-worker / serverless deployments: one hash per key, refilled and
+    taken from atomically by a Lua script on the server's clock. Idle buckets expire once full.
+    """
+
+    name = "redis"
+
+    SCRIPT = """
+    local per_second, burst = tonumber(ARGV[1]), tonumber(ARGV[2])
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or burst
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - updated) * per_second)
+    local wait = 0
+    if tokens >= 1 then tokens = tokens - 1 else wait = (1 - tokens) / per_second end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / per_second) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, url: str, prefix: str = "umission:ratelimit:"):
+        import redis.asyncio as redis  # Optional dependency, only needed for this backend
+
+        self._client = redis.Redis.from_url(url)
+        self._take = self._client.register_script(self.SCRIPT)
+        self.prefix = prefix
+
+    async def take(self, key: str, per_second: float, burst: int) -> float:
+        return float(await self._take(keys=[self.prefix + key], args=[per_second, burst]))
+
+class RateLimiter:
+    """Allowed/limited accounting around a backend. Backend failures let the request through."""
+
+    def __init__(self, backend: Optional[TokenBucketBackend]):
+        self.backend = backend
+        self.allowed = 0
+        self.limited = {"user": 0, "ip": 0}
+        self.errors = 0
+
+    async def check(self, user_id: str, client_ip: Optional[str]) -> float:
+        """0 when both buckets had a token, else the seconds to wait (the IP bucket is spared if the user's is empty)."""
+        buckets = [("user", f"user:{user_id}", settings.RATE_LIMIT_USER_PER_MINUTE, settings.RATE_LIMIT_USER_BURST)]
+        if client_ip:
+            buckets.append(("ip", f"ip:{client_ip}", settings.RATE_LIMIT_IP_PER_MINUTE, settings.RATE_LIMIT_IP_BURST))
+        for bucket, key, per_minute, burst in buckets:
+            try:
+                wait = await self.backend.take(key, per_minute / 60, burst)
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠️ Rate limit check failed, allowing the request: {e}", flush=True)
+                return 0.0
+            if wait:
+                self.limited[bucket] += 1
+                RATE_LIMITED.inc(bucket)
+                return wait
+        self.allowed += 1
+        return 0.0
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend.name if self.backend is not None else "off",
+            "userPerMinute": settings.RATE_LIMIT_USER_PER_MINUTE,
+            "ipPerMinute": settings.RATE_LIMIT_IP_PER_MINUTE,
+            "allowed": self.allowed,
+            "limited": dict(self.limited),
+            "errors": self.errors,
+            **(self.backend.stats() if self.backend is not None else {}),
+        }
+
+def build_backend() -> Optional[TokenBucketBackend]:
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        if not settings.RATE_LIMIT_REDIS_URL:
+            raise ValueError("RATE_LIMIT_REDIS_URL is required when RATE_LIMIT_BACKEND=redis")
+        return RedisTokenBuckets(settings.RATE_LIMIT_REDIS_URL)
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        return MemoryTokenBuckets(settings.RATE_LIMIT_MAX_KEYS)
+    return None
+
+rate_limiter = RateLimiter(build_backend())
+
+def client_ip(request: Request) -> Optional[str]:
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for", "").split(",")[0].strip()
+        if forwarded:
+            return forwarded
+    return request.client.host if request.client else None
+
+async def limit_writes(request: Request, current_user: dict = Depends(get_current_user)):
+    """Route dependency for volunteer writes (the verified user is resolved once per request)."""
+    if rate_limiter.backend is None:
+        return
+    wait = await rate_limiter.check(current_user.get("sub"), client_ip(request))
+    if wait:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests, please slow down",
+            headers={"Retry-After": str(max(1, math.ceil(wait)))},
+        )
+
+def get_admission_stats() -> dict:
+    return {"concurrency": limiter.stats(), "rateLimit": rate_limiter.stats()}
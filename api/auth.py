@@ -1,20 +1,239 @@
-import httpx
-from typing import Optional
-from fastapi import HTTPException, Security
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Optional
+
+from fastapi import HTTPException, Query, Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import jwt
 
 from api.config import settings
+from api.instrumentation import span
+from api.metrics import JWKS_FETCH_DURATION, JWKS_FETCHES
+
+if TYPE_CHECKING:
+    import httpx
+
+# httpx (with certifi/ssl) and python-jose (with its crypto backend) are imported on first
+# use: serverless cold starts that never verify a token (health checks, anonymous feeds,
+# cron) don't pay for them.
 
 security = HTTPBearer()
+# Optional auth: a missing Authorization header means anonymous, not 403
+optional_security = HTTPBearer(auto_error=False)
+
+# ==========================================
+# JWKS Key Cache
+# ==========================================
+
+_http_client: Optional["httpx.AsyncClient"] = None
+
+def get_http_client() -> "httpx.AsyncClient":
+    """
+    Returns the process-wide HTTP client.
+    Reusing one client keeps the TLS connection to Clerk alive between refreshes.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        import httpx
+
+        _http_client = httpx.AsyncClient(timeout=settings.JWKS_HTTP_TIMEOUT)
+    return _http_client
+
+async def close_http_client():
+    """Close the shared HTTP client (called on app shutdown)."""
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+
+class JWKSCache:
+    """
+    Process-wide cache of Clerk's signing keys, indexed by 'kid'.
+
+    - Fresh keys (younger than JWKS_CACHE_TTL) are served without any network call.
+    - Stale keys are still served, but trigger one background refresh (stale-while-revalidate).
+    - An unknown 'kid' forces a refresh (key rotation), rate limited by JWKS_MIN_REFRESH_INTERVAL.
+    - Only one refresh runs at a time; concurrent callers await the same in-flight task,
+      shielded so a caller that is cancelled (client gone) doesn't cancel it for the rest.
+    """
+
+    def __init__(self):
+        self.keys: Dict[str, dict] = {}
+        self.fetched_at: float = 0.0
+        self.last_attempt: float = 0.0
+        self.fetch_count: int = 0
+        self.fetch_errors: int = 0
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def clear(self):
+        self.keys = {}
+        self.fetched_at = 0.0
+        self.last_attempt = 0.0
+        self._refresh_task = None
+
+    def _age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    async def _fetch(self, jwks_url: str):
+        self.last_attempt = time.monotonic()
+        self.fetch_count += 1
+        started = time.perf_counter()
+        try:
+            response = await get_http_client().get(jwks_url)
+            if response.status_code != 200:
+                print(f"Auth Error: Failed to fetch JWKS from {jwks_url}. Status: {response.status_code}")
+                raise Exception("JWKS Fetch Failed")
+            jwks = response.json()
+        except Exception:
+            self.fetch_errors += 1
+            JWKS_FETCHES.inc("error")
+            raise
+        finally:
+            JWKS_FETCH_DURATION.observe(time.perf_counter() - started)
+        JWKS_FETCHES.inc("ok")
+
+        self.keys = {
+            key["kid"]: {
+                "kty": key["kty"],
+                "kid": key["kid"],
+                "use": key.get("use", "sig"),
+                "n": key["n"],
+                "e": key["e"]
+            }
+            for key in jwks.get("keys", [])
+            if key.get("kid")
+        }
+        self.fetched_at = time.monotonic()
+
+    def refresh(self, jwks_url: str) -> asyncio.Task:
+        """Start a refresh, or join the one already in flight (single-flight)."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._fetch(jwks_url))
+        return self._refresh_task
+
+    def _revalidate_in_background(self, jwks_url: str):
+        def log_failure(task: asyncio.Task):
+            # Errors are logged and swallowed: the stale keys stay in use until the next attempt.
+            if not task.cancelled() and task.exception():
+                print(f"⚠️ Background JWKS refresh failed: {task.exception()}")
+
+        self.refresh(jwks_url).add_done_callback(log_failure)
+
+    async def get_key(self, kid: Optional[str], jwks_url: str) -> Optional[dict]:
+        age = self._age()
+        key = self.keys.get(kid)
+
+        if key:
+            if age > settings.JWKS_CACHE_TTL + settings.JWKS_STALE_TTL:
+                # Too old to trust: block on a refresh, but fall back to the old key if Clerk is down
+                try:
+                    await asyncio.shield(self.refresh(jwks_url))
+                except Exception as e:
+                    print(f"⚠️ JWKS refresh failed, using expired keys: {e}")
+                return self.keys.get(kid, key)
+            if age > settings.JWKS_CACHE_TTL:
+                self._revalidate_in_background(jwks_url)
+            return key
+
+        # Unknown kid: either first use or Clerk rotated its keys.
+        since_attempt = time.monotonic() - self.last_attempt
+        if self.keys and since_attempt < settings.JWKS_MIN_REFRESH_INTERVAL:
+            return None
+        await asyncio.shield(self.refresh(jwks_url))
+        return self.keys.get(kid)
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self.keys),
+            "ageSeconds": round(self._age(), 1) if self.fetched_at else None,
+            "fetches": self.fetch_count,
+            "fetchErrors": self.fetch_errors,
+        }
+
+jwks_cache = JWKSCache()
+
+# ==========================================
+# Verified Token Cache
+# ==========================================
+
+class TokenCache:
+    """
+    Bounded LRU of already-verified token payloads.
+    Keyed by SHA-256 of the raw token; an entry is only served until the token's 'exp'.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[dict]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        payload, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def put(self, token: str, payload: dict):
+        exp = payload.get("exp")
+        if self.max_size <= 0 or not isinstance(exp, (int, float)):
+            return
+        key = self._key(token)
+        self._entries[key] = (payload, float(exp))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxSize": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE)
+
+def get_auth_cache_stats() -> dict:
+    """Snapshot of the JWKS and token cache counters."""
+    return {"jwks": jwks_cache.stats(), "tokens": token_cache.stats()}
+
+# ==========================================
+# Dependencies
+# ==========================================
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Security(security)):
     """
     Validates the Clerk JWT token found in the Authorization header.
     Returns the decoded token payload (dict) containing user info.
     """
-    token = credentials.credentials
-    
+    with span("auth"):
+        return await _verify_token(credentials.credentials)
+
+async def _verify_token(token: str) -> dict:
+    from jose import jwt
+
     if not settings.CLERK_ISSUER:
         print("WARNING: CLERK_ISSUER not set in environment. Skipping verification.")
     
@@ -23,29 +242,16 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Security(
         jwks_url = f"{settings.CLERK_ISSUER}/.well-known/jwks.json" if settings.CLERK_ISSUER else None
         
         if jwks_url:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(jwks_url)
-                if response.status_code != 200:
-                    print(f"Auth Error: Failed to fetch JWKS from {jwks_url}. Status: {response.status_code}")
-                    raise Exception("JWKS Fetch Failed")
-                jwks = response.json()
-
-            # 2. Match the Key ID (kid)
+            cached = token_cache.get(token)
+            if cached is not None:
+                return cached
+
+            # 2. Match the Key ID (kid) against the cached key set
             unverified_header = jwt.get_unverified_header(token)
             token_kid = unverified_header.get("kid")
 
-            rsa_key = {}
-            for key in jwks["keys"]:
-                if key["kid"] == token_kid:
-                    rsa_key = {
-                        "kty": key["kty"],
-                        "kid": key["kid"],
-                        "use": key["use"],
-                        "n": key["n"],
-                        "e": key["e"]
-                    }
-                    break
-            
+            rsa_key = await jwks_cache.get_key(token_kid, jwks_url)
+
             if not rsa_key:
                 print(f"Auth Error: Token KID {token_kid} not found in Clerk JWKS.")
                 raise HTTPException(status_code=401, detail="Invalid token signature key")
@@ -58,6 +264,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Security(
                 audience=None,
                 issuer=settings.CLERK_ISSUER
             )
+            token_cache.put(token, payload)
         else:
             # Fallback for local testing (NOT SECURE in production)
             payload = jwt.get_unverified_claims(token)
@@ -71,7 +278,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Security(
         print(f"------------------------")
         raise HTTPException(status_code=401, detail="Could not validate credentials")
 
-async def get_current_user_optional(credentials: Optional[HTTPAuthorizationCredentials] = Security(security, use_cache=False)) -> Optional[dict]:
+async def get_current_user_optional(credentials: Optional[HTTPAuthorizationCredentials] = Security(optional_security)) -> Optional[dict]:
     """
     Validation for optional endpoints.
     Returns user payload if valid token exists, else None.
@@ -83,6 +290,20 @@ async def get_current_user_optional(credentials: Optional[HTTPAuthorizationCrede
     except HTTPException:
         return None
 
+async def get_stream_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Security(optional_security),
+    access_token: Optional[str] = Query(default=None, description="For EventSource, which can't send headers"),
+) -> Optional[dict]:
+    """
+    Optional auth for streaming endpoints: the Authorization header, or `access_token` in the
+    query string. None when neither is given; an invalid token is still a 401.
+    """
+    token = credentials.credentials if credentials else access_token
+    if not token:
+        return None
+    with span("auth"):
+        return await _verify_token(token)
+
 def is_organizer(user_payload: dict) -> bool:
     """
     Helper to check if the user has the 'organizer' role.
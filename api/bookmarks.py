@@ -0,0 +1,106 @@
+from typing import List, Optional, Sequence
+
+from sqlalchemy import update
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api.database import dialect_insert
+from api.models import Bookmark, BookmarkCounter
+
+# ==========================================
+# Idempotent Bookmarks & Delta Sync
+# ==========================================
+# Bookmarks are set or cleared, never toggled, so a retried request can't undo itself:
+#   - add:    INSERT ... ON CONFLICT (userId, eventId) DO UPDATE ... WHERE removed, so a
+#             live bookmark is left alone and only a tombstone comes back
+#   - remove: UPDATE ... SET removed = true WHERE NOT removed (the row stays as a tombstone)
+# Only when one of them changed rows does the write take the user's next version from
+# BookmarkCounter (an atomic upsert, like the waitlist tickets; on Postgres its row lock also
+# orders one user's concurrent writes until commit) and stamp those rows with it
+# (stamp_bookmarks). A repeated request writes nothing and returns the current version.
+# A client that remembers the last version it saw gets only what changed after it
+# (bookmark_delta). Versions only grow; gaps are normal.
+
+MAX_SYNC_CHANGES = 500
+
+async def next_bookmark_version(session: AsyncSession, user_id: str) -> int:
+    stmt = dialect_insert(BookmarkCounter).values(userId=user_id, lastVersion=1)
+    return (await session.exec(
+        stmt.on_conflict_do_update(
+            index_elements=[BookmarkCounter.userId],
+            set_={"lastVersion": BookmarkCounter.lastVersion + 1}
+        ).returning(BookmarkCounter.lastVersion)
+    )).scalar()
+
+async def current_bookmark_version(session: AsyncSession, user_id: str) -> int:
+    return (await session.exec(
+        select(BookmarkCounter.lastVersion).where(BookmarkCounter.userId == user_id)
+    )).first() or 0
+
+async def add_bookmarks(session: AsyncSession, user_id: str, event_ids: Sequence[str]) -> List[str]:
+    """Bookmarks every event in one statement. Returns the ids that weren't bookmarked yet (to stamp)."""
+    if not event_ids:
+        return []
+    stmt = dialect_insert(Bookmark).values([
+        Bookmark(userId=user_id, eventId=event_id).model_dump() for event_id in event_ids
+    ])
+    return list((await session.exec(
+        stmt.on_conflict_do_update(
+            index_elements=[Bookmark.userId, Bookmark.eventId],
+            set_={"removed": False},
+            where=col(Bookmark.removed),
+        ).returning(Bookmark.eventId)
+    )).scalars().all())
+
+async def remove_bookmarks(session: AsyncSession, user_id: str, event_ids: Sequence[str]) -> List[str]:
+    """Clears every bookmark in one statement. Returns the ids that were bookmarked (to stamp)."""
+    if not event_ids:
+        return []
+    return list((await session.exec(
+        update(Bookmark)
+        .where(Bookmark.userId == user_id, col(Bookmark.eventId).in_(event_ids), ~col(Bookmark.removed))
+        .values(removed=True)
+        .returning(Bookmark.eventId)
+        .execution_options(synchronize_session=False)
+    )).scalars().all())
+
+async def stamp_bookmarks(session: AsyncSession, user_id: str, changed: Sequence[str]) -> int:
+    """
+    Gives the bookmarks just changed by add/remove_bookmarks the user's next version and
+    returns it. With nothing changed, returns the current version and writes nothing.
+    """
+    if not changed:
+        return await current_bookmark_version(session, user_id)
+    version = await next_bookmark_version(session, user_id)
+    await session.exec(
+        update(Bookmark)
+        .where(Bookmark.userId == user_id, col(Bookmark.eventId).in_(changed))
+        .values(version=version)
+        .execution_options(synchronize_session=False)
+    )
+    return version
+
+async def bookmark_delta(session: AsyncSession, user_id: str, since: Optional[int], version: Optional[int] = None) -> dict:
+    """
+    The user's bookmarks changed after version `since`: {version, full, added, removed}.
+    Without `since` (or with one from the future, e.g. another database) it is the full list
+    (`full: true`). `version` is the current one when the caller just wrote; otherwise it is
+    read first, so every row up to it is already committed when the rows are read.
+    """
+    if version is None:
+        version = await current_bookmark_version(session, user_id)
+    if since is None or since > version:
+        added = (await session.exec(
+            select(Bookmark.eventId).where(Bookmark.userId == user_id, ~col(Bookmark.removed))
+        )).all()
+        return {"version": version, "full": True, "added": list(added), "removed": []}
+
+    rows = (await session.exec(
+        select(Bookmark.eventId, Bookmark.removed).where(Bookmark.userId == user_id, Bookmark.version > since)
+    )).all()
+    return {
+        "version": version,
+        "full": False,
+        "added": [event_id for event_id, removed in rows if not removed],
+        "removed": [event_id for event_id, removed in rows if removed],
+    }
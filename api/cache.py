@@ -0,0 +1,347 @@
+import gzip
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set
+
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from api.conditional import is_not_modified, not_modified, parse_http_date, validator_headers
+from api.config import settings
+
+# ==========================================
+# Response Cache (anonymous event feed)
+# ==========================================
+# Stores fully encoded response bodies (plus a pre-gzipped copy) keyed by normalized query
+# parameters, so a hit costs no query and no serialization. Entries carry tags; writes
+# invalidate by tag:
+#   - "events":     any cached feed page (a created/edited/status-changed event can enter
+#                   or leave any filter combination)
+#   - "event:{id}": pages that contain that event (its counters changed, membership didn't)
+# TTL bounds staleness for writes made by other processes when the backend is per-process,
+# and for a page computed just before a concurrent write but stored just after its invalidation.
+
+FEED_TAG = "events"
+
+def event_tag(event_id: str) -> str:
+    return f"event:{event_id}"
+
+class CachedResponse:
+    """An encoded response body with its validators."""
+
+    __slots__ = ("body", "gzipped", "etag", "last_modified")
+
+    def __init__(self, body: bytes, gzipped: Optional[bytes], etag: str, last_modified: Optional[str]):
+        self.body = body
+        self.gzipped = gzipped
+        self.etag = etag
+        # Already formatted as an HTTP date
+        self.last_modified = last_modified
+
+    @classmethod
+    def build(cls, body: bytes, etag: str, last_modified: Optional[str]) -> "CachedResponse":
+        # Same threshold as the GZipMiddleware: tiny bodies aren't worth compressing
+        gzipped = None
+        if settings.RESPONSE_CACHE_GZIP and len(body) >= 1000:
+            gzipped = gzip.compress(body, compresslevel=6)
+        return cls(body, gzipped, etag, last_modified)
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.gzipped or b"")
+
+class CacheBackend:
+    """Storage interface for the response cache. Implementations must be thread-safe (jobs invalidate from the threadpool)."""
+
+    name = "base"
+    # Calls wait on the network: ResponseCache runs them in the threadpool, off the event loop
+    blocking = False
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: CachedResponse, tags: Iterable[str]):
+        raise NotImplementedError
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        raise NotImplementedError
+
+class NullCacheBackend(CacheBackend):
+    """RESPONSE_CACHE_BACKEND=off: every lookup misses, nothing is stored."""
+
+    name = "off"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        return None
+
+    def set(self, key: str, value: CachedResponse, tags: Iterable[str]):
+        pass
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        return 0
+
+    def clear(self):
+        pass
+
+    def stats(self) -> dict:
+        return {}
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Per-process LRU with TTL and a tag -> keys index.
+    Bounded by entry count; the least recently used entry is evicted first.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (value, expires_at, tags)
+        self._tags: Dict[str, Set[str]] = {}
+        self.bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _drop(self, key: str):
+        value, _, tags = self._entries.pop(key)
+        self.bytes -= value.size
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value: CachedResponse, tags: Iterable[str]):
+        if self.max_entries <= 0:
+            return
+        tags = frozenset(tags)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, time.monotonic() + self.ttl, tags)
+            self.bytes += value.size
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys |= self._tags.get(tag, set())
+            for key in keys:
+                self._drop(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "bytes": self.bytes,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared backend for multi-worker deployments: any Redis-protocol server (Redis, Valkey,
+    a local stand-in) reachable at RESPONSE_CACHE_REDIS_URL. Expiry and LRU eviction are
+    left to the server (EXPIRE + maxmemory-policy); tags are Redis sets of keys.
+    """
+
+    name = "redis"
+    blocking = True
+
+    def __init__(self, url: str, ttl: int, prefix: str = "umission:cache:"):
+        import redis  # Optional dependency, only needed for this backend
+
+        self._client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+        self.invalidations = 0
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        fields = self._client.hgetall(self.prefix + key)
+        if not fields or b"body" not in fields:
+            return None
+        last_modified = fields.get(b"lastModified")
+        return CachedResponse(
+            fields[b"body"],
+            fields.get(b"gzip") or None,
+            fields[b"etag"].decode("ascii"),
+            last_modified.decode("ascii") if last_modified else None,
+        )
+
+    def set(self, key: str, value: CachedResponse, tags: Iterable[str]):
+        mapping = {"body": value.body, "etag": value.etag}
+        if value.gzipped:
+            mapping["gzip"] = value.gzipped
+        if value.last_modified:
+            mapping["lastModified"] = value.last_modified
+        pipe = self._client.pipeline()
+        pipe.delete(self.prefix + key)
+        pipe.hset(self.prefix + key, mapping=mapping)
+        pipe.expire(self.prefix + key, self.ttl)
+        for tag in tags:
+            pipe.sadd(self._tag_key(tag), key)
+            # A tag set never outlives the entries it points to by more than one TTL
+            pipe.expire(self._tag_key(tag), self.ttl)
+        pipe.execute()
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        keys = set()
+        for tag in tags:
+            keys |= {member.decode("utf-8") for member in self._client.smembers(self._tag_key(tag))}
+        pipe = self._client.pipeline()
+        for key in keys:
+            pipe.delete(self.prefix + key)
+        for tag in tags:
+            pipe.delete(self._tag_key(tag))
+        pipe.execute()
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self):
+        keys = list(self._client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self._client.delete(*keys)
+
+    def stats(self) -> dict:
+        return {"invalidations": self.invalidations}
+
+class ResponseCache:
+    """Hit/miss accounting around a backend. Backend failures degrade to a miss, never to an error."""
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return not isinstance(self.backend, NullCacheBackend)
+
+    async def _call(self, method, *args):
+        if self.backend.blocking:
+            return await run_in_threadpool(method, *args)
+        return method(*args)
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            value = await self._call(self.backend.get, key)
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ Response cache read failed: {e}", flush=True)
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: CachedResponse, tags: Iterable[str]):
+        try:
+            await self._call(self.backend.set, key, value, tags)
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ Response cache write failed: {e}", flush=True)
+
+    async def invalidate(self, *tags: str) -> int:
+        try:
+            return await self._call(self.backend.invalidate_tags, tags)
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ Response cache invalidation failed: {e}", flush=True)
+            return 0
+
+    def invalidate_sync(self, *tags: str) -> int:
+        """For code already running in a worker thread (jobs), where blocking is fine."""
+        try:
+            return self.backend.invalidate_tags(tags)
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ Response cache invalidation failed: {e}", flush=True)
+            return 0
+
+    def clear(self):
+        self.backend.clear()
+        self.hits = self.misses = self.errors = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "ttlSeconds": settings.RESPONSE_CACHE_TTL,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 3) if lookups else None,
+            "errors": self.errors,
+            **self.backend.stats(),
+        }
+
+def build_backend() -> CacheBackend:
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        if not settings.RESPONSE_CACHE_REDIS_URL:
+            raise ValueError("RESPONSE_CACHE_REDIS_URL is required when RESPONSE_CACHE_BACKEND=redis")
+        return RedisCacheBackend(settings.RESPONSE_CACHE_REDIS_URL, settings.RESPONSE_CACHE_TTL)
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        return MemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL)
+    return NullCacheBackend()
+
+response_cache = ResponseCache(build_backend())
+
+def cached_response(request: Request, entry: CachedResponse, cache_status: str) -> Response:
+    """Serves an entry as-is: 304 if the client's copy is current, else the stored (gzipped) bytes."""
+    last_modified = parse_http_date(entry.last_modified) if entry.last_modified else None
+    if is_not_modified(request, entry.etag, last_modified):
+        return not_modified(entry.etag, last_modified)
+
+    headers = {**validator_headers(entry.etag, last_modified), "X-Cache": cache_status}
+    if entry.gzipped is not None:
+        headers["Vary"] = "Accept-Encoding"
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            # Content-Encoding already set: the GZipMiddleware passes this through untouched
+            headers["Content-Encoding"] = "gzip"
+            return Response(entry.gzipped, media_type="application/json", headers=headers)
+    return Response(entry.body, media_type="application/json", headers=headers)
+
+def get_response_cache_stats() -> dict:
+    return response_cache.stats()
@@ -0,0 +1,65 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+# ==========================================
+# Conditional GET (ETag / Last-Modified)
+# ==========================================
+# Read endpoints compute their validators before touching any rows: a single event from its
+# own version, lists (feed, dashboard) from the event change counter, plus the normalized
+# filters and cursor. If the client's copy is still current the endpoint answers 304 with no
+# body; otherwise it runs the real query and attaches the same validators to the 200 response.
+#
+# The change counter (EventChanges) is bumped by a trigger as each writing transaction
+# commits, so unlike a timestamp stamped by the application before commit, no committed
+# change can leave it where it was. Lists and per-viewer responses carry an ETag only:
+# Last-Modified can't tell two viewers (or two filter sets) apart.
+
+# Browsers (and axios through them) revalidate on every navigation instead of re-downloading
+CACHE_CONTROL = "private, no-cache"
+
+def make_etag(*parts) -> str:
+    """Strong ETag from everything the representation depends on (filters, versions, viewer)."""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+def parse_http_date(value: str) -> Optional[datetime]:
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None) if parsed.tzinfo else parsed
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """RFC 9110: If-None-Match wins; If-Modified-Since is only consulted when it is absent."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        since = parse_http_date(if_modified_since)
+        # Last-Modified has one-second resolution
+        return since is not None and last_modified.replace(microsecond=0) <= since
+    return False
+
+def validator_headers(etag: str, last_modified: Optional[datetime], vary: Optional[str] = None) -> dict:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    if vary:
+        headers["Vary"] = vary
+    return headers
+
+def not_modified(etag: str, last_modified: Optional[datetime], vary: Optional[str] = None) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, last_modified, vary))
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime], vary: Optional[str] = None):
+    response.headers.update(validator_headers(etag, last_modified, vary))
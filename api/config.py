@@ -1,4 +1,4 @@
-from typing import List, Optional, Union
+from typing import List, Literal, Optional, Union
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -32,8 +32,128 @@ class Settings(BaseSettings):
 
     # --- Infrastructure ---
     DATABASE_URL: Optional[str] = None
+    # Use the async driver (asyncpg/aiosqlite). False runs sync sessions in the threadpool instead.
+    DB_ASYNC: bool = True
+
+    # --- Connection Pooling ---
+    # serverless: NullPool (behind PgBouncer / Supabase transaction pooler)
+    # persistent: QueuePool for long-lived uvicorn workers
+    # direct:     QueuePool + prepared statement cache, for a direct Postgres connection
+    DB_POOL_MODE: Literal["serverless", "persistent", "direct"] = "serverless"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # --- Search ---
+    # fulltext: tsvector + pg_trgm on Postgres, FTS5 on SQLite (see api/search.py)
+    # ilike:    legacy title ILIKE, for databases without the search schema
+    SEARCH_MODE: Literal["fulltext", "ilike"] = "fulltext"
+
+    # --- Response Cache (anonymous GET /api/events, see api/cache.py) ---
+    # memory: per-process LRU; redis: shared across workers via RESPONSE_CACHE_REDIS_URL; off: disabled
+    RESPONSE_CACHE_BACKEND: Literal["memory", "redis", "off"] = "memory"
+    # Upper bound on staleness for writes made by other processes (memory backend)
+    RESPONSE_CACHE_TTL: int = 30
+    RESPONSE_CACHE_MAX_ENTRIES: int = 512
+    # Also store a pre-gzipped copy of bodies >= 1000 bytes (served to clients accepting gzip)
+    RESPONSE_CACHE_GZIP: bool = True
+    RESPONSE_CACHE_REDIS_URL: Optional[str] = None
+
+    # --- Serialization ---
+    # fast:     list endpoints select plain columns and encode them with orjson (api/serialization.py)
+    # pydantic: re-validate ORM rows through the response_model (previous behaviour)
+    SERIALIZATION_MODE: Literal["fast", "pydantic"] = "fast"
+
+    # --- SQL Instrumentation (see api/instrumentation.py) ---
+    # Per-request statement count and DB time, Server-Timing header, slow-query and N+1 logs.
+    # Off by default: when disabled no engine listener or middleware is installed.
+    SQL_INSTRUMENTATION: bool = False
+    SLOW_QUERY_MS: float = 200.0
+    # Warn when one statement shape runs more than this many times in a single request
+    N_PLUS_ONE_THRESHOLD: int = 5
+
+    # --- Metrics (GET /api/metrics, Prometheus text format; see api/metrics.py) ---
+    METRICS_ENABLED: bool = True
+    # Several workers per host (uvicorn --workers / gunicorn): a directory shared by them, emptied on deploy.
+    # Each worker writes its snapshot there at most every METRICS_FLUSH_INTERVAL seconds; scrapes merge them.
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_FLUSH_INTERVAL: float = 5.0
+
+    # --- Live Updates (GET /api/live, Server-Sent Events; see api/live.py) ---
+    # memory:   publishes reach this process's subscribers only (single worker)
+    # postgres: fan out through LISTEN/NOTIFY so every worker's subscribers get them
+    LIVE_BACKEND: Literal["memory", "postgres"] = "memory"
+    # LISTEN needs a session-level connection: a direct Postgres URL, not the transaction pooler
+    # (defaults to DATABASE_URL)
+    LIVE_NOTIFY_URL: Optional[str] = None
+    LIVE_HEARTBEAT_SECONDS: float = 15.0
+    # Streams are closed after this long (0 = never) and the browser reconnects: keeps a stream
+    # under serverless duration limits and rebalances long-lived connections across workers
+    LIVE_MAX_SECONDS: int = 3600
+    LIVE_RETRY_MS: int = 3000
+    # Per worker; more streams are answered 503
+    LIVE_MAX_SUBSCRIBERS: int = 10000
+    # Coalesced messages a subscriber may have pending before it is told to resync
+    LIVE_MAX_PENDING: int = 256
+    # Events one stream may watch
+    LIVE_MAX_EVENTS: int = 50
+
+    # --- Admission Control (see api/admission.py) ---
+    # At most ADMISSION_MAX_CONCURRENT requests per process run against the database at once (0 = no
+    # limit); up to ADMISSION_MAX_QUEUE more wait in line, each for ADMISSION_QUEUE_TIMEOUT seconds at
+    # most. The rest are shed with 503 + Retry-After. The fleet-wide ceiling is workers (or serverless
+    # instances) x ADMISSION_MAX_CONCURRENT: keep it under the PgBouncer / Supabase connection limit.
+    ADMISSION_MAX_CONCURRENT: int = 20
+    ADMISSION_MAX_QUEUE: int = 50
+    ADMISSION_QUEUE_TIMEOUT: float = 2.0
+    ADMISSION_RETRY_AFTER: int = 1
+
+    # --- Rate Limits (volunteer writes: join, feedback, bookmarks) ---
+    # Token buckets per user and per client IP; an empty bucket answers 429 + Retry-After.
+    # The IP limit is loose on purpose: a campus network puts many students behind one address.
+    # memory: per process; redis: shared by every worker via RATE_LIMIT_REDIS_URL; off: disabled
+    RATE_LIMIT_BACKEND: Literal["memory", "redis", "off"] = "memory"
+    RATE_LIMIT_REDIS_URL: Optional[str] = None
+    RATE_LIMIT_USER_PER_MINUTE: float = 60.0
+    RATE_LIMIT_USER_BURST: int = 20
+    RATE_LIMIT_IP_PER_MINUTE: float = 600.0
+    RATE_LIMIT_IP_BURST: int = 100
+    # Behind a proxy (Vercel, Render) every request comes from the proxy: use the first X-Forwarded-For entry
+    RATE_LIMIT_TRUST_FORWARDED: bool = False
+    # Buckets kept by the memory backend (least recently used dropped first)
+    RATE_LIMIT_MAX_KEYS: int = 50000
+
+    # --- Signups ---
+    # approval: joins are 'pending' until the organizer confirms them (seats are taken on approval)
+    # instant:  joins take a seat immediately via an atomic conditional UPDATE (first come, first served)
+    SIGNUP_MODE: Literal["approval", "instant"] = "approval"
+    # Instant mode: joins to a full event are waitlisted and promoted in order as seats free up
+    WAITLIST_ENABLED: bool = True
+
+    # --- Clerk Authentication ---
     CLERK_ISSUER: Optional[str] = None
 
+    # --- Auth Caching ---
+    # JWKS keys are reused for JWKS_CACHE_TTL seconds, then served stale for up to
+    # JWKS_STALE_TTL more seconds while a background refresh runs.
+    JWKS_CACHE_TTL: int = 3600
+    JWKS_STALE_TTL: int = 86400
+    # Minimum gap between refreshes triggered by an unknown 'kid' (stops bogus tokens hammering Clerk)
+    JWKS_MIN_REFRESH_INTERVAL: int = 30
+    JWKS_HTTP_TIMEOUT: float = 5.0
+    # Max number of verified token payloads kept in memory (0 disables the cache)
+    TOKEN_CACHE_SIZE: int = 1024
+
+    # --- Background Jobs ---
+    # Past 'upcoming' events are swept to 'completed' at most once per interval (seconds)
+    AUTO_CONCLUDE_INTERVAL: int = 900
+    # Run the sweep from the app lifespan (long-lived workers). Serverless relies on the cron endpoint.
+    AUTO_CONCLUDE_BACKGROUND: bool = True
+    # Shared secret for /api/jobs/* (Vercel Cron sends it as a Bearer token)
+    CRON_SECRET: Optional[str] = None
+
     @field_validator("CORS_ORIGINS", mode="before")
     @classmethod
     def parse_cors_origins(cls, v: Union[str, List[str]]) -> List[str]:
@@ -1,29 +1,367 @@
-from sqlalchemy.pool import NullPool
+import threading
+import time
+import uuid
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from api.config import settings
+from api.instrumentation import record_query
+from api.metrics import DB_ACQUIRE, DB_ACQUIRE_TIMEOUTS
+
+# ==========================================
+# Pool Statistics
+# ==========================================
+
+class PoolStats:
+    """
+    Process-wide counters for connection checkouts.
+    'wait' is the time spent inside the pool obtaining a connection: queueing for a free
+    slot under QueuePool, or the full TCP+TLS+auth handshake under NullPool.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        if timed_out:
+            DB_ACQUIRE_TIMEOUTS.inc(settings.DB_POOL_MODE)
+        else:
+            DB_ACQUIRE.observe(seconds, settings.DB_POOL_MODE)
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def record_checkin(self):
+        with self._lock:
+            self.checkins += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "inUse": self.checkouts - self.checkins,
+                "newConnections": self.connects,
+                "timeouts": self.timeouts,
+                "waitAvgMs": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "waitMaxMs": round(self.wait_max * 1000, 3),
+            }
+
+pool_stats = PoolStats()
+
+class _TimedCheckoutMixin:
+    """Times Pool._do_get(), the single point where every pool hands out a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            pool_stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_stats.record_wait(time.perf_counter() - started)
+        return connection
+
+    def _do_return_conn(self, record):
+        pool_stats.record_checkin()
+        return super()._do_return_conn(record)
+
+    def _create_connection(self):
+        pool_stats.record_connect()
+        return super()._create_connection()
 
-if not settings.DATABASE_URL:
-    raise ValueError("DATABASE_URL is not set in environment")
-
-# Engine Creation
-# Optimized for Render/Supabase Transaction Pooler (PgBouncer)
-# Uses NullPool to disable client-side pooling
-engine = create_engine(
-    settings.DATABASE_URL,
-    poolclass=NullPool,   # Disable client-side pooling
-    pool_pre_ping=False,  # Disable pre-ping to reduce overhead on transaction pooler
-    echo=settings.DEBUG,
-    connect_args={
+class TimedNullPool(_TimedCheckoutMixin, NullPool):
+    pass
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+class TimedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+# ==========================================
+# Engine Configuration
+# ==========================================
+
+def is_sqlite() -> bool:
+    return bool(settings.DATABASE_URL and settings.DATABASE_URL.startswith("sqlite"))
+
+def dialect_insert(model):
+    """INSERT with the dialect's ON CONFLICT support (Postgres in production, SQLite locally)."""
+    # Imported here: the dialect modules load with the engine, not with the app
+    if is_sqlite():
+        from sqlalchemy.dialects import sqlite
+        return sqlite.insert(model)
+    from sqlalchemy.dialects import postgresql
+    return postgresql.insert(model)
+
+def _database_url() -> str:
+    if not settings.DATABASE_URL:
+        raise ValueError("DATABASE_URL is not set in environment")
+    return settings.DATABASE_URL
+
+def _pool_kwargs(async_driver: bool) -> dict:
+    """
+    Pool settings for DB_POOL_MODE:
+    - serverless: NullPool. Right behind PgBouncer's transaction pooler, where idle client-side
+      connections would just pin server slots between invocations.
+    - persistent: QueuePool for long-lived uvicorn workers (no handshake per request).
+    - direct: QueuePool against Postgres itself, with asyncpg's prepared statement cache enabled.
+    """
+    if settings.DB_POOL_MODE == "serverless":
+        return {
+            "poolclass": TimedNullPool,
+            "pool_pre_ping": False,  # Disable pre-ping to reduce overhead on transaction pooler
+        }
+    return {
+        "poolclass": TimedAsyncQueuePool if async_driver else TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+def _sync_connect_args() -> dict:
+    if is_sqlite():
+        # Sessions may hop between threadpool workers (see ThreadpoolSession)
+        return {"check_same_thread": False}
+    return {
         "keepalives": 1,
         "keepalives_idle": 30,
         "keepalives_interval": 10,
         "keepalives_count": 5,
         "connect_timeout": 10,
     }
-)
+
+def to_async_url(url: str) -> str:
+    """Maps a sync SQLAlchemy URL onto its async driver (asyncpg for Postgres, aiosqlite for SQLite)."""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql+psycopg2:"):
+        return url.replace("postgresql+psycopg2:", "postgresql+asyncpg:", 1)
+    if url.startswith("postgresql:"):
+        return url.replace("postgresql:", "postgresql+asyncpg:", 1)
+    return url
+
+def _async_connect_args() -> dict:
+    if is_sqlite():
+        return {}
+    if settings.DB_POOL_MODE == "direct":
+        # Direct Postgres keeps server-side prepared statements per connection: let asyncpg cache them
+        return {"timeout": 10}
+    return {
+        "timeout": 10,
+        # PgBouncer (transaction mode) can't keep prepared statements across transactions
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+
+# ==========================================
+# SQL Instrumentation Hooks
+# ==========================================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    record_query(statement, time.perf_counter() - context._query_started)
+
+def _instrument(engine: Engine) -> Engine:
+    """Statement timing for SQL_INSTRUMENTATION. Nothing is attached when it is off."""
+    if settings.SQL_INSTRUMENTATION:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    return engine
+
+# ==========================================
+# Lazy Engines
+# ==========================================
+
+_engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+_async_engine_checked = False
+_engine_lock = threading.Lock()
+
+def get_engine() -> Engine:
+    """Builds the sync engine on first use (not at import, so cold starts and tooling don't pay for it)."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = _instrument(create_engine(
+                    _database_url(),
+                    echo=settings.DEBUG,
+                    connect_args=_sync_connect_args(),
+                    **_pool_kwargs(async_driver=False)
+                ))
+    return _engine
+
+def get_async_engine() -> Optional[AsyncEngine]:
+    """
+    Builds the async engine on first use.
+    Returns None when DB_ASYNC is off or the async driver is missing (threadpool fallback).
+    """
+    global _async_engine, _async_engine_checked
+    if not _async_engine_checked:
+        with _engine_lock:
+            if not _async_engine_checked:
+                if settings.DB_ASYNC:
+                    try:
+                        _async_engine = create_async_engine(
+                            to_async_url(_database_url()),
+                            echo=settings.DEBUG,
+                            connect_args=_async_connect_args(),
+                            **_pool_kwargs(async_driver=True)
+                        )
+                        _instrument(_async_engine.sync_engine)
+                    except ImportError as e:
+                        print(f"⚠️ Async DB driver unavailable ({e}). Falling back to threadpool sessions.")
+                _async_engine_checked = True
+    return _async_engine
+
+def __getattr__(name: str):
+    # Backwards compatible `from api.database import engine` (e.g. scripts/migrate_v2.py), still lazy
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def get_pool_stats() -> dict:
+    """Checkout/wait counters plus the live pool status, for sizing DB_POOL_SIZE from data."""
+    stats = {"mode": settings.DB_POOL_MODE, **pool_stats.snapshot()}
+    for label, eng in (("sync", _engine), ("async", _async_engine)):
+        if eng is not None:
+            stats[f"{label}Pool"] = eng.pool.status()
+    return stats
+
+# ==========================================
+# Session Dependencies
+# ==========================================
 
 def get_session():
     """Dependency to provide a database session for a request."""
-    with Session(engine) as session:
+    with Session(get_engine()) as session:
         yield session
+
+class ThreadpoolSession:
+    """
+    Fallback for when no async driver is available (DB_ASYNC=False or driver missing).
+    Exposes the AsyncSession methods used by the handlers, but runs every call on the
+    sync Session inside the threadpool so the event loop is never blocked.
+    """
+
+    def __init__(self, sync_session: Session):
+        self.sync_session = sync_session
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    def add_all(self, instances):
+        self.sync_session.add_all(instances)
+
+    async def exec(self, statement, **kwargs):
+        return await run_in_threadpool(self.sync_session.exec, statement, **kwargs)
+
+    async def execute(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.execute, statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, *args, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def delete(self, instance):
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self):
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self):
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self):
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def refresh(self, instance, **kwargs):
+        await run_in_threadpool(self.sync_session.refresh, instance, **kwargs)
+
+    async def close(self):
+        await run_in_threadpool(self.sync_session.close)
+
+async def get_async_session():
+    """
+    Dependency to provide a non-blocking database session for a request.
+    Uses a native AsyncSession when an async driver is configured, else a ThreadpoolSession.
+    """
+    async_engine = get_async_engine()
+    if async_engine is not None:
+        # expire_on_commit=False: returned objects are serialized after commit without lazy reloads
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+    else:
+        session = ThreadpoolSession(Session(get_engine(), expire_on_commit=False))
+        try:
+            yield session
+        finally:
+            await session.close()
+
+async def stream_partitions(session, statement, size: int) -> AsyncIterator[list]:
+    """
+    The rows of `statement` in lists of at most `size`, read through a server-side cursor
+    (yield_per implies stream_results): memory is bounded by one partition however many rows
+    match. The session's connection stays checked out until the iteration ends.
+    """
+    statement = statement.execution_options(yield_per=size)
+    if isinstance(session, ThreadpoolSession):
+        result = await session.exec(statement)
+        partitions = result.partitions()
+        try:
+            while True:
+                partition = await run_in_threadpool(next, partitions, None)
+                if partition is None:
+                    return
+                yield partition
+        finally:
+            await run_in_threadpool(result.close)
+    else:
+        result = await session.stream(statement)
+        try:
+            async for partition in result.partitions():
+                yield partition
+        finally:
+            await result.close()
+
+async def dispose_engines():
+    """Close pooled connections on shutdown (no-op for NullPool)."""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
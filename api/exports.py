@@ -0,0 +1,110 @@
+import csv
+import datetime
+import io
+import json
+from typing import AsyncIterator, List, Sequence, Tuple
+
+from sqlmodel import select
+
+from api.database import stream_partitions
+from api.models import Event, Feedback, Registration
+
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the stdlib encoder
+    orjson = None
+
+# ==========================================
+# Streaming Exports (CSV / NDJSON)
+# ==========================================
+# Organizer reports can be arbitrarily long, so nothing here builds a list of rows: the query
+# is read through a server-side cursor EXPORT_BATCH_SIZE rows at a time (stream_partitions)
+# and every batch is encoded and sent as one chunk of a StreamingResponse before the next is
+# fetched. Memory per export is one batch, whether it has 100 rows or 1M.
+#
+# CSV cells that a spreadsheet would run as a formula (=, +, -, @ ...) are prefixed with a
+# quote: names and comments are typed by volunteers.
+
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+# (header, column) pairs: the column order of the CSV and the key order of each NDJSON line
+REGISTRATION_COLUMNS: List[Tuple[str, object]] = [
+    ("registrationId", Registration.id),
+    ("eventId", Registration.eventId),
+    ("eventTitle", Event.title),
+    ("eventDate", Event.date),
+    ("userId", Registration.userId),
+    ("userName", Registration.userName),
+    ("status", Registration.status),
+    ("joinedAt", Registration.joinedAt),
+    ("waitlistPosition", Registration.waitlistPosition),
+]
+
+FEEDBACK_COLUMNS: List[Tuple[str, object]] = [
+    ("feedbackId", Feedback.id),
+    ("eventId", Feedback.eventId),
+    ("eventTitle", Event.title),
+    ("eventDate", Event.date),
+    ("userId", Feedback.userId),
+    ("rating", Feedback.rating),
+    ("comment", Feedback.comment),
+]
+
+def select_registrations_export(event_id: str = None, organizer_id: str = None):
+    """One event's registrations, or those of every event of an organizer, oldest event first."""
+    query = select(*(column for _, column in REGISTRATION_COLUMNS)).join(Event, Event.id == Registration.eventId)
+    if event_id is not None:
+        return query.where(Registration.eventId == event_id).order_by(Registration.joinedAt, Registration.id)
+    return query.where(Event.organizerId == organizer_id).order_by(
+        Event.date, Event.id, Registration.joinedAt, Registration.id
+    )
+
+def select_feedback_export(event_id: str = None, organizer_id: str = None):
+    query = select(*(column for _, column in FEEDBACK_COLUMNS)).join(Event, Event.id == Feedback.eventId)
+    if event_id is not None:
+        return query.where(Feedback.eventId == event_id).order_by(Feedback.id)
+    return query.where(Event.organizerId == organizer_id).order_by(Event.date, Event.id, Feedback.id)
+
+def _plain(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if hasattr(value, "value"):  # str Enums
+        return value.value
+    return value
+
+def _csv_cell(value) -> str:
+    if value is None:
+        return ""
+    text = str(_plain(value))
+    if text[:1] in ("=", "+", "-", "@", "\t", "\r") and not isinstance(value, (int, float)):
+        return "'" + text
+    return text
+
+def encode_csv(rows: Sequence[tuple], header: Sequence[str] = None) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header is not None:
+        writer.writerow(header)
+    writer.writerows([_csv_cell(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+def encode_ndjson(rows: Sequence[tuple], keys: Sequence[str]) -> bytes:
+    if orjson is not None:
+        return b"".join(orjson.dumps(dict(zip(keys, map(_plain, row)))) + b"\n" for row in rows)
+    return "".join(
+        json.dumps(dict(zip(keys, map(_plain, row))), separators=(",", ":"), ensure_ascii=False) + "\n" for row in rows
+    ).encode("utf-8")
+
+async def stream_export(session, statement, columns: List[Tuple[str, object]], format: str) -> AsyncIterator[bytes]:
+    """The response body: the CSV header (even for an empty export), then one chunk per batch."""
+    keys = [name for name, _ in columns]
+    if format == "csv":
+        yield encode_csv([], header=keys)
+    async for rows in stream_partitions(session, statement, EXPORT_BATCH_SIZE):
+        yield encode_csv(rows) if format == "csv" else encode_ndjson(rows, keys)
+
+def export_filename(kind: str, scope: str, format: str) -> str:
+    safe_scope = "".join(ch if ch.isalnum() or ch in "-_" else "-" for ch in scope)[:64]
+    return f"{kind}-{safe_scope}-{datetime.date.today().isoformat()}.{format}"
@@ -1,32 +1,115 @@
 
+import asyncio
 import datetime
+import json
 
 from contextlib import asynccontextmanager
-from typing import List, Optional
+from typing import List, Literal, Optional, Union
 
-from fastapi import Depends, FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import TypeAdapter
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from sqlmodel import Session, SQLModel, col, func, select, text
+from sqlalchemy import and_, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import SQLModel, col, func, select, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
-from api.auth import get_current_user, is_organizer, get_current_user_optional
+from api.admission import AdmissionMiddleware, get_admission_stats, limit_writes
+from api.auth import close_http_client, get_auth_cache_stats, get_current_user, is_organizer, get_current_user_optional, get_stream_user
+from api.bookmarks import MAX_SYNC_CHANGES, add_bookmarks, bookmark_delta, remove_bookmarks, stamp_bookmarks
+from api.cache import FEED_TAG, CachedResponse, cached_response, event_tag, get_response_cache_stats, response_cache
+from api.conditional import is_not_modified, make_etag, not_modified, set_validators, validator_headers
 from api.config import settings
-from api.database import engine, get_session
+from api.database import dispose_engines, get_async_session, get_pool_stats
+from api.exports import (
+    FEEDBACK_COLUMNS,
+    MEDIA_TYPES,
+    REGISTRATION_COLUMNS,
+    export_filename,
+    select_feedback_export,
+    select_registrations_export,
+    stream_export,
+)
+from api.imports import (
+    MAX_IMPORT_BYTES,
+    MAX_IMPORT_ROWS,
+    ImportFormatError,
+    insert_events,
+    parse_csv_rows,
+    parse_json_rows,
+    validate_import,
+)
+from api.instrumentation import SQLInstrumentationMiddleware, TimedJSONResponse, get_sql_stats
+from api.jobs import (
+    auto_conclude_loop,
+    get_auto_conclude_status,
+    run_auto_conclude,
+    run_rebuild_user_stats,
+    run_reconcile_ratings,
+)
+from api.live import (
+    broker,
+    capacity_message,
+    event_topic,
+    get_live_stats,
+    publish_capacity,
+    publish_registration,
+    start_live_updates,
+    stop_live_updates,
+    stream,
+    user_topic,
+)
+from api.loaders import Loaders, get_loaders
+from api.metrics import MetricsRoute, registry, render_metrics
 from api.models import (
     Bookmark,
     BookmarkRequest,
+    BookmarkSyncRequest,
     Event,
+    EventChanges,
+    EventPage,
     EventReadWithStats,
+    EventStatsPage,
     EventStatus,
     LocationCategory,
     Feedback,
     JoinRequest,
     Registration,
     RegistrationStatus,
+    RegistrationStatusUpdate,
     UpdateEventStatusRequest,
     UpdateFeedbackRequest,
     UpdateRegistrationStatusRequest,
+    UserBadge,
+    UserStats,
+    utc_now,
+)
+from api.pagination import EVENT_ORDER, apply_keyset, decode_key, encode_key, split_page
+from api.registrations import (
+    INVALID_STATUS,
+    QUOTA_EXCEEDED,
+    apply_status_changes,
+    insert_registration,
+    new_registration,
+    next_waitlist_position,
+    plan_status_changes,
+    promote_waitlist,
+    reserve_seat,
+    waitlist_active,
+)
+from api.search import apply_search
+from api.serialization import dumps, fast_mode, json_response, rows_to_dicts, select_event_rows
+from api.stats import (
+    apply_stats_deltas,
+    completion_deltas,
+    confirmed_per_user,
+    new_deltas,
+    registration_deltas,
 )
 
 # ==========================================
@@ -42,7 +125,15 @@ async def lifespan(app: FastAPI):
     print(f"🚀 Starting {settings.APP_NAME}...", flush=True)
     # NOTE: Table creation removed for Serverless performance. 
     # Use explicit migration scripts or local tools to manage schema.
+    sweeper = asyncio.create_task(auto_conclude_loop()) if settings.AUTO_CONCLUDE_BACKGROUND else None
+    await start_live_updates()
     yield
+    if sweeper:
+        sweeper.cancel()
+    await stop_live_updates()
+    await close_http_client()
+    await dispose_engines()
+    registry.maybe_flush(force=True)
     print("🛑 Shutting down...", flush=True)
 
 
@@ -52,13 +143,22 @@ app = FastAPI(
     version=settings.VERSION,
     lifespan=lifespan,
     docs_url="/api/docs",
-    openapi_url="/api/openapi.json"
+    openapi_url="/api/openapi.json",
+    **({"default_response_class": TimedJSONResponse} if settings.SQL_INSTRUMENTATION else {})
 )
 
+# Per-route latency / in-flight / status metrics (must be set before any route is declared)
+if settings.METRICS_ENABLED:
+    app.router.route_class = MetricsRoute
+
 # 1. Gzip Compression
 # Saves bandwidth by compressing responses > 1000 bytes
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
+# 2. Admission control (api/admission.py): caps DB-using requests in flight, sheds the excess with 503.
+# Added before CORS so it runs inside it and shed responses still carry the CORS headers.
+app.add_middleware(AdmissionMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -71,6 +171,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 3. SQL Instrumentation (opt-in): Server-Timing, slow-query and N+1 logs, /api/health/sql
+if settings.SQL_INSTRUMENTATION:
+    app.add_middleware(SQLInstrumentationMiddleware)
+
 # ==========================================
 # Core Dependencies
 # ==========================================
@@ -83,40 +187,143 @@ async def get_current_organizer(current_user: dict = Depends(get_current_user))
         raise HTTPException(status_code=403, detail="Only organizers can perform this action")
     return current_user
 
+async def require_event_owner(session: AsyncSession, event_id: str, current_organizer: dict):
+    """404 for an unknown event, 403 unless the organizer runs it."""
+    organizer_id = (await session.exec(select(Event.organizerId).where(Event.id == event_id))).first()
+    if organizer_id is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    if organizer_id != current_organizer.get("sub"):
+        raise HTTPException(status_code=403, detail="Only the organizer can export this event")
+
+async def verify_cron_secret(authorization: Optional[str] = Header(default=None)):
+    """
+    Dependency for /api/jobs/* endpoints.
+    Vercel Cron sends CRON_SECRET as a Bearer token.
+    """
+    if not settings.CRON_SECRET or authorization != f"Bearer {settings.CRON_SECRET}":
+        raise HTTPException(status_code=401, detail="Invalid cron secret")
+
 # ==========================================
 # Business Logic Helpers
 # ==========================================
 
-def calculate_badges_logic(completed_count: int) -> List[dict]:
+def validate_event_body(event: Event) -> Event:
+    """
+    Table models skip validation when built from a request body, leaving 'date' as a string.
+    asyncpg only binds real date objects, so re-validate before writing.
+    """
+    return Event.model_validate(event.model_dump(warnings=False))
+
+def select_event_changes():
+    """
+    Committed event changes so far (EventChanges, a handful of rows): the list validators'
+    input, whatever the filters. Any insert, update or delete of an event moves it.
+    """
+    return select(func.coalesce(func.sum(EventChanges.changes), 0))
+
+def normalized_query(request: Request) -> str:
+    """Query string with parameters sorted, so ?a=1&b=2 and ?b=2&a=1 share an ETag."""
+    return "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+
+def feed_cache_key(**params) -> str:
+    """
+    Normalized key for a feed request: unset filters and 'All' are dropped, search is
+    whitespace/case folded, so equivalent requests share one cache entry (and ETag).
+    """
+    if params.get("search"):
+        params["search"] = " ".join(params["search"].split()).lower()
+    normalized = {key: value for key, value in params.items() if value not in (None, "All") and (value != "" or key == "cursor")}
+    return "feed:" + json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+
+EVENT_LIST = TypeAdapter(List[Event])
+
+def publish_status_changes(event: Event, changed: List[Registration], promoted: List[tuple], capacity_changed: bool):
+    """Live updates after a committed status change: each volunteer's new status, then the seat count."""
+    for reg in changed:
+        publish_registration(reg.userId, reg.id, reg.eventId, reg.status, reg.waitlistPosition)
+    for reg_id, user_id in promoted:
+        publish_registration(user_id, reg_id, event.id, RegistrationStatus.CONFIRMED)
+    if capacity_changed:
+        publish_capacity(event.id, event.currentVolunteers, event.maxVolunteers, event.version)
+
+def rating_summary(rating_sum: int, rating_count: int) -> dict:
+    """Average (1 decimal) and count from an event's denormalized rating counters."""
+    average = round(rating_sum / rating_count, 1) if rating_count else 0
+    return {"average": average, "count": rating_count}
+
+def calculate_badges_logic(completed_count: int, earned_dates: Optional[dict] = None) -> List[dict]:
     """
     Determines which badges a user has earned based on their completed mission count.
     
     Args:
-        completed_count (int): The number of missions the user has completed.
+        completed_count (int): The number of missions the user has completed (UserStats.completedMissions).
+        earned_dates (dict): badgeId -> date the badge was first earned (UserBadge). Falls back to today.
         
     Returns:
         List[dict]: A list of badge objects.
     """
     badges = []
-    today = datetime.date.today().isoformat()
+    earned_dates = earned_dates or {}
+    today = datetime.date.today()
+
+    def earned_at(badge_id: str) -> str:
+        return earned_dates.get(badge_id, today).isoformat()
     
     if completed_count >= 1:
         badges.append({
             "id": "badge_1", "name": "First Step", "description": "Completed your first volunteer mission",
-            "icon": "🌱", "color": "bg-green-50 text-green-600", "earnedAt": today
+            "icon": "🌱", "color": "bg-green-50 text-green-600", "earnedAt": earned_at("badge_1")
         })
     if completed_count >= 3:
         badges.append({
             "id": "badge_3", "name": "Helping Hand", "description": "Completed 3 volunteer missions",
-            "icon": "🤝", "color": "bg-blue-50 text-blue-600", "earnedAt": today
+            "icon": "🤝", "color": "bg-blue-50 text-blue-600", "earnedAt": earned_at("badge_3")
         })
     if completed_count >= 5:
         badges.append({
             "id": "badge_5", "name": "Super Star", "description": "A true community hero (5+ missions)",
-            "icon": "⭐", "color": "bg-yellow-50 text-yellow-600", "earnedAt": today
+            "icon": "⭐", "color": "bg-yellow-50 text-yellow-600", "earnedAt": earned_at("badge_5")
         })
     return badges
 
+def select_user_badges(user_id: str):
+    """A volunteer's completed count and earned badge dates in one query (no rows: no stats yet)."""
+    return (
+        select(UserStats.completedMissions, UserBadge.badgeId, UserBadge.earnedAt)
+        .outerjoin(UserBadge, UserBadge.userId == UserStats.userId)
+        .where(UserStats.userId == user_id)
+    )
+
+async def load_badges(session: AsyncSession, user_id: str) -> List[dict]:
+    rows = (await session.exec(select_user_badges(user_id))).all()
+    completed_count = rows[0][0] if rows else 0
+    earned_dates = {badge_id: earned_at for _, badge_id, earned_at in rows if badge_id is not None}
+    return calculate_badges_logic(completed_count, earned_dates)
+
+def select_user_registrations(user_id: str):
+    """A volunteer's registrations with the event fields their dashboard shows and whether they left feedback."""
+    has_feedback = select(Feedback.id).where(
+        Feedback.userId == Registration.userId, Feedback.eventId == Registration.eventId
+    ).exists()
+    return (
+        select(Registration, Event.title, Event.date, Event.status, has_feedback)
+        .outerjoin(Event, Event.id == Registration.eventId)
+        .where(Registration.userId == user_id)
+    )
+
+def iso_date(value):
+    return value.isoformat() if isinstance(value, datetime.date) else value
+
+def enrich_registration(reg: Registration, title: Optional[str], date, status: Optional[str], has_feedback: bool) -> dict:
+    """A select_user_registrations row flattened into the frontend's Registration shape."""
+    reg_dict = reg.model_dump()
+    if title is not None:
+        reg_dict["eventTitle"] = title
+        reg_dict["eventDate"] = iso_date(date)
+        reg_dict["eventStatus"] = status
+    reg_dict["hasFeedback"] = bool(has_feedback)
+    return reg_dict
+
 # ==========================================
 # API Endpoints
 # ==========================================
@@ -133,10 +340,68 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/api/health/auth")
+async def auth_cache_health():
+    """JWKS and verified-token cache counters (hit rate, refreshes, evictions)."""
+    return get_auth_cache_stats()
+
+@app.get("/api/health/db")
+async def db_pool_health():
+    """Connection pool mode, checkout counts and wait times (for sizing DB_POOL_SIZE)."""
+    return get_pool_stats()
+
+@app.get("/api/health/cache")
+async def response_cache_health():
+    """Event feed response cache: backend, hit rate, size, evictions and invalidations."""
+    return get_response_cache_stats()
+
+@app.get("/api/health/sql")
+async def sql_instrumentation_health():
+    """Per-route statement counts and DB time (most DB time first), slow-query and N+1 counters."""
+    return get_sql_stats()
+
+@app.get("/api/health/live")
+async def live_updates_health():
+    """Open live streams and watched topics on this worker, plus the LISTEN/NOTIFY bridge state."""
+    return get_live_stats()
+
+@app.get("/api/health/admission")
+async def admission_health():
+    """Concurrency slots in use, queue depth and shed counts, plus the write rate-limit counters."""
+    return get_admission_stats()
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition (all workers merged when METRICS_MULTIPROC_DIR is set)."""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/api/jobs/auto-conclude", dependencies=[Depends(verify_cron_secret)])
+async def trigger_auto_conclude(force: bool = False):
+    """
+    Cron entry point for serverless deployments (see vercel.json).
+    Runs the auto-conclude sweep unless it already ran within AUTO_CONCLUDE_INTERVAL.
+    """
+    result = await run_in_threadpool(run_auto_conclude, force)
+    return {**result, "watermark": get_auto_conclude_status()}
+
+@app.get("/api/jobs/reconcile-ratings", dependencies=[Depends(verify_cron_secret)])
+async def trigger_reconcile_ratings():
+    """Rebuilds every event's ratingSum/ratingCount from the feedback table."""
+    return await run_in_threadpool(run_reconcile_ratings)
+
+@app.get("/api/jobs/rebuild-user-stats", dependencies=[Depends(verify_cron_secret)])
+async def trigger_rebuild_user_stats():
+    """Rebuilds UserStats from the registrations table and backfills badge dates."""
+    return await run_in_threadpool(run_rebuild_user_stats)
+
 # --- Event Management ---
 
-@app.get("/api/events", response_model=List[Event])
+@app.get("/api/events", response_model=Union[List[Event], EventPage])
 async def get_events(
+    request: Request,
+    response: Response,
     organizerId: Optional[str] = None, 
     status: Optional[str] = None,
     category: Optional[str] = None,
@@ -144,37 +409,38 @@ async def get_events(
     search: Optional[str] = None,
     skip: int = 0,    
     limit: int = 100, 
-    session: Session = Depends(get_session)
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Fetch all events, with optional filtering and pagination.
-    
-    FEATURE: Auto-Conclude
-    Automatically marks past "upcoming" events as "completed" when this endpoint is hit.
-    This ensures the feed stays up-to-date lazily.
+    Read-only: past events are concluded by the scheduled auto-conclude job (api/jobs.py).
+
+    Pagination:
+    - Cursor mode (pass `cursor`, empty for the first page): returns {items, nextCursor},
+      ordered by (date, id). Cost is constant however deep the page.
+    - Legacy mode (skip/limit): returns a bare list. Kept for existing clients.
+
+    Conditional GET: answers 304 to a matching If-None-Match after reading the event change
+    counter (a handful of rows), without loading or serializing any event.
+
+    Anonymous requests are served from the response cache (api/cache.py) when possible:
+    encoded bytes, no query at all. Writes invalidate the affected entries by tag.
     """
-    # 1. Lazy Auto-Update: Mark past events as 'completed'
-    try:
-        today = datetime.date.today()
-        
-        # Find events that are 'upcoming' but have a date strictly before today
-        past_events = session.exec(
-            select(Event)
-            .where(Event.status == EventStatus.UPCOMING)
-            .where(Event.date < today)
-        ).all()
-        
-        if past_events:
-            for event in past_events:
-                event.status = EventStatus.COMPLETED
-                session.add(event)
-            session.commit()
-    except Exception as e:
-        print(f"⚠️ Auto-Update Failed: {e}")
-        session.rollback()
-    
-    # 2. Normal Fetch Logic
-    query = select(Event)
+    feed_key = feed_cache_key(
+        organizerId=organizerId, status=status, category=category, locationCategory=locationCategory,
+        search=search, skip=skip, limit=limit, cursor=cursor
+    )
+    use_cache = response_cache.enabled and "authorization" not in request.headers
+    if use_cache:
+        entry = await response_cache.get(feed_key)
+        if entry is not None:
+            return cached_response(request, entry, "HIT")
+
+    fast = fast_mode()
+    # SECURITY: Mask private fields for public list (fast mode: NULL in the SELECT itself)
+    # Private details are only fetched via get_event_by_id with auth check
+    query = select_event_rows(mask_private=True) if fast else select(Event)
     if organizerId:
         query = query.where(Event.organizerId == organizerId)
     if status:
@@ -184,31 +450,87 @@ async def get_events(
     if locationCategory and locationCategory != "All":
         query = query.where(Event.locationCategory == locationCategory) 
     if search:
-        query = query.where(col(Event.title).ilike(f"%{search}%"))
+        # Relevance ordering in legacy mode only: cursors need the stable (date, id) order
+        query = apply_search(query, search, ranked=cursor is None)
+    
+    changes = (await session.exec(select_event_changes())).one()
+    # The filters and cursor are in feed_key
+    etag = make_etag("events", feed_key, changes)
+    if is_not_modified(request, etag, None):
+        return not_modified(etag, None)
+    set_validators(response, etag, None)
     
+    if cursor is not None:
+        events, next_cursor = split_page((await session.exec(apply_keyset(query, cursor, limit))).all(), limit)
+    else:
+        query = query.order_by(*EVENT_ORDER).offset(skip).limit(limit)
+        events, next_cursor = (await session.exec(query)).all(), None
     
-    query = query.offset(skip).limit(limit)
-    events = session.exec(query).all()
+    if fast:
+        items = rows_to_dicts(events)
+        body = dumps({"items": items, "nextCursor": next_cursor} if cursor is not None else items)
+        event_ids = [item["id"] for item in items]
+    else:
+        for e in events:
+            e.whatsappLink = None
+            e.welcomeMessage = None
+        result = EventPage(items=events, nextCursor=next_cursor) if cursor is not None else events
+        if not use_cache:
+            return result
+        body = result.model_dump_json().encode("utf-8") if cursor is not None else EVENT_LIST.dump_json(events)
+        event_ids = [e.id for e in events]
     
-    # SECURITY: Mask private fields for public list
-    # Private details are only fetched via get_event_by_id with auth check
-    for e in events:
-        e.whatsappLink = None
-        e.welcomeMessage = None
-        
-    return events
+    if not use_cache:
+        return json_response(body, headers=validator_headers(etag, None))
+    entry = CachedResponse.build(body, etag, None)
+    await response_cache.set(feed_key, entry, [FEED_TAG] + [event_tag(event_id) for event_id in event_ids])
+    return cached_response(request, entry, "MISS")
+
+@app.get("/api/events/ratings")
+async def get_event_ratings(
+    ids: str = Query(..., description="Comma-separated event IDs"),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Batch rating lookup for a whole feed page in one call.
+    Returns {eventId: {average, count}}; unknown IDs are omitted.
+    """
+    event_ids = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if len(event_ids) > 200:
+        raise HTTPException(status_code=400, detail="At most 200 event IDs per request")
+    if not event_ids:
+        return {}
+    rows = (await session.exec(
+        select(Event.id, Event.ratingSum, Event.ratingCount).where(col(Event.id).in_(event_ids))
+    )).all()
+    return {event_id: rating_summary(rating_sum, rating_count) for event_id, rating_sum, rating_count in rows}
 
 @app.get("/api/events/{event_id}", response_model=Event)
 async def get_event_by_id(
     event_id: str,
-    session: Session = Depends(get_session),
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+    loaders: Loaders = Depends(get_loaders),
     current_user: Optional[dict] = Depends(get_current_user_optional)
 ):
     """
     Fetch a single event by ID.
     Hides private details (WhatsApp link) unless user is the organizer or a confirmed participant.
+    Conditional GET: the ETag covers the event version and the viewer (private fields differ per user);
+    a confirmation change always bumps the version, so a viewer's access can't change under one ETag.
+    No Last-Modified: an If-Modified-Since check couldn't tell one viewer's copy from another's.
     """
-    event = session.get(Event, event_id)
+    version = (await session.exec(select(Event.version).where(Event.id == event_id))).first()
+    if version is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    viewer = current_user.get("sub") if current_user else ""
+    etag = make_etag("event", event_id, version, viewer)
+    if is_not_modified(request, etag, None):
+        return not_modified(etag, None, vary="Authorization")
+    set_validators(response, etag, None, vary="Authorization")
+
+    event = await loaders.events.load(event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
         
@@ -221,12 +543,8 @@ async def get_event_by_id(
             is_authorized = True
         else:
             # 2. Is Confirmed Volunteer?
-            reg = session.exec(select(Registration).where(
-                Registration.eventId == event_id,
-                Registration.userId == user_id,
-                Registration.status == RegistrationStatus.CONFIRMED
-            )).first()
-            if reg:
+            reg = await loaders.registrations.load((user_id, event_id))
+            if reg and reg.status == RegistrationStatus.CONFIRMED:
                 is_authorized = True
                 
     if not is_authorized:
@@ -239,31 +557,91 @@ async def get_event_by_id(
 @app.post("/api/events", response_model=Event)
 async def create_event(
     event: Event, 
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_organizer: dict = Depends(get_current_organizer) 
 ):
     """
     Create a new event. 
     Restricted to Organizers.
     """
+    event = validate_event_body(event)
     event.organizerId = current_organizer.get("sub")
+    event.ratingSum = 0
+    event.ratingCount = 0
+    event.version = 1
+    event.updatedAt = utc_now()
     
     session.add(event)
-    session.commit()
-    session.refresh(event)
+    await session.commit()
+    await response_cache.invalidate(FEED_TAG)
+    await session.refresh(event)
     return event
 
+@app.post("/api/events:bulk")
+async def bulk_create_events(
+    request: Request,
+    atomic: bool = False,
+    organizerName: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session),
+    current_organizer: dict = Depends(get_current_organizer)
+):
+    """
+    Create many events at once (see api/imports.py), from a JSON array of event bodies or a
+    CSV upload (Content-Type: text/csv, header row = field names). `organizerName` fills rows
+    that leave it out. Every row is validated first; the valid ones are inserted with one
+    statement in one transaction and the rest are reported per row (1-based). With
+    `atomic=true` any invalid row answers 422 and nothing is created.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_IMPORT_BYTES:
+        raise HTTPException(status_code=413, detail=f"Imports are limited to {MAX_IMPORT_BYTES // (1024 * 1024)} MB")
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > MAX_IMPORT_BYTES:
+            raise HTTPException(status_code=413, detail=f"Imports are limited to {MAX_IMPORT_BYTES // (1024 * 1024)} MB")
+
+    # CSV comes as the raw body, not a multipart form: UploadFile needs python-multipart, which is
+    # listed in the root requirements.txt but not in api/requirements.txt (what the API deploys with)
+    content_type = request.headers.get("content-type", "application/json").split(";")[0].strip().lower()
+    if content_type not in ("application/json", "text/csv"):
+        raise HTTPException(status_code=415, detail="Send a JSON array (application/json) or a CSV file (text/csv)")
+    try:
+        rows = parse_csv_rows(bytes(body)) if content_type == "text/csv" else parse_json_rows(bytes(body))
+    except ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not rows:
+        raise HTTPException(status_code=400, detail="No events given")
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_IMPORT_ROWS} events per import")
+
+    valid, errors = validate_import(rows, current_organizer.get("sub"), organizerName)
+    if errors and atomic:
+        raise HTTPException(status_code=422, detail={"message": "Nothing was imported", "errors": errors})
+
+    created = await insert_events(session, valid)
+    await session.commit()
+    if created:
+        await response_cache.invalidate(FEED_TAG)
+    return {
+        "created": created,
+        "errors": errors,
+        "summary": {"received": len(rows), "created": len(valid), "failed": len(errors)},
+    }
+
 @app.put("/api/events/{event_id}", response_model=Event)
 async def update_event_details(
     event_id: str,
     event_update: Event, 
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_organizer: dict = Depends(get_current_organizer) 
 ):
     """
     Update event information (Title, Description, Image, etc).
     """
-    db_event = session.get(Event, event_id)
+    event_update = validate_event_body(event_update)
+    # Locked: a capacity increase promotes waitlisted volunteers against the current count
+    db_event = (await session.exec(select(Event).where(Event.id == event_id).with_for_update())).one_or_none()
     if not db_event:
         raise HTTPException(status_code=404, detail="Event not found")
     
@@ -285,76 +663,108 @@ async def update_event_details(
     if event_update.imageUrl: 
         db_event.imageUrl = event_update.imageUrl
         
+    promoted = []
+    if waitlist_active():
+        deltas = new_deltas()
+        promoted = await promote_waitlist(session, db_event, db_event.maxVolunteers - db_event.currentVolunteers, deltas)
+        db_event.currentVolunteers += len(promoted)
+        await apply_stats_deltas(session, deltas)
+        
+    db_event.touch()
     session.add(db_event)
-    session.commit()
-    session.refresh(db_event)
+    await session.commit()
+    await response_cache.invalidate(FEED_TAG)
+    await session.refresh(db_event)
+    # maxVolunteers may have changed too
+    publish_status_changes(db_event, [], promoted, capacity_changed=True)
     return db_event
 
 @app.patch("/api/events/{event_id}", response_model=Event)
 async def update_event_status(
     event_id: str, 
     payload: UpdateEventStatusRequest, 
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_organizer: dict = Depends(get_current_organizer)
 ):
     """
     Change event status (e.g. Upcoming -> Completed).
+    Credits (or takes back) completed missions for the confirmed volunteers in the same transaction.
+    The event row is locked first, so a concurrent status change or registration approval can't
+    act on the same old status (a missed or doubled credit).
     """
-    event = session.get(Event, event_id)
+    event = (await session.exec(select(Event).where(Event.id == event_id).with_for_update())).one_or_none()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
     if event.organizerId != current_organizer.get("sub"):
         raise HTTPException(status_code=403, detail="Not authorized")
     
+    was_completed = event.status == EventStatus.COMPLETED
+    is_completed = payload.status == EventStatus.COMPLETED
+    if was_completed != is_completed:
+        rows = (await session.exec(confirmed_per_user([event_id]))).all()
+        await apply_stats_deltas(session, completion_deltas(new_deltas(), rows, 1 if is_completed else -1))
+    
     event.status = payload.status
+    event.touch()
     session.add(event)
-    session.commit()
-    session.refresh(event)
+    await session.commit()
+    await response_cache.invalidate(FEED_TAG)
+    await session.refresh(event)
     return event
 
-@app.post("/api/events/{event_id}/join")
+@app.post("/api/events/{event_id}/join", dependencies=[Depends(limit_writes)])
 async def join_event(
     event_id: str, 
     payload: JoinRequest, 
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Register a volunteer for an event.
-    Handlers concurrency to prevent duplicate sign-ups or over-booking race conditions.
+    Lock-free (see api/registrations.py): concurrent sign-ups never queue on an event row lock.
+    - approval mode: the registration is 'pending' until the organizer confirms it.
+    - instant mode:  a seat is reserved atomically and the registration is 'confirmed';
+                     a full event waitlists the volunteer (or answers 400 without a waitlist).
     """
     if payload.userId != current_user.get("sub"):
         raise HTTPException(status_code=403, detail="Cannot join for another user")
 
-    # Lock row to prevent race conditions during high traffic
-    statement = select(Event).where(Event.id == event_id).with_for_update()
-    event = session.exec(statement).one_or_none()
+    new_reg = new_registration(event_id, payload)
+    event_completed = False
     
-    if not event:
+    seat = None
+    if settings.SIGNUP_MODE == "instant":
+        seat = await reserve_seat(session, event_id)
+        if seat is not None:
+            new_reg.status = RegistrationStatus.CONFIRMED
+            event_completed = seat.status == EventStatus.COMPLETED
+        else:
+            if not (await session.exec(select(Event.id).where(Event.id == event_id))).first():
+                raise HTTPException(status_code=404, detail="Event not found")
+            if not waitlist_active():
+                raise HTTPException(status_code=400, detail="Event is full")
+            new_reg.status = RegistrationStatus.WAITLISTED
+            new_reg.waitlistPosition = await next_waitlist_position(session, event_id)
+    elif not (await session.exec(select(Event.id).where(Event.id == event_id))).first():
         raise HTTPException(status_code=404, detail="Event not found")
-
-    existing_reg = session.exec(select(Registration).where(
-        Registration.eventId == event_id, 
-        Registration.userId == payload.userId
-    )).first()
     
-    if existing_reg:
+    if not await insert_registration(session, new_reg):
+        # Also releases the seat / waitlist ticket taken above
+        await session.rollback()
         raise HTTPException(status_code=400, detail="Already joined")
     
-    new_reg = Registration(
-        eventId=event_id,
-        userId=payload.userId,
-        joinedAt=datetime.date.today().isoformat(),
-        # Use provided name/avatar or fallback to a default if missing
-        userName=payload.userName or f"Student {payload.userId[-4:]}", 
-        userAvatar=payload.userAvatar or "",
-        status=RegistrationStatus.PENDING 
+    await apply_stats_deltas(
+        session,
+        registration_deltas(new_deltas(), payload.userId, None, new_reg.status, event_completed),
+        profiles={payload.userId: (new_reg.userName, new_reg.userAvatar)}
     )
-    
-    session.add(new_reg)
-    session.commit()
-    session.refresh(new_reg)
+    await session.commit()
+    if new_reg.status == RegistrationStatus.CONFIRMED:
+        await response_cache.invalidate(event_tag(event_id))
+    if seat is not None:
+        publish_capacity(event_id, seat.currentVolunteers, seat.maxVolunteers, seat.version)
+    publish_registration(new_reg.userId, new_reg.id, event_id, new_reg.status, new_reg.waitlistPosition)
     return new_reg
 
 # --- Registration Management ---
@@ -362,31 +772,31 @@ async def join_event(
 @app.get("/api/events/{event_id}/registrations")
 async def get_event_registrations(
     event_id: str, 
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: dict = Depends(get_current_user)
 ):
     """Get all participants for a specific event."""
-    return session.exec(select(Registration).where(Registration.eventId == event_id)).all()
+    return (await session.exec(select(Registration).where(Registration.eventId == event_id))).all()
 
 @app.patch("/api/registrations/{registration_id}")
 async def update_registration_status(
     registration_id: str, 
     payload: UpdateRegistrationStatusRequest,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_organizer: dict = Depends(get_current_organizer)
 ):
     """
     Approve or Reject a volunteer application.
     Updates the event's volunteer count atomically.
     """
-    reg = session.get(Registration, registration_id)
+    reg = await session.get(Registration, registration_id)
     if not reg:
         raise HTTPException(status_code=404, detail="Registration not found")
     
     # Lock event row to safely update 'currentVolunteers' count
-    event = session.exec(
+    event = (await session.exec(
         select(Event).where(Event.id == reg.eventId).with_for_update()
-    ).one_or_none()
+    )).one_or_none()
 
     if not event:
          raise HTTPException(status_code=404, detail="Associated event not found")
@@ -394,228 +804,495 @@ async def update_registration_status(
     if event.organizerId != current_organizer.get("sub"):
         raise HTTPException(status_code=403, detail="Only the organizer can manage volunteers")
     
-    old_status = reg.status
-    new_status = payload.status
-    
-    # Logic: Only update count if changing TO/FROM 'Confirmed' status
-    if new_status == RegistrationStatus.CONFIRMED and old_status != RegistrationStatus.CONFIRMED:
-        # Check quota
-        if event.currentVolunteers >= event.maxVolunteers:
-            raise HTTPException(status_code=400, detail="Event quota reached.")
-        event.currentVolunteers += 1
-        session.add(event)
-            
-    elif old_status == RegistrationStatus.CONFIRMED and new_status != RegistrationStatus.CONFIRMED:
-        event.currentVolunteers = max(0, event.currentVolunteers - 1)
-        session.add(event)
-
-    reg.status = new_status
-    session.add(reg)
-    session.commit()
-    session.refresh(reg)
+    # Only changes TO/FROM 'Confirmed' move the count; confirming checks the quota
+    results, changes = plan_status_changes(
+        event, {reg.id: reg}, [RegistrationStatusUpdate(registrationId=reg.id, status=payload.status)]
+    )
+    if results[0]["result"] == QUOTA_EXCEEDED:
+        raise HTTPException(status_code=400, detail="Event quota reached.")
+    if results[0]["result"] == INVALID_STATUS:
+        raise HTTPException(status_code=400, detail="Registrations can't be waitlisted by hand")
+
+    delta, promoted = await apply_status_changes(session, event, changes)
+    await session.commit()
+    if delta:
+        await response_cache.invalidate(event_tag(event.id))
+    await session.refresh(reg)
+    if delta or promoted:
+        await session.refresh(event)  # The version was bumped in SQL
+    publish_status_changes(event, [reg for reg, _ in changes], promoted, capacity_changed=bool(delta or promoted))
     return reg
 
+@app.patch("/api/events/{event_id}/registrations")
+async def bulk_update_registration_status(
+    event_id: str,
+    updates: List[RegistrationStatusUpdate],
+    session: AsyncSession = Depends(get_async_session),
+    current_organizer: dict = Depends(get_current_organizer)
+):
+    """
+    Approve or Reject many volunteer applications of one event at once.
+    One transaction, one event lock, one quota computation and one counter update.
+    Items are applied independently: each gets a result ('updated', 'unchanged', 'not_found',
+    'duplicate', 'invalid_status' or 'quota_exceeded'); confirmations beyond the quota are
+    rejected, the rest go through.
+    """
+    if not updates:
+        raise HTTPException(status_code=400, detail="No registration updates given")
+    if len(updates) > 500:
+        raise HTTPException(status_code=400, detail="At most 500 registration updates per request")
+
+    # Lock event row once for the whole batch
+    event = (await session.exec(
+        select(Event).where(Event.id == event_id).with_for_update()
+    )).one_or_none()
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    if event.organizerId != current_organizer.get("sub"):
+        raise HTTPException(status_code=403, detail="Only the organizer can manage volunteers")
+
+    ids = list(dict.fromkeys(item.registrationId for item in updates))
+    registrations = {reg.id: reg for reg in (await session.exec(
+        select(Registration).where(col(Registration.id).in_(ids), Registration.eventId == event_id)
+    )).all()}
+
+    results, changes = plan_status_changes(event, registrations, updates)
+    delta, promoted = await apply_status_changes(session, event, changes)
+    await session.commit()
+    if delta:
+        await response_cache.invalidate(event_tag(event.id))
+    if delta or promoted:
+        await session.refresh(event)  # The version was bumped in SQL
+    publish_status_changes(event, [reg for reg, _ in changes], promoted, capacity_changed=bool(delta or promoted))
+
+    summary: dict = {}
+    for result in results:
+        summary[result["result"]] = summary.get(result["result"], 0) + 1
+    return {
+        "eventId": event_id,
+        "currentVolunteers": event.currentVolunteers,
+        "maxVolunteers": event.maxVolunteers,
+        "summary": summary,
+        "results": results,
+        # Waitlisted registrations confirmed into seats this batch freed
+        "promoted": [reg_id for reg_id, _ in promoted],
+    }
+
 @app.get("/api/users/{user_id}/registrations")
 async def get_user_registrations(
     user_id: str, 
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Get all activities a user has joined (past and upcoming).
     Enriches result with Event details and Feedback status.
+    One query however many registrations (event fields joined, feedback as EXISTS).
     """
     if user_id != current_user.get("sub"):
         raise HTTPException(status_code=403, detail="Access denied")
 
-    regs = session.exec(select(Registration).where(Registration.userId == user_id)).all()
-    
-    enriched_regs = []
-    for r in regs:
-        event = session.get(Event, r.eventId)
-        
-        has_feedback = session.exec(select(Feedback).where(
-            Feedback.eventId == r.eventId, Feedback.userId == user_id
-        )).first() is not None
-        
-        reg_dict = r.model_dump()
-        if event:
-            reg_dict["eventTitle"] = event.title
-            reg_dict["eventDate"] = event.date.isoformat() if isinstance(event.date, datetime.date) else event.date
-            reg_dict["eventStatus"] = event.status
-        reg_dict["hasFeedback"] = has_feedback
-        enriched_regs.append(reg_dict)
-        
-    return enriched_regs
+    rows = (await session.exec(select_user_registrations(user_id))).all()
+    return [enrich_registration(*row) for row in rows]
 
 # --- Feedback & Ratings ---
 
 @app.get("/api/events/{event_id}/rating")
-async def get_event_rating(event_id: str, session: Session = Depends(get_session)):
-    """Calculate average star rating for an event."""
-    feedbacks = session.exec(select(Feedback).where(Feedback.eventId == event_id)).all()
-    if not feedbacks: 
-        return {"average": 0}
-    avg = sum(f.rating for f in feedbacks) / len(feedbacks)
-    return {"average": round(avg, 1)}
+async def get_event_rating(event_id: str, session: AsyncSession = Depends(get_async_session)):
+    """Average star rating for an event, read from its denormalized counters."""
+    counters = (await session.exec(
+        select(Event.ratingSum, Event.ratingCount).where(Event.id == event_id)
+    )).first()
+    if not counters: 
+        return {"average": 0, "count": 0}
+    return rating_summary(*counters)
 
 @app.get("/api/feedbacks")
 async def get_feedbacks(
     userId: Optional[str] = None, 
     eventId: Optional[str] = None, 
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Filter feedbacks by user ID or event ID."""
     query = select(Feedback)
     if userId: query = query.where(Feedback.userId == userId)
     if eventId: query = query.where(Feedback.eventId == eventId)
-    return session.exec(query).all()
+    return (await session.exec(query)).all()
 
-@app.post("/api/feedbacks")
+@app.post("/api/feedbacks", dependencies=[Depends(limit_writes)])
 async def submit_feedback(
     feedback: Feedback, 
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Submit a review for a completed event.
+    Updates the event's rating counters in the same transaction.
     """
     if feedback.userId != current_user.get("sub"):
         raise HTTPException(status_code=403, detail="Cannot submit feedback for another user")
+    if not 1 <= feedback.rating <= 5:
+        raise HTTPException(status_code=400, detail="Rating must be between 1 and 5")
+
+    # Atomic increment: no read-modify-write race between concurrent reviewers
+    result = await session.exec(
+        update(Event)
+        .where(Event.id == feedback.eventId)
+        .values(ratingSum=Event.ratingSum + feedback.rating, ratingCount=Event.ratingCount + 1, **Event.version_bump())
+    )
+    if result.rowcount == 0:
+        await session.rollback()
+        raise HTTPException(status_code=404, detail="Event not found")
+
     session.add(feedback)
-    session.commit()
+    try:
+        await session.commit()
+    except IntegrityError:
+        # unique_feedback: the increment above is rolled back with the duplicate insert
+        await session.rollback()
+        raise HTTPException(status_code=400, detail="Feedback already submitted for this event")
+    await response_cache.invalidate(event_tag(feedback.eventId))
     return {"status": "success"}
 
-@app.put("/api/feedbacks/{feedback_id}")
+@app.put("/api/feedbacks/{feedback_id}", dependencies=[Depends(limit_writes)])
 async def update_feedback(
     feedback_id: str,
     payload: UpdateFeedbackRequest,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Update an existing review.
     """
-    db_feedback = session.get(Feedback, feedback_id)
+    # Lock the review so concurrent edits apply their rating deltas one after another
+    db_feedback = (await session.exec(
+        select(Feedback).where(Feedback.id == feedback_id).with_for_update()
+    )).one_or_none()
     if not db_feedback:
         raise HTTPException(status_code=404, detail="Feedback not found")
         
     if db_feedback.userId != current_user.get("sub"):
         raise HTTPException(status_code=403, detail="Cannot edit another user's feedback")
         
+    delta = payload.rating - db_feedback.rating
+    if delta:
+        await session.exec(
+            update(Event)
+            .where(Event.id == db_feedback.eventId)
+            .values(ratingSum=Event.ratingSum + delta, **Event.version_bump())
+        )
     db_feedback.rating = payload.rating
     db_feedback.comment = payload.comment
     
     session.add(db_feedback)
-    session.commit()
+    await session.commit()
+    if delta:
+        await response_cache.invalidate(event_tag(db_feedback.eventId))
     return {"status": "updated"}
 
+# --- Live Updates ---
+
+@app.get("/api/live")
+async def live_updates(
+    events: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: Optional[dict] = Depends(get_stream_user)
+):
+    """
+    Server-Sent Events stream of changes as they happen (see api/live.py), instead of polling
+    the event and registration endpoints:
+    - `capacity`: seats taken of every event in `events` (comma-separated ids), sent once on
+      connect and on every change. Carries the event version: ignore messages that aren't newer.
+    - `registration`: status / waitlist position changes of the signed-in volunteer's registrations.
+    - `resync`: the stream fell behind and closes; refetch, then reconnect.
+    Auth is optional (capacity is public). EventSource can't send headers: pass `access_token`.
+    """
+    event_ids = list(dict.fromkeys(event_id for event_id in (events or "").split(",") if event_id))
+    if len(event_ids) > settings.LIVE_MAX_EVENTS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.LIVE_MAX_EVENTS} events per stream")
+    topics = [event_topic(event_id) for event_id in event_ids]
+    if current_user:
+        topics.append(user_topic(current_user.get("sub")))
+    if not topics:
+        raise HTTPException(status_code=400, detail="Nothing to watch: pass `events` or sign in")
+
+    # Subscribe before reading the snapshot, so no change falls in between
+    subscription = broker.subscribe(topics)
+    if subscription is None:
+        raise HTTPException(status_code=503, detail="Too many live connections", headers={"Retry-After": "30"})
+    try:
+        rows = (await session.exec(
+            select(Event.id, Event.currentVolunteers, Event.maxVolunteers, Event.version).where(col(Event.id).in_(event_ids))
+        )).all() if event_ids else []
+        # Hand the connection back to the pool before the long-lived stream starts
+        await session.rollback()
+    except BaseException:
+        broker.unsubscribe(subscription)
+        raise
+
+    return StreamingResponse(
+        stream(subscription, [capacity_message(*row) for row in rows]),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also runs when the client left before the stream started
+        background=BackgroundTask(broker.unsubscribe, subscription),
+    )
+
 # --- Bookmarks & Badges ---
 
 @app.get("/api/users/{user_id}/bookmarks")
 async def get_user_bookmarks(
     user_id: str, 
-    session: Session = Depends(get_session),
+    loaders: Loaders = Depends(get_loaders),
     current_user: dict = Depends(get_current_user)
 ):
     """Get list of event IDs bookmarked by the user."""
     if user_id != current_user.get("sub"):
          raise HTTPException(status_code=403, detail="Access denied")
     
-    bookmarks = session.exec(select(Bookmark).where(Bookmark.userId == user_id)).all()
-    return [b.eventId for b in bookmarks]
+    return await loaders.bookmarks.load(user_id)
 
-@app.post("/api/users/{user_id}/bookmarks")
+@app.post("/api/users/{user_id}/bookmarks", dependencies=[Depends(limit_writes)])
 async def toggle_bookmark(
     user_id: str, 
     body: BookmarkRequest, 
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
+    loaders: Loaders = Depends(get_loaders),
     current_user: dict = Depends(get_current_user)
 ):
-    """Toggle bookmark status for an event (Add/Remove)."""
+    """
+    Toggle bookmark status for an event (Add/Remove).
+    One read (the user's bookmark list), the write and its version stamp; the new list is returned without re-selecting.
+    A retried toggle undoes itself: new clients use PUT/DELETE /api/users/me/bookmarks/{event_id}.
+    """
     if user_id != current_user.get("sub"):
          raise HTTPException(status_code=403, detail="Access denied")
          
-    existing = session.exec(select(Bookmark).where(
-        Bookmark.userId == user_id, Bookmark.eventId == body.eventId
-    )).first()
+    bookmarks = list(await loaders.bookmarks.load(user_id))
     
-    if existing:
-        session.delete(existing)
+    if body.eventId in bookmarks:
+        changed = await remove_bookmarks(session, user_id, [body.eventId])
+        bookmarks = [event_id for event_id in bookmarks if event_id != body.eventId]
     else:
-        session.add(Bookmark(userId=user_id, eventId=body.eventId))
+        # A concurrent toggle may have just added it: (userId, eventId) is unique
+        changed = await add_bookmarks(session, user_id, [body.eventId])
+        bookmarks.append(body.eventId)
+    if changed:
+        await stamp_bookmarks(session, user_id, changed)
         
-    session.commit()
+    await session.commit()
+    loaders.bookmarks.prime(user_id, bookmarks)
     
-    bookmarks = session.exec(select(Bookmark).where(Bookmark.userId == user_id)).all()
-    return [b.eventId for b in bookmarks]
+    return bookmarks
+
+@app.put("/api/users/me/bookmarks/{event_id}", dependencies=[Depends(limit_writes)])
+async def add_my_bookmark(
+    event_id: str,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: dict = Depends(get_current_user)
+):
+    """Bookmark an event. Idempotent: repeating it changes nothing (`changed: false`, current `version`)."""
+    user_id = current_user.get("sub")
+    changed = await add_bookmarks(session, user_id, [event_id])
+    version = await stamp_bookmarks(session, user_id, changed)
+    await session.commit()
+    return {"eventId": event_id, "bookmarked": True, "changed": bool(changed), "version": version}
+
+@app.delete("/api/users/me/bookmarks/{event_id}", dependencies=[Depends(limit_writes)])
+async def remove_my_bookmark(
+    event_id: str,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: dict = Depends(get_current_user)
+):
+    """Remove a bookmark. Idempotent: removing one that isn't there is not an error (`changed: false`, current `version`)."""
+    user_id = current_user.get("sub")
+    changed = await remove_bookmarks(session, user_id, [event_id])
+    version = await stamp_bookmarks(session, user_id, changed)
+    await session.commit()
+    return {"eventId": event_id, "bookmarked": False, "changed": bool(changed), "version": version}
+
+@app.post("/api/users/me/bookmarks:sync", dependencies=[Depends(limit_writes)])
+async def sync_my_bookmarks(
+    payload: BookmarkSyncRequest,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Apply a batch of bookmark adds and removes (one statement each, both idempotent) and
+    return what changed since the client's `since` version, its own changes included:
+    {version, full, added, removed}. Keep `version` for the next sync. Without `since` the
+    whole list comes back with `full: true`; an empty batch is a plain delta read.
+    """
+    user_id = current_user.get("sub")
+    add = list(dict.fromkeys(payload.add))
+    remove = list(dict.fromkeys(payload.remove))
+    if len(add) + len(remove) > MAX_SYNC_CHANGES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_SYNC_CHANGES} bookmark changes per request")
+    both = set(add) & set(remove)
+    if both:
+        raise HTTPException(status_code=400, detail=f"Events both added and removed: {', '.join(sorted(both))}")
+
+    version = None
+    if add or remove:
+        changed = await add_bookmarks(session, user_id, add) + await remove_bookmarks(session, user_id, remove)
+        version = await stamp_bookmarks(session, user_id, changed)
+    delta = await bookmark_delta(session, user_id, payload.since, version)
+    await session.commit()
+    return delta
 
 @app.get("/api/users/{user_id}/badges")
 async def get_user_badges(
     user_id: str,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
-    Dynamically calculate badges based on completed events.
-    Returns a list of earned badge objects.
+    Badges based on completed events, read from the user's UserStats counter.
+    Returns a list of earned badge objects, dated when each milestone was first reached.
     """
-    # Simply count how many confirmed registrations are for 'completed' events
-    statement = (
-        select(Registration)
-        .join(Event, Registration.eventId == Event.id)
-        .where(Registration.userId == user_id)
-        .where(Registration.status == RegistrationStatus.CONFIRMED)
-        .where(Event.status == "completed")
-    )
-    completed_count = len(session.exec(statement).all())
+    return await load_badges(session, user_id)
+
+@app.get("/api/leaderboard")
+async def get_leaderboard(
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Volunteers ranked by completed missions (ties broken by userId).
+    Keyset-paginated over ix_userstats_completed_user: pass `nextCursor` back as `cursor`.
+    """
+    query = select(UserStats).where(UserStats.completedMissions > 0)
+    if cursor:
+        try:
+            completed, last_user = decode_key(cursor)
+            completed = int(completed)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        # Descending count, ascending id: "after" the cursor in that mixed order
+        query = query.where(or_(
+            UserStats.completedMissions < completed,
+            and_(UserStats.completedMissions == completed, UserStats.userId > str(last_user))
+        ))
+    query = query.order_by(col(UserStats.completedMissions).desc(), UserStats.userId).limit(limit + 1)
+    rows = (await session.exec(query)).all()
     
-    return calculate_badges_logic(completed_count)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_key([rows[-1].completedMissions, rows[-1].userId])
+    
+    items = [{
+        "userId": row.userId,
+        "userName": row.userName,
+        "userAvatar": row.userAvatar,
+        "completedMissions": row.completedMissions,
+    } for row in rows]
+    return {"items": items, "nextCursor": next_cursor}
 
 # --- Organizer Dashboard Extension ---
 
-@app.get("/api/organizers/dashboard", response_model=List[EventReadWithStats])
+@app.get("/api/organizers/dashboard", response_model=Union[List[EventReadWithStats], EventStatsPage])
 async def get_organizer_dashboard_stats(
+    request: Request,
+    response: Response,
     limit: int = 100, 
     skip: int = 0,
-    session: Session = Depends(get_session),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session),
     current_user: dict = Depends(get_current_organizer)
 ):
     """
     Optimized endpoint for Organizer Dashboard.
-    Fetches events AND pre-calculates rating/feedback count using SQL Aggregation.
-    Eliminates N+1 query performance issues.
+    Rating/feedback stats come from the denormalized counters on Event: no join, no GROUP BY.
+    Supports the same `cursor` mode and conditional GET as GET /api/events.
     """
     organizer_id = current_user.get("sub")
     
-    # Left Outer Join ensures we still get events with 0 reviews
-    query = (
-        select(
-            Event, 
-            func.coalesce(func.avg(Feedback.rating), 0.0).label("avgRating"),
-            func.count(Feedback.id).label("feedbackCount")
-        )
-        .outerjoin(Feedback, Event.id == Feedback.eventId)
-        .where(Event.organizerId == organizer_id)
-        .group_by(Event.id)
-        .offset(skip)
-        .limit(limit)
-    )
+    fast = fast_mode()
+    # The organizer sees their own private fields: nothing is masked here
+    query = (select_event_rows(mask_private=False) if fast else select(Event)).where(Event.organizerId == organizer_id)
+    
+    changes = (await session.exec(select_event_changes())).one()
+    etag = make_etag("dashboard", organizer_id, normalized_query(request), changes)
+    if is_not_modified(request, etag, None):
+        return not_modified(etag, None, vary="Authorization")
+    set_validators(response, etag, None, vary="Authorization")
+    
+    if cursor is not None:
+        events, next_cursor = split_page((await session.exec(apply_keyset(query, cursor, limit))).all(), limit)
+    else:
+        events = (await session.exec(query.order_by(*EVENT_ORDER).offset(skip).limit(limit))).all()
     
-    results = session.exec(query).all()
+    if fast:
+        items = rows_to_dicts(events)
+        for item in items:
+            item["avgRating"] = float(rating_summary(item["ratingSum"], item["ratingCount"])["average"])
+            item["feedbackCount"] = item["ratingCount"]
+        body = dumps({"items": items, "nextCursor": next_cursor} if cursor is not None else items)
+        return json_response(body, headers=validator_headers(etag, None, vary="Authorization"))
     
     dashboard_data = []
-    for event, avg_rating, feedback_count in results:
-        # Map tuple result back to our Schema
+    for event in events:
         event_with_stats = EventReadWithStats.model_validate(event)
-        event_with_stats.avgRating = round(avg_rating, 1)
-        event_with_stats.feedbackCount = feedback_count
+        event_with_stats.avgRating = rating_summary(event.ratingSum, event.ratingCount)["average"]
+        event_with_stats.feedbackCount = event.ratingCount
         dashboard_data.append(event_with_stats)
         
+    if cursor is not None:
+        return EventStatsPage(items=dashboard_data, nextCursor=next_cursor)
     return dashboard_data
 
+# --- Exports ---
+
+EXPORTS = {"registrations": (select_registrations_export, REGISTRATION_COLUMNS), "feedback": (select_feedback_export, FEEDBACK_COLUMNS)}
+
+def export_response(session, kind: str, format: str, scope: str, **filters) -> StreamingResponse:
+    select_export, columns = EXPORTS[kind]
+    return StreamingResponse(
+        stream_export(session, select_export(**filters), columns, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{export_filename(kind, scope, format)}"'},
+    )
+
+@app.get("/api/events/{event_id}/registrations/export")
+async def export_event_registrations(
+    event_id: str,
+    format: Literal["csv", "ndjson"] = "csv",
+    session: AsyncSession = Depends(get_async_session),
+    current_organizer: dict = Depends(get_current_organizer)
+):
+    """
+    Download an event's participant list as CSV or NDJSON (one JSON object per line).
+    Streamed through a server-side cursor: memory stays flat however long the list is.
+    """
+    await require_event_owner(session, event_id, current_organizer)
+    return export_response(session, "registrations", format, event_id, event_id=event_id)
+
+@app.get("/api/events/{event_id}/feedbacks/export")
+async def export_event_feedbacks(
+    event_id: str,
+    format: Literal["csv", "ndjson"] = "csv",
+    session: AsyncSession = Depends(get_async_session),
+    current_organizer: dict = Depends(get_current_organizer)
+):
+    """Download an event's reviews as CSV or NDJSON, streamed like the participant list."""
+    await require_event_owner(session, event_id, current_organizer)
+    return export_response(session, "feedback", format, event_id, event_id=event_id)
+
+@app.get("/api/organizers/export")
+async def export_organizer_data(
+    kind: Literal["registrations", "feedback"] = "registrations",
+    format: Literal["csv", "ndjson"] = "csv",
+    session: AsyncSession = Depends(get_async_session),
+    current_organizer: dict = Depends(get_current_organizer)
+):
+    """Registrations or reviews of every event the organizer runs, in one streamed file (oldest event first)."""
+    organizer_id = current_organizer.get("sub")
+    return export_response(session, kind, format, "all-events", organizer_id=organizer_id)
+
 @app.get("/api/users/me/bookmarks/events", response_model=List[Event])
 async def get_my_bookmarked_events(
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -624,13 +1301,73 @@ async def get_my_bookmarked_events(
     """
     user_id = current_user.get("sub")
     
+    fast = fast_mode()
     query = (
-        select(Event)
+        (select_event_rows(mask_private=False) if fast else select(Event))
         .join(Bookmark, Bookmark.eventId == Event.id)
-        .where(Bookmark.userId == user_id)
+        .where(Bookmark.userId == user_id, ~col(Bookmark.removed))
     )
     
-    return session.exec(query).all()
+    if fast:
+        return json_response(dumps(rows_to_dicts((await session.exec(query)).all())))
+    return (await session.exec(query)).all()
 
+# --- Volunteer Summary ---
+
+SUMMARY_SECTIONS = ("registrations", "bookmarks", "badges", "feedbackPrompts")
+
+@app.get("/api/users/me/summary")
+async def get_my_summary(
+    include: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Everything the volunteer dashboard loads after login, in one request: one token check,
+    one connection and at most 3 queries (instead of four requests doing each of those).
+    - registrations:   as GET /api/users/{id}/registrations (event title/date/status, hasFeedback)
+    - bookmarks:       bookmarked event ids, plus `bookmarkedEvents` with their details
+    - badges:          as GET /api/users/{id}/badges
+    - feedbackPrompts: confirmed registrations of completed events that have no feedback yet
+    `include` (comma-separated section names) returns only those sections and skips the other queries.
+    """
+    user_id = current_user.get("sub")
+    sections = {name.strip() for name in include.split(",") if name.strip()} if include else set(SUMMARY_SECTIONS)
+    unknown = sections - set(SUMMARY_SECTIONS)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown summary sections: {', '.join(sorted(unknown))} (expected {', '.join(SUMMARY_SECTIONS)})"
+        )
+
+    fast = fast_mode()
+    summary: dict = {}
+    if sections & {"registrations", "feedbackPrompts"}:
+        # Feedback prompts are derived from the same rows
+        rows = (await session.exec(select_user_registrations(user_id))).all()
+        if "registrations" in sections:
+            summary["registrations"] = [enrich_registration(*row) for row in rows]
+        if "feedbackPrompts" in sections:
+            summary["feedbackPrompts"] = [
+                {"registrationId": reg.id, "eventId": reg.eventId, "eventTitle": title, "eventDate": iso_date(date)}
+                for reg, title, date, status, has_feedback in rows
+                if reg.status == RegistrationStatus.CONFIRMED and status == EventStatus.COMPLETED and not has_feedback
+            ]
+
+    if "bookmarks" in sections:
+        # The user's own bookmarks: private fields aren't masked, as in GET /api/users/me/bookmarks/events
+        query = (
+            (select_event_rows(mask_private=False) if fast else select(Event))
+            .join(Bookmark, Bookmark.eventId == Event.id)
+            .where(Bookmark.userId == user_id, ~col(Bookmark.removed))
+        )
+        events = (await session.exec(query)).all()
+        summary["bookmarkedEvents"] = rows_to_dicts(events) if fast else events
+        summary["bookmarks"] = [event.id for event in events]
 
+    if "badges" in sections:
+        summary["badges"] = await load_badges(session, user_id)
 
+    if fast:
+        return json_response(dumps(summary))
+    return summary
@@ -0,0 +1,185 @@
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+
+from api.config import settings
+
+# ==========================================
+# Per-Request SQL Instrumentation (SQL_INSTRUMENTATION)
+# ==========================================
+# Opt-in. When enabled, api/database.py attaches cursor-execute listeners to the engines and
+# the app installs SQLInstrumentationMiddleware, which gives every request a RequestProfile
+# through a context variable (visible from the async engine's greenlet and from threadpool
+# sessions alike). Each request then gets:
+#   - a Server-Timing header: db (with the statement count), auth, serialize and app total
+#   - a slow-query log line (normalized SQL) for statements over SLOW_QUERY_MS
+#   - an N+1 warning when one statement shape runs more than N_PLUS_ONE_THRESHOLD times
+#   - per-route aggregates in GET /api/health/sql
+# When disabled neither the listeners nor the middleware exist; span() is a context-variable lookup.
+
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+_WHITESPACE = re.compile(r"\s+")
+# String/number literals and every driver's placeholder style (?, $1, :name, %(name)s)
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|\$\d+|%\(\w+\)s|(?<![:\w]):\w+|\?")
+_LISTS = re.compile(r"\(\?(?:, \?)+\)")
+_ROWS = re.compile(r"(\((?:\?|\.\.\.)\))(?:, \((?:\?|\.\.\.)\))+")
+
+def normalize_sql(statement: str, limit: int = 500) -> str:
+    """Statement shape for logs: literals and placeholders become ?, IN lists and multi-row VALUES collapse."""
+    shape = _LITERALS.sub("?", _WHITESPACE.sub(" ", statement).strip())
+    shape = _ROWS.sub(r"\1, ...", _LISTS.sub("(...)", shape))
+    return shape if len(shape) <= limit else shape[:limit] + "..."
+
+class RequestProfile:
+    """Timings collected for one request."""
+
+    __slots__ = ("label", "started", "queries", "db_seconds", "spans", "statements")
+
+    def __init__(self, label: str):
+        self.label = label
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.spans: Dict[str, float] = {}
+        # Raw SQL text -> executions. Bound parameters keep the text identical for the same shape.
+        self.statements: Counter = Counter()
+
+    def server_timing(self) -> str:
+        metrics = [f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries"']
+        metrics += [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.spans.items()]
+        metrics.append(f"app;dur={(time.perf_counter() - self.started) * 1000:.1f}")
+        return ", ".join(metrics)
+
+    def repeated_statements(self):
+        return [(count, statement) for statement, count in self.statements.items() if count > settings.N_PLUS_ONE_THRESHOLD]
+
+class _Span:
+    __slots__ = ("profile", "name", "started")
+
+    def __init__(self, profile: RequestProfile, name: str):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profile.spans[self.name] = self.profile.spans.get(self.name, 0.0) + time.perf_counter() - self.started
+
+_NO_SPAN = nullcontext()
+
+def span(name: str):
+    """Adds the block's wall time to the current request's Server-Timing entry `name` (no-op outside one)."""
+    profile = _current.get()
+    if profile is None:
+        return _NO_SPAN
+    return _Span(profile, name)
+
+class SQLStats:
+    """Per-route aggregates since startup (process-local)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routes: Dict[str, list] = {}
+        self.slow_queries = 0
+        self.n_plus_one = 0
+
+    def record_slow(self):
+        with self._lock:
+            self.slow_queries += 1
+
+    def record_request(self, route: str, profile: RequestProfile, repeated: int):
+        with self._lock:
+            # [requests, queries, db seconds, max queries, requests flagged N+1]
+            row = self.routes.setdefault(route, [0, 0, 0.0, 0, 0])
+            row[0] += 1
+            row[1] += profile.queries
+            row[2] += profile.db_seconds
+            row[3] = max(row[3], profile.queries)
+            row[4] += bool(repeated)
+            self.n_plus_one += bool(repeated)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            routes = {
+                route: {
+                    "requests": requests,
+                    "avgQueries": round(queries / requests, 2),
+                    "avgDbMs": round(db_seconds * 1000 / requests, 2),
+                    "maxQueries": max_queries,
+                    "nPlusOneRequests": flagged,
+                }
+                for route, (requests, queries, db_seconds, max_queries, flagged) in self.routes.items()
+            }
+            return {
+                "enabled": settings.SQL_INSTRUMENTATION,
+                "slowQueryMs": settings.SLOW_QUERY_MS,
+                "nPlusOneThreshold": settings.N_PLUS_ONE_THRESHOLD,
+                "slowQueries": self.slow_queries,
+                "nPlusOneRequests": self.n_plus_one,
+                # Most database time first: the routes worth optimizing
+                "routes": dict(sorted(routes.items(), key=lambda item: -item[1]["avgDbMs"] * item[1]["requests"])),
+            }
+
+sql_stats = SQLStats()
+
+def record_query(statement: str, seconds: float):
+    """Called by the engine listeners after every statement."""
+    profile = _current.get()
+    if profile is not None:
+        profile.queries += 1
+        profile.db_seconds += seconds
+        profile.statements[statement] += 1
+    if seconds * 1000 >= settings.SLOW_QUERY_MS:
+        sql_stats.record_slow()
+        label = profile.label if profile is not None else "background"
+        print(f"🐢 Slow query ({seconds * 1000:.1f}ms) during {label}: {normalize_sql(statement)}", flush=True)
+
+class SQLInstrumentationMiddleware:
+    """Pure ASGI (no extra task per request, streaming responses untouched)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(f"{scope['method']} {scope['path']}")
+        token = _current.set(profile)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", profile.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            route = scope.get("route")
+            repeated = profile.repeated_statements()
+            for count, statement in repeated:
+                print(f"🔁 Possible N+1 during {profile.label}: {count}x {normalize_sql(statement, 300)}", flush=True)
+            sql_stats.record_request(
+                f"{scope['method']} {route.path if route is not None else '(unmatched)'}", profile, len(repeated)
+            )
+
+class TimedJSONResponse(JSONResponse):
+    """Default response class while instrumenting: JSON encoding shows up as the 'serialize' span."""
+
+    def render(self, content) -> bytes:
+        with span("serialize"):
+            return super().render(content)
+
+def get_sql_stats() -> dict:
+    return sql_stats.snapshot()
@@ -0,0 +1,228 @@
+import asyncio
+import datetime
+import sys
+import time
+from typing import Optional
+
+from sqlalchemy import Integer, delete, insert, or_, update
+from sqlmodel import Session, func, select
+from starlette.concurrency import run_in_threadpool
+
+from api.cache import FEED_TAG, response_cache
+from api.config import settings
+from api.database import get_engine
+from api.metrics import EVENTS_CONCLUDED, timed_job
+from api.models import Event, EventStatus, Feedback, Registration, RegistrationStatus, UserBadge, UserStats
+from api.stats import BADGE_THRESHOLDS, apply_stats_deltas_sync, completion_deltas, confirmed_per_user, new_deltas
+
+# ==========================================
+# Auto-Conclude Sweep
+# ==========================================
+
+# "Last swept" watermark (monotonic seconds). Guards against running the sweep
+# more than once per AUTO_CONCLUDE_INTERVAL in this process.
+_last_swept: Optional[float] = None
+_last_result: dict = {}
+
+def conclude_past_events(session: Session) -> int:
+    """
+    Marks every 'upcoming' event dated before today as 'completed'.
+    Runs as one set-based UPDATE (no event rows are loaded into Python), then credits the
+    confirmed volunteers of the concluded events in UserStats within the same transaction.
+
+    Returns:
+        int: Number of events that were concluded.
+    """
+    today = datetime.date.today()
+    concluded = session.exec(
+        update(Event)
+        .where(Event.status == EventStatus.UPCOMING)
+        .where(Event.date < today)
+        .values(status=EventStatus.COMPLETED, **Event.version_bump())
+        .returning(Event.id)
+    ).scalars().all()
+    if concluded:
+        for start in range(0, len(concluded), 500):
+            rows = session.exec(confirmed_per_user(concluded[start:start + 500])).all()
+            apply_stats_deltas_sync(session, completion_deltas(new_deltas(), rows, 1))
+    session.commit()
+    if concluded:
+        response_cache.invalidate_sync(FEED_TAG)
+    return len(concluded)
+
+@timed_job("auto-conclude")
+def run_auto_conclude(force: bool = False) -> dict:
+    """
+    Job entry point (scheduler, cron endpoint or CLI).
+    Skips the sweep if it already ran within AUTO_CONCLUDE_INTERVAL, unless forced.
+    """
+    global _last_swept, _last_result
+
+    now = time.monotonic()
+    if not force and _last_swept is not None and now - _last_swept < settings.AUTO_CONCLUDE_INTERVAL:
+        return {"status": "skipped", "lastSweptSecondsAgo": round(now - _last_swept, 1)}
+
+    # Move the watermark first so concurrent callers don't pile up behind a slow sweep
+    _last_swept = now
+    started = time.perf_counter()
+    with Session(get_engine()) as session:
+        concluded = conclude_past_events(session)
+    _last_result = {
+        "status": "swept",
+        "concluded": concluded,
+        "durationMs": round((time.perf_counter() - started) * 1000, 2),
+    }
+    EVENTS_CONCLUDED.inc(amount=concluded)
+    if concluded:
+        print(f"🏁 Auto-conclude: marked {concluded} past event(s) as completed", flush=True)
+    return _last_result
+
+def get_auto_conclude_status() -> dict:
+    """Last sweep result and time since the watermark was set."""
+    return {
+        **_last_result,
+        "lastSweptSecondsAgo": round(time.monotonic() - _last_swept, 1) if _last_swept is not None else None,
+        "intervalSeconds": settings.AUTO_CONCLUDE_INTERVAL,
+    }
+
+# ==========================================
+# Rating Reconciliation
+# ==========================================
+
+def reconcile_ratings_statement():
+    """
+    One UPDATE that rebuilds Event.ratingSum / Event.ratingCount from the feedback table.
+    Only drifted events are rewritten, so cached ETags of correct events stay valid.
+    Also run by the migration that deduplicates reviews (api/migrations.py).
+    """
+    rating_sum = (
+        select(func.coalesce(func.sum(Feedback.rating), 0))
+        .where(Feedback.eventId == Event.id)
+        .scalar_subquery()
+    )
+    rating_count = (
+        select(func.count(Feedback.id))
+        .where(Feedback.eventId == Event.id)
+        .scalar_subquery()
+    )
+    return (
+        update(Event)
+        .where(or_(Event.ratingSum != rating_sum, Event.ratingCount != rating_count))
+        .values(ratingSum=rating_sum, ratingCount=rating_count, **Event.version_bump())
+    )
+
+def reconcile_event_ratings(session: Session) -> int:
+    """
+    Repairs drift in the denormalized rating counters, which are maintained incrementally on
+    every feedback write (manual SQL edits, rows written before the columns existed).
+
+    Returns:
+        int: Number of events rewritten.
+    """
+    result = session.exec(reconcile_ratings_statement())
+    session.commit()
+    if result.rowcount:
+        response_cache.invalidate_sync(FEED_TAG)
+    return result.rowcount or 0
+
+@timed_job("reconcile-ratings")
+def run_reconcile_ratings() -> dict:
+    """Job entry point (cron endpoint or CLI)."""
+    started = time.perf_counter()
+    with Session(get_engine()) as session:
+        events = reconcile_event_ratings(session)
+    return {
+        "status": "reconciled",
+        "events": events,
+        "durationMs": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+# ==========================================
+# Volunteer Stats Rebuild
+# ==========================================
+
+def rebuild_user_stats(session: Session) -> int:
+    """
+    Recomputes every UserStats row from the registrations table and backfills missing
+    badges, dated by the event that took the volunteer over each threshold.
+    UserStats is maintained incrementally; this is the repair / first-deploy backfill.
+
+    Returns:
+        int: Number of volunteers with stats.
+    """
+    completed = (Event.status == EventStatus.COMPLETED) & (Registration.status == RegistrationStatus.CONFIRMED)
+    totals = (
+        select(
+            Registration.userId,
+            func.max(Registration.userName),
+            func.max(Registration.userAvatar),
+            func.sum((Registration.status == RegistrationStatus.PENDING).cast(Integer)),
+            func.sum((Registration.status == RegistrationStatus.CONFIRMED).cast(Integer)),
+            func.sum(completed.cast(Integer)),
+        )
+        .join(Event, Registration.eventId == Event.id)
+        .group_by(Registration.userId)
+    )
+    session.exec(delete(UserStats))
+    result = session.exec(insert(UserStats).from_select(
+        ["userId", "userName", "userAvatar", "pendingCount", "confirmedCount", "completedMissions"], totals
+    ))
+
+    # Nth completed mission (by event date) per volunteer = the day badge N was earned
+    ranked = (
+        select(
+            Registration.userId.label("userId"),
+            Event.date.label("date"),
+            func.row_number().over(
+                partition_by=Registration.userId, order_by=(Event.date, Event.id)
+            ).label("n"),
+        )
+        .join(Event, Registration.eventId == Event.id)
+        .where(completed)
+        .subquery()
+    )
+    milestones = session.exec(
+        select(ranked.c.userId, ranked.c.n, ranked.c.date).where(ranked.c.n.in_(list(BADGE_THRESHOLDS.values())))
+    ).all()
+    earned = {(user_id, n): date for user_id, n, date in milestones}
+    existing = set(session.exec(select(UserBadge.userId, UserBadge.badgeId)).all())
+    for (user_id, n), date in earned.items():
+        for badge_id, threshold in BADGE_THRESHOLDS.items():
+            if threshold == n and (user_id, badge_id) not in existing:
+                session.add(UserBadge(userId=user_id, badgeId=badge_id, earnedAt=date))
+    session.commit()
+    return result.rowcount or 0
+
+@timed_job("rebuild-user-stats")
+def run_rebuild_user_stats() -> dict:
+    """Job entry point (cron endpoint or CLI)."""
+    started = time.perf_counter()
+    with Session(get_engine()) as session:
+        users = rebuild_user_stats(session)
+    return {
+        "status": "rebuilt",
+        "users": users,
+        "durationMs": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+async def auto_conclude_loop():
+    """
+    Background scheduler started from the app lifespan (long-lived workers).
+    Serverless deployments use the cron endpoint instead.
+    """
+    while True:
+        try:
+            await run_in_threadpool(run_auto_conclude)
+        except Exception as e:
+            print(f"⚠️ Auto-Conclude Failed: {e}", flush=True)
+        await asyncio.sleep(settings.AUTO_CONCLUDE_INTERVAL)
+
+JOBS = {
+    "auto-conclude": lambda: run_auto_conclude(force=True),
+    "reconcile-ratings": run_reconcile_ratings,
+    "rebuild-user-stats": run_rebuild_user_stats,
+}
+
+if __name__ == "__main__":
+    # Usage: python -m api.jobs [auto-conclude|reconcile-ratings|rebuild-user-stats]
+    print(JOBS[sys.argv[1] if len(sys.argv) > 1 else "auto-conclude"]())
@@ -0,0 +1,297 @@
+import asyncio
+import json
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from api.config import settings
+from api.metrics import LIVE_OVERFLOWS, LIVE_SUBSCRIBERS
+
+# ==========================================
+# Live Updates (GET /api/live, Server-Sent Events)
+# ==========================================
+# Writes publish small state messages after they commit:
+#   - "capacity" on topic event:<id>:      currentVolunteers / maxVolunteers / version
+#   - "registration" on topic user:<id>:   a registration's status / waitlistPosition
+# Messages are state, not deltas, so a subscriber that falls behind only needs the latest one
+# per key: pending messages are coalesced by key (memory per subscriber is bounded by the
+# number of things it watches, not by the write rate). A subscriber with more than
+# LIVE_MAX_PENDING distinct pending keys gets a "resync" event and is closed; the client
+# refetches and reconnects. Idle streams get a comment line every LIVE_HEARTBEAT_SECONDS so
+# proxies keep them open and dead clients are noticed.
+#
+# LIVE_BACKEND=memory:   publishes reach the subscribers of this process only.
+# LIVE_BACKEND=postgres: publishes go through NOTIFY on one channel; every worker LISTENs
+#                        and dispatches to its own subscribers. LISTEN needs a session-level
+#                        connection: set LIVE_NOTIFY_URL to a direct (non-PgBouncer) URL.
+
+CHANNEL = "umission_live"
+
+class Subscription:
+    __slots__ = ("topics", "pending", "ready", "overflowed", "closed")
+
+    def __init__(self, topics: Tuple[str, ...]):
+        self.topics = topics
+        # key -> (event name, JSON data); insertion order = delivery order
+        self.pending: Dict[str, Tuple[str, str]] = {}
+        self.ready = asyncio.Event()
+        self.overflowed = False
+        self.closed = False
+
+    def offer(self, key: str, name: str, data: str):
+        if self.overflowed:
+            return
+        self.pending.pop(key, None)
+        self.pending[key] = (name, data)
+        if len(self.pending) > settings.LIVE_MAX_PENDING:
+            self.overflowed = True
+            self.pending.clear()
+            LIVE_OVERFLOWS.inc()
+        self.ready.set()
+
+    def drain(self) -> List[Tuple[str, str]]:
+        messages = list(self.pending.values())
+        self.pending.clear()
+        self.ready.clear()
+        return messages
+
+class Broker:
+    """In-process pub/sub: topic -> subscriptions. Used from the event loop only."""
+
+    def __init__(self):
+        self.topics: Dict[str, Set[Subscription]] = {}
+        self.subscribers = 0
+        self.published = 0
+
+    def subscribe(self, topics: Iterable[str]) -> Optional[Subscription]:
+        """None when the process already serves LIVE_MAX_SUBSCRIBERS streams."""
+        if self.subscribers >= settings.LIVE_MAX_SUBSCRIBERS:
+            return None
+        subscription = Subscription(tuple(dict.fromkeys(topics)))
+        for topic in subscription.topics:
+            self.topics.setdefault(topic, set()).add(subscription)
+        self.subscribers += 1
+        LIVE_SUBSCRIBERS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Idempotent: the stream's own cleanup and the response's background task both call it."""
+        if subscription.closed:
+            return
+        subscription.closed = True
+        for topic in subscription.topics:
+            subscribers = self.topics.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self.topics[topic]
+        self.subscribers -= 1
+        LIVE_SUBSCRIBERS.dec()
+
+    def dispatch(self, topic: str, key: str, name: str, data: str):
+        self.published += 1
+        for subscription in self.topics.get(topic, ()):
+            subscription.offer(key, name, data)
+
+    def resync_all(self):
+        """Every local subscriber refetches (messages may have been missed, e.g. while the bridge was down)."""
+        for subscriptions in list(self.topics.values()):
+            for subscription in subscriptions:
+                subscription.overflowed = True
+                subscription.ready.set()
+
+    def stats(self) -> dict:
+        return {
+            "backend": settings.LIVE_BACKEND,
+            "subscribers": self.subscribers,
+            "topics": len(self.topics),
+            "published": self.published,
+            "bridge": bridge.stats() if settings.LIVE_BACKEND == "postgres" else None,
+        }
+
+broker = Broker()
+
+# ==========================================
+# Postgres LISTEN/NOTIFY Bridge (LIVE_BACKEND=postgres)
+# ==========================================
+
+class PostgresBridge:
+    """
+    One asyncpg connection per worker that LISTENs on CHANNEL and also sends the NOTIFYs
+    (queued, so publishing never waits on the database). Reconnects with a delay; while it is
+    down, publishes are dispatched locally only and every local subscriber is told to resync
+    once it is back.
+    """
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.connected = False
+        self.sent = 0
+        self.received = 0
+        self.dropped = 0
+        self.reconnects = 0
+
+    @staticmethod
+    def dsn() -> str:
+        url = settings.LIVE_NOTIFY_URL or settings.DATABASE_URL or ""
+        # asyncpg takes a plain libpq URL: drop SQLAlchemy's "+driver" suffix
+        return re.sub(r"^postgresql\+\w+://", "postgresql://", url)
+
+    def start(self):
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=settings.LIVE_MAX_PENDING * 16)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.connected = False
+
+    def publish(self, payload: str) -> bool:
+        """Queues a NOTIFY. False when the bridge is down or backed up (caller dispatches locally)."""
+        if not self.connected:
+            return False
+        try:
+            self._queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        return True
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self.received += 1
+        try:
+            message = json.loads(payload)
+            broker.dispatch(message["topic"], message["key"], message["name"], message["data"])
+        except (ValueError, KeyError) as e:
+            print(f"⚠️ Ignoring malformed live notification: {e}", flush=True)
+
+    async def _run(self):
+        import asyncpg  # Only needed with LIVE_BACKEND=postgres
+
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn(), timeout=10)
+                await connection.add_listener(CHANNEL, self._on_notify)
+                if self.reconnects:
+                    broker.resync_all()
+                self.connected = True
+                print("📡 Live updates: listening for Postgres notifications", flush=True)
+                while True:
+                    payload = await self._queue.get()
+                    await connection.execute("SELECT pg_notify($1, $2)", CHANNEL, payload)
+                    self.sent += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Live updates bridge failed, reconnecting: {e}", flush=True)
+            finally:
+                self.connected = False
+                if connection is not None:
+                    try:
+                        await connection.close(timeout=5)
+                    except Exception:
+                        connection.terminate()
+            self.reconnects += 1
+            await asyncio.sleep(5)
+
+    def stats(self) -> dict:
+        return {
+            "connected": self.connected,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "sent": self.sent,
+            "received": self.received,
+            "dropped": self.dropped,
+            "reconnects": self.reconnects,
+        }
+
+bridge = PostgresBridge()
+
+async def start_live_updates():
+    """Called from the app lifespan."""
+    if settings.LIVE_BACKEND == "postgres":
+        bridge.start()
+
+async def stop_live_updates():
+    await bridge.stop()
+
+# ==========================================
+# Publishing (call after the write commits)
+# ==========================================
+
+def publish(topic: str, key: str, name: str, payload: dict):
+    data = json.dumps(payload, separators=(",", ":"), default=str)
+    if settings.LIVE_BACKEND == "postgres":
+        message = json.dumps({"topic": topic, "key": key, "name": name, "data": data}, separators=(",", ":"))
+        if bridge.publish(message):
+            return  # Dispatched to everyone (this worker included) when the notification comes back
+    broker.dispatch(topic, key, name, data)
+
+def event_topic(event_id: str) -> str:
+    return f"event:{event_id}"
+
+def user_topic(user_id: str) -> str:
+    return f"user:{user_id}"
+
+def capacity_message(event_id: str, current: int, maximum: int, version: int) -> dict:
+    # Clients drop messages whose version is not newer than the one they hold
+    return {"eventId": event_id, "currentVolunteers": current, "maxVolunteers": maximum, "version": version}
+
+def publish_capacity(event_id: str, current: int, maximum: int, version: int):
+    publish(event_topic(event_id), f"capacity:{event_id}", "capacity", capacity_message(event_id, current, maximum, version))
+
+def publish_registration(user_id: str, registration_id: str, event_id: str, status: str, waitlist_position: Optional[int] = None):
+    publish(user_topic(user_id), f"registration:{registration_id}", "registration", {
+        "registrationId": registration_id,
+        "eventId": event_id,
+        "status": status,
+        "waitlistPosition": waitlist_position,
+    })
+
+# ==========================================
+# Stream
+# ==========================================
+
+def format_event(name: str, data: str) -> str:
+    return f"event: {name}\ndata: {data}\n\n"
+
+async def stream(subscription: Subscription, snapshot: List[dict]):
+    """
+    The text/event-stream body: client retry delay, the current capacity of the watched
+    events, then live messages and heartbeats until the client leaves, the subscriber
+    overflows or LIVE_MAX_SECONDS is up (the client's EventSource reconnects by itself).
+    """
+    deadline = time.monotonic() + settings.LIVE_MAX_SECONDS if settings.LIVE_MAX_SECONDS else None
+    try:
+        yield f"retry: {settings.LIVE_RETRY_MS}\n\n"
+        yield format_event("ready", json.dumps({"topics": list(subscription.topics)}, separators=(",", ":")))
+        for item in snapshot:
+            yield format_event("capacity", json.dumps(item, separators=(",", ":"), default=str))
+        while True:
+            timeout = settings.LIVE_HEARTBEAT_SECONDS
+            if deadline is not None:
+                timeout = min(timeout, deadline - time.monotonic())
+                if timeout <= 0:
+                    return
+            try:
+                await asyncio.wait_for(subscription.ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if subscription.overflowed:
+                yield format_event("resync", "{}")
+                return
+            # Everything pending goes out as one chunk
+            yield "".join(format_event(name, data) for name, data in subscription.drain())
+    finally:
+        broker.unsubscribe(subscription)
+
+def get_live_stats() -> dict:
+    return broker.stats()
@@ -0,0 +1,164 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Sequence, Set, TypeVar
+
+from fastapi import Depends
+from sqlalchemy import and_, or_
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api.database import get_async_session
+from api.models import Bookmark, Event, Registration
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+def pairs_in(first, second, keys: Sequence[tuple]):
+    """
+    (first, second) IN keys, grouped by the first value: `first = ? AND second IN (...)` per
+    group. Unlike a row-value IN (VALUES ...), every database can answer it from a
+    (first, second) index; loader batches almost always share one user anyway.
+    """
+    groups: Dict[Any, List[Any]] = {}
+    for a, b in keys:
+        groups.setdefault(a, []).append(b)
+    return or_(*(and_(first == a, col(second).in_(values)) for a, values in groups.items()))
+
+# ==========================================
+# Batch Loader (DataLoader pattern)
+# ==========================================
+
+class BatchLoader(Generic[K, V]):
+    """
+    Request-scoped batching + memoization for lookups by key.
+
+    Every `load(key)` issued in the same event-loop tick is collected and resolved by a
+    single call to `batch_fn(keys)` (one `IN (...)` query). Results are memoized for the rest
+    of the request, so asking for the same key twice never hits the database again.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[K]], Awaitable[Dict[K, V]]],
+        lock: asyncio.Lock,
+        default_factory: Callable[[], Any] = lambda: None,
+        max_batch_size: int = 500,
+    ):
+        self._batch_fn = batch_fn
+        # Shared per session: an AsyncSession can only run one statement at a time
+        self._lock = lock
+        self._default_factory = default_factory
+        self._max_batch_size = max_batch_size
+        self._cache: Dict[K, asyncio.Future] = {}
+        self._pending: List[K] = []
+        # The event loop only holds weak references to tasks: keep in-flight batches alive here
+        self._tasks: Set[asyncio.Task] = set()
+
+    def load(self, key: K) -> Awaitable[V]:
+        if key in self._cache:
+            return self._cache[key]
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._cache[key] = future
+        self._pending.append(key)
+        if len(self._pending) == 1:
+            # Dispatch once the current tick has queued all its keys
+            loop.call_soon(self._start_dispatch)
+        return future
+
+    async def load_many(self, keys: Sequence[K]) -> List[V]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: K, value: V):
+        """Seed the cache with a value the caller already has (e.g. a row it just wrote)."""
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        self._cache[key] = future
+
+    def clear(self, key: Optional[K] = None):
+        """Forget one key (after a write) or everything."""
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def _start_dispatch(self):
+        keys, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._dispatch(keys))
+        self._tasks.add(task)
+        task.add_done_callback(lambda done: self._dispatched(keys, done))
+
+    def _dispatched(self, keys: List[K], task: asyncio.Task):
+        """Anything the batch didn't resolve (cancelled, or failed outside batch_fn) fails its waiters."""
+        self._tasks.discard(task)
+        error = None if task.cancelled() else task.exception()
+        if not task.cancelled() and error is None:
+            return
+        for key in keys:
+            future = self._cache.get(key)
+            if future is None or future.done():
+                continue
+            self._cache.pop(key)
+            if error is None:
+                future.cancel()
+            else:
+                future.set_exception(error)
+
+    async def _dispatch(self, keys: List[K]):
+        for start in range(0, len(keys), self._max_batch_size):
+            chunk = keys[start:start + self._max_batch_size]
+            try:
+                async with self._lock:
+                    results = await self._batch_fn(chunk)
+            except Exception as e:
+                for key in chunk:
+                    future = self._cache.pop(key, None)
+                    if future and not future.done():
+                        future.set_exception(e)
+                continue
+            for key in chunk:
+                future = self._cache.get(key)
+                if future and not future.done():
+                    future.set_result(results[key] if key in results else self._default_factory())
+
+# ==========================================
+# Domain Loaders
+# ==========================================
+
+class Loaders:
+    """
+    The batch loaders for one request, all sharing the request's session.
+
+    - events:        event_id -> Event | None
+    - registrations: (user_id, event_id) -> Registration | None
+    - bookmarks:     user_id -> [event_id, ...]
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        lock = asyncio.Lock()
+        self.events = BatchLoader(self._load_events, lock)
+        self.registrations = BatchLoader(self._load_registrations, lock)
+        self.bookmarks = BatchLoader(self._load_bookmarks, lock, default_factory=list)
+
+    async def _load_events(self, event_ids: List[str]) -> Dict[str, Event]:
+        rows = (await self.session.exec(select(Event).where(col(Event.id).in_(event_ids)))).all()
+        return {event.id: event for event in rows}
+
+    async def _load_registrations(self, keys: List[tuple]) -> Dict[tuple, Registration]:
+        rows = (await self.session.exec(
+            select(Registration).where(pairs_in(Registration.userId, Registration.eventId, keys))
+        )).all()
+        return {(reg.userId, reg.eventId): reg for reg in rows}
+
+    async def _load_bookmarks(self, user_ids: List[str]) -> Dict[str, List[str]]:
+        rows = (await self.session.exec(
+            select(Bookmark.userId, Bookmark.eventId).where(col(Bookmark.userId).in_(user_ids), ~col(Bookmark.removed))
+        )).all()
+        bookmarks: Dict[str, List[str]] = {}
+        for user_id, event_id in rows:
+            bookmarks.setdefault(user_id, []).append(event_id)
+        return bookmarks
+
+def get_loaders(session: AsyncSession = Depends(get_async_session)) -> Loaders:
+    """Dependency: request-scoped loaders bound to the same session as the endpoint."""
+    return Loaders(session)
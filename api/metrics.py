@@ -0,0 +1,309 @@
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Tuple
+
+from fastapi import Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from api.config import settings
+
+# ==========================================
+# Metrics Registry (Prometheus text exposition)
+# ==========================================
+# A small in-process registry: counters, gauges and histograms keyed by label values,
+# updated under one lock (a dict update per observation, no I/O on the hot path) and
+# rendered by GET /api/metrics in the Prometheus text format.
+#
+# Multiple workers (METRICS_MULTIPROC_DIR): every process writes its own snapshot to
+# <dir>/metrics_<pid>.json at most once per METRICS_FLUSH_INTERVAL (piggybacking on requests)
+# and at shutdown; the worker answering a scrape merges all snapshots. Counters and
+# histograms are summed, including those of exited workers, so totals never go backwards;
+# gauges only count live processes. Empty the directory when deploying (like
+# prometheus_client's multiprocess mode).
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, registry: "Registry", name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labels)
+        self.values: Dict[tuple, object] = {}
+        registry.register(self)
+
+    def dump(self) -> dict:
+        with _lock:
+            return {
+                "type": self.type,
+                "help": self.documentation,
+                "labels": list(self.labelnames),
+                "values": [[list(key), _copy(value)] for key, value in self.values.items()],
+            }
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with _lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with _lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str):
+        with _lock:
+            self.values[labels] = value
+
+class Histogram(Metric):
+    """Values are [per-bucket counts (last one is +Inf), sum, count]; cumulated when rendered."""
+
+    type = "histogram"
+
+    def __init__(self, registry: "Registry", name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(registry, name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with _lock:
+            state = self.values.get(labels)
+            if state is None:
+                state = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def dump(self) -> dict:
+        return {**super().dump(), "buckets": list(self.buckets)}
+
+def _copy(value):
+    return [list(value[0]), value[1], value[2]] if isinstance(value, list) else value
+
+class Registry:
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+        self._last_flush = 0.0
+
+    def register(self, metric: Metric):
+        self.metrics[metric.name] = metric
+
+    def snapshot(self) -> dict:
+        return {"pid": os.getpid(), "metrics": {name: metric.dump() for name, metric in self.metrics.items()}}
+
+    # --- Multiprocess ---
+
+    def flush(self):
+        """Writes this process's snapshot atomically (temp file + rename)."""
+        directory = settings.METRICS_MULTIPROC_DIR
+        if not directory:
+            return
+        self._last_flush = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"metrics_{os.getpid()}.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.snapshot(), f, separators=(",", ":"))
+        os.replace(path + ".tmp", path)
+
+    def maybe_flush(self, force: bool = False):
+        due = force or time.monotonic() - self._last_flush >= settings.METRICS_FLUSH_INTERVAL
+        if settings.METRICS_MULTIPROC_DIR and due:
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"⚠️ Metrics flush failed: {e}", flush=True)
+
+    def collect(self) -> List[dict]:
+        """This process's snapshot, plus the other workers' when METRICS_MULTIPROC_DIR is set."""
+        snapshots = [self.snapshot()]
+        directory = settings.METRICS_MULTIPROC_DIR
+        if directory and os.path.isdir(directory):
+            self.maybe_flush()
+            for filename in os.listdir(directory):
+                if not (filename.startswith("metrics_") and filename.endswith(".json")):
+                    continue
+                try:
+                    with open(os.path.join(directory, filename)) as f:
+                        snapshot = json.load(f)
+                except (OSError, ValueError):
+                    continue  # Being replaced right now, or garbage
+                if snapshot.get("pid") != os.getpid():
+                    snapshot["alive"] = _pid_alive(snapshot.get("pid"))
+                    snapshots.append(snapshot)
+        return snapshots
+
+    def render(self) -> str:
+        merged = _merge(self.collect())
+        lines = []
+        for name, metric in merged.items():
+            lines.append(f"# HELP {name} {metric['help']}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+            labelnames = metric["labels"]
+            for key, value in sorted(metric["values"].items()):
+                if metric["type"] == "histogram":
+                    counts, total, count = value
+                    cumulative = 0
+                    for bound, bucket in zip(metric["buckets"] + ["+Inf"], counts):
+                        cumulative += bucket
+                        le = bound if bound == "+Inf" else _number(bound)
+                        lines.append(f"{name}_bucket{_labels(labelnames + ['le'], key + (le,))} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(labelnames, key)} {_number(total)}")
+                    lines.append(f"{name}_count{_labels(labelnames, key)} {count}")
+                else:
+                    lines.append(f"{name}{_labels(labelnames, key)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+def _pid_alive(pid) -> bool:
+    if not isinstance(pid, int):
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _merge(snapshots: List[dict]) -> Dict[str, dict]:
+    merged: Dict[str, dict] = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot["metrics"].items():
+            if metric["type"] == "gauge" and not snapshot.get("alive", True):
+                continue
+            target = merged.setdefault(name, {**metric, "values": {}})
+            for key, value in metric["values"]:
+                key = tuple(key)
+                current = target["values"].get(key)
+                if current is None:
+                    target["values"][key] = _copy(value)
+                elif metric["type"] == "histogram":
+                    current[0] = [a + b for a, b in zip(current[0], value[0])]
+                    current[1] += value[1]
+                    current[2] += value[2]
+                else:
+                    target["values"][key] = current + value
+    return merged
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: List[str], values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else f"{int(value)}.0"
+
+registry = Registry()
+
+# ==========================================
+# Application Metrics
+# ==========================================
+
+HTTP_REQUESTS = Counter(registry, "http_requests_total", "Requests by route template and status code.", ("method", "route", "status"))
+HTTP_DURATION = Histogram(registry, "http_request_duration_seconds", "Handler latency by route template.", ("method", "route"))
+HTTP_IN_FLIGHT = Gauge(registry, "http_requests_in_flight", "Requests currently being handled, by route template.", ("method", "route"))
+
+DB_ACQUIRE = Histogram(
+    registry, "db_connection_acquire_seconds",
+    "Time to obtain a connection from the pool (queueing, or the full handshake under NullPool).", ("pool_mode",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+DB_ACQUIRE_TIMEOUTS = Counter(registry, "db_connection_acquire_timeouts_total", "Pool checkouts that failed or timed out.", ("pool_mode",))
+
+JWKS_FETCHES = Counter(registry, "jwks_fetches_total", "JWKS document fetches from the issuer.", ("outcome",))
+JWKS_FETCH_DURATION = Histogram(registry, "jwks_fetch_duration_seconds", "JWKS fetch latency.")
+
+JOB_RUNS = Counter(registry, "job_runs_total", "Background/cron job runs.", ("job", "status"))
+JOB_DURATION = Histogram(
+    registry, "job_duration_seconds", "Background/cron job duration (auto-conclude sweeps included).", ("job",),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+EVENTS_CONCLUDED = Counter(registry, "auto_conclude_events_total", "Events marked completed by the auto-conclude sweep.")
+
+LIVE_SUBSCRIBERS = Gauge(registry, "live_subscribers", "Open GET /api/live streams.")
+LIVE_OVERFLOWS = Counter(registry, "live_overflows_total", "Live subscribers closed with 'resync' because they fell too far behind.")
+
+ADMISSION_ACTIVE = Gauge(registry, "admission_active_requests", "Requests holding an admission slot (running against the database).")
+ADMISSION_QUEUED = Gauge(registry, "admission_queued_requests", "Requests waiting for an admission slot.")
+ADMISSION_WAIT = Histogram(
+    registry, "admission_wait_seconds", "Time admitted requests waited for a slot.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+ADMISSION_SHED = Counter(registry, "admission_shed_total", "Requests answered 503 by admission control.", ("reason",))
+RATE_LIMITED = Counter(registry, "rate_limited_total", "Writes answered 429 by a token bucket.", ("bucket",))
+
+class MetricsRoute(APIRoute):
+    """
+    Route class that records latency, in-flight requests and status codes per route template
+    (so /api/events/{event_id} is one series, not one per id). Set on the router before any
+    route is declared.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        route = self.path
+
+        async def instrumented_handler(request: Request) -> Response:
+            method = request.method
+            HTTP_IN_FLIGHT.inc(method, route)
+            started = time.perf_counter()
+            status = 500
+            try:
+                response = await handler(request)
+                status = response.status_code
+                return response
+            except StarletteHTTPException as e:
+                status = e.status_code
+                raise
+            except RequestValidationError:
+                status = 422
+                raise
+            finally:
+                HTTP_IN_FLIGHT.dec(method, route)
+                HTTP_DURATION.observe(time.perf_counter() - started, method, route)
+                HTTP_REQUESTS.inc(method, route, str(status))
+                registry.maybe_flush()
+
+        return instrumented_handler
+
+def timed_job(name: str):
+    """Decorator for job entry points: records each run's duration and outcome ('status' of the result)."""
+    def decorate(run):
+        @functools.wraps(run)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = run(*args, **kwargs)
+            except Exception:
+                JOB_RUNS.inc(name, "error")
+                JOB_DURATION.observe(time.perf_counter() - started, name)
+                raise
+            status = result.get("status", "ok") if isinstance(result, dict) else "ok"
+            JOB_RUNS.inc(name, status)
+            if status != "skipped":
+                JOB_DURATION.observe(time.perf_counter() - started, name)
+            return result
+        return wrapper
+    return decorate
+
+def render_metrics() -> str:
+    return registry.render()
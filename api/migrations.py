@@ -0,0 +1,372 @@
+import datetime
+import sys
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import (
+    Column, Date, DateTime, Integer, MetaData, String, Table, UniqueConstraint,
+    inspect, insert, select, text,
+)
+from sqlalchemy.engine import Connection, Engine
+
+from api.database import get_engine
+from api.jobs import reconcile_ratings_statement
+from api.search import POSTGRES_BACKFILL, POSTGRES_FUNCTIONS, POSTGRES_TRIGGER, SQLITE_SCHEMA
+
+# ==========================================
+# Versioned Schema Migrations
+# ==========================================
+# Usage: python -m api.migrations [upgrade|status]
+#
+# Every migration has a version number and runs at most once per database: applied versions
+# are recorded in the schema_version table. Migrations create tables from the frozen
+# definitions below, never from api/models.py, so a fresh database replays the same history
+# as an old one. Each step is also idempotent on its own (IF NOT EXISTS, column checks),
+# because databases created by the pre-versioning scripts already have part of the schema,
+# and non-transactional migrations (online index builds) can fail halfway and must be safe
+# to re-run.
+#
+# Postgres: indexes are built with CREATE INDEX CONCURRENTLY (no write lock on the table),
+# which can't run inside a transaction; those migrations run in autocommit mode and a failed
+# build's INVALID leftover is dropped and rebuilt on the next run. Columns are added without
+# a table rewrite (nullable, or a constant / stable default).
+# SQLite (local dev, benchmarks): plain CREATE INDEX, every migration in one transaction.
+
+schema_metadata = MetaData()
+schema_version = Table(
+    "schema_version", schema_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("appliedAt", DateTime, nullable=False),
+)
+
+# --- Frozen table definitions (as first created; later columns are added by their migration) ---
+
+frozen_metadata = MetaData()
+
+baseline_tables = [
+    Table(
+        "event", frozen_metadata,
+        Column("id", String, primary_key=True),
+        Column("title", String, nullable=False),
+        Column("date", Date, nullable=False),
+        Column("location", String, nullable=False),
+        Column("locationCategory", String, nullable=False),
+        Column("category", String, nullable=False),
+        Column("maxVolunteers", Integer, nullable=False),
+        Column("currentVolunteers", Integer, nullable=False),
+        Column("description", String, nullable=False),
+        Column("organizerId", String, nullable=False),
+        Column("organizerName", String, nullable=False),
+        Column("imageUrl", String),
+        Column("tasks", String, nullable=False),
+        Column("whatsappLink", String),
+        Column("welcomeMessage", String),
+        Column("status", String, nullable=False),
+    ),
+    Table(
+        "registration", frozen_metadata,
+        Column("id", String, primary_key=True),
+        Column("eventId", String, nullable=False, index=True),
+        Column("userId", String, nullable=False, index=True),
+        Column("status", String, nullable=False),
+        Column("joinedAt", String, nullable=False),
+        Column("userName", String),
+        Column("userAvatar", String),
+        UniqueConstraint("userId", "eventId", name="unique_registration"),
+    ),
+    Table(
+        "feedback", frozen_metadata,
+        Column("id", String, primary_key=True),
+        Column("eventId", String, nullable=False, index=True),
+        Column("userId", String, nullable=False, index=True),
+        Column("rating", Integer, nullable=False),
+        Column("comment", String, nullable=False),
+    ),
+    Table(
+        "bookmark", frozen_metadata,
+        Column("id", String, primary_key=True),
+        Column("userId", String, nullable=False, index=True),
+        Column("eventId", String, nullable=False, index=True),
+    ),
+]
+
+counter_tables = [
+    Table(
+        "waitlistcounter", frozen_metadata,
+        Column("eventId", String, primary_key=True),
+        Column("lastPosition", Integer, nullable=False),
+    ),
+    Table(
+        "userstats", frozen_metadata,
+        Column("userId", String, primary_key=True),
+        Column("userName", String),
+        Column("userAvatar", String),
+        Column("pendingCount", Integer, nullable=False),
+        Column("confirmedCount", Integer, nullable=False),
+        Column("completedMissions", Integer, nullable=False),
+    ),
+    Table(
+        "userbadge", frozen_metadata,
+        Column("userId", String, primary_key=True),
+        Column("badgeId", String, primary_key=True),
+        Column("earnedAt", Date, nullable=False),
+    ),
+]
+
+bookmark_counter = Table(
+    "bookmarkcounter", frozen_metadata,
+    Column("userId", String, primary_key=True),
+    Column("lastVersion", Integer, nullable=False),
+)
+
+event_changes = Table(
+    "eventchanges", frozen_metadata,
+    Column("shard", Integer, primary_key=True),
+    Column("changes", Integer, nullable=False),
+)
+
+class Migration:
+    def __init__(self, version: int, name: str, upgrade: Callable[[Connection], None], transactional: bool):
+        self.version = version
+        self.name = name
+        self.upgrade = upgrade
+        self.transactional = transactional
+
+MIGRATIONS: List[Migration] = []
+
+def migration(version: int, name: str, transactional: bool = True):
+    """Registers `upgrade(conn)` as schema version `version`. Versions must be declared in order."""
+    def register(upgrade: Callable[[Connection], None]):
+        assert not MIGRATIONS or MIGRATIONS[-1].version < version, "migrations must be declared in order"
+        MIGRATIONS.append(Migration(version, name, upgrade, transactional))
+        return upgrade
+    return register
+
+# --- Idempotent steps ---
+
+def add_column(conn: Connection, table: str, column: str, ddl: str) -> bool:
+    """ALTER TABLE ... ADD COLUMN, unless the column is already there."""
+    if column in {c["name"] for c in inspect(conn).get_columns(table)}:
+        return False
+    conn.execute(text(f'ALTER TABLE {table} ADD COLUMN "{column}" {ddl}'))
+    return True
+
+IndexColumn = Union[str, Tuple[str, str]]
+
+def create_index(conn: Connection, name: str, table: str, columns: Sequence[IndexColumn],
+                 unique: bool = False, using: Optional[str] = None):
+    """
+    CREATE INDEX IF NOT EXISTS; CONCURRENTLY on Postgres (the connection must be in autocommit).
+    A column may be a (column, operator class) pair, e.g. ("title", "gin_trgm_ops") with using="GIN".
+    """
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    method = f" USING {using}" if using else ""
+    column_list = ", ".join(
+        f'"{column[0]}" {column[1]}' if isinstance(column, tuple) else f'"{column}"' for column in columns
+    )
+    if conn.dialect.name == "postgresql":
+        invalid = conn.execute(text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ), {"name": name}).first()
+        if invalid:
+            print(f"♻️ Dropping invalid index {name} left by an interrupted build", flush=True)
+            conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+        conn.execute(text(f'CREATE {kind} CONCURRENTLY IF NOT EXISTS "{name}" ON {table}{method} ({column_list})'))
+    else:
+        conn.execute(text(f'CREATE {kind} IF NOT EXISTS "{name}" ON {table}{method} ({column_list})'))
+
+# ==========================================
+# Migrations
+# ==========================================
+
+@migration(1, "baseline")
+def baseline(conn: Connection):
+    """The schema previously applied by scripts/migrate_v2.py, for databases of any age."""
+    frozen_metadata.create_all(conn, tables=baseline_tables)
+    # Columns migrate_v2 added to databases created before them
+    add_column(conn, "event", "locationCategory", "VARCHAR DEFAULT 'Other'")
+    add_column(conn, "event", "whatsappLink", "VARCHAR")
+    add_column(conn, "event", "welcomeMessage", "VARCHAR")
+
+@migration(2, "ratings, change tracking, waitlist and stats")
+def counters(conn: Connection):
+    # Denormalized rating counters (rebuild with: python -m api.jobs reconcile-ratings)
+    add_column(conn, "event", "ratingSum", "INTEGER NOT NULL DEFAULT 0")
+    add_column(conn, "event", "ratingCount", "INTEGER NOT NULL DEFAULT 0")
+    # Change tracking for ETag / Last-Modified (existing rows start at version 1, modified now)
+    add_column(conn, "event", "version", "INTEGER NOT NULL DEFAULT 1")
+    if conn.dialect.name == "postgresql":
+        # A stable default is evaluated once and stored in the catalog: no UPDATE of every row
+        add_column(conn, "event", "updatedAt", "TIMESTAMP DEFAULT CURRENT_TIMESTAMP")
+    elif add_column(conn, "event", "updatedAt", "TIMESTAMP"):
+        conn.execute(text('UPDATE event SET "updatedAt" = CURRENT_TIMESTAMP WHERE "updatedAt" IS NULL'))
+    # Instant signups: waitlist ticket per registration
+    add_column(conn, "registration", "waitlistPosition", "INTEGER")
+    # Per-event waitlist ticket counter, volunteer stats and badges
+    # (rebuild stats with: python -m api.jobs rebuild-user-stats)
+    frozen_metadata.create_all(conn, tables=counter_tables)
+
+@migration(3, "full-text search", transactional=False)
+def full_text_search(conn: Connection):
+    """tsvector + pg_trgm on Postgres, FTS5 on SQLite (see api/search.py)."""
+    if conn.dialect.name != "postgresql":
+        for statement in SQLITE_SCHEMA:
+            conn.execute(text(statement))
+        return
+
+    for statement in POSTGRES_FUNCTIONS:
+        conn.execute(text(statement))
+    # Nullable column without a default: a catalog change, not a table rewrite
+    add_column(conn, "event", "search_vector", "tsvector")
+    generated = conn.execute(text(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = 'event' AND column_name = 'search_vector' AND is_generated = 'ALWAYS'"
+    )).first()
+    # Databases from before this migration may already have it as a generated column
+    if not generated:
+        has_trigger = conn.execute(text(
+            "SELECT 1 FROM pg_trigger WHERE tgname = 'event_search_vector_update' AND NOT tgisinternal"
+        )).first()
+        if not has_trigger:
+            conn.execute(text(POSTGRES_TRIGGER))
+        while conn.execute(text(POSTGRES_BACKFILL), {"batch": 1000}).rowcount:
+            pass
+    create_index(conn, "ix_event_search_vector", "event", ("search_vector",), using="GIN")
+    create_index(conn, "ix_event_title_trgm", "event", (("title", "gin_trgm_ops"),), using="GIN")
+
+@migration(4, "keyset and stats indexes", transactional=False)
+def keyset_indexes(conn: Connection):
+    # Keyset pagination (ORDER BY date, id), unfiltered / by status / by organizer
+    create_index(conn, "ix_event_date_id", "event", ("date", "id"))
+    create_index(conn, "ix_event_status_date_id", "event", ("status", "date", "id"))
+    create_index(conn, "ix_event_organizer_date_id", "event", ("organizerId", "date", "id"))
+    create_index(conn, "ix_event_updatedAt", "event", ("updatedAt",))
+    create_index(conn, "ix_userstats_completed_user", "userstats", ("completedMissions", "userId"))
+    # One review per volunteer per event. Reviews submitted twice before the constraint existed:
+    # keep the first of each pair, then rebuild the rating counters of the affected events
+    conn.execute(text(
+        'DELETE FROM feedback WHERE id NOT IN (SELECT MIN(id) FROM feedback GROUP BY "userId", "eventId")'
+    ))
+    conn.execute(reconcile_ratings_statement())
+    create_index(conn, "unique_feedback", "feedback", ("userId", "eventId"), unique=True)
+
+@migration(5, "hot-path indexes", transactional=False)
+def hot_path_indexes(conn: Connection):
+    # Auto-conclude sweep (status = 'upcoming' AND date < today) and the organizer dashboard
+    # are served by ix_event_status_date_id / ix_event_organizer_date_id from version 4.
+    create_index(conn, "ix_registration_user_status", "registration", ("userId", "status"))
+    create_index(conn, "ix_feedback_event_user", "feedback", ("eventId", "userId"))
+    # Double-clicked bookmark toggles may have left duplicates: keep the first of each pair
+    conn.execute(text(
+        'DELETE FROM bookmark WHERE id NOT IN (SELECT MIN(id) FROM bookmark GROUP BY "userId", "eventId")'
+    ))
+    create_index(conn, "unique_bookmark", "bookmark", ("userId", "eventId"), unique=True)
+
+@migration(6, "bookmark sync", transactional=False)
+def bookmark_sync(conn: Connection):
+    # Per-user version counter, tombstones and the version index for delta sync (api/bookmarks.py)
+    bookmark_counter.create(conn, checkfirst=True)
+    add_column(conn, "bookmark", "removed", "BOOLEAN NOT NULL DEFAULT FALSE")
+    add_column(conn, "bookmark", "version", "INTEGER NOT NULL DEFAULT 0")
+    create_index(conn, "ix_bookmark_user_version", "bookmark", ("userId", "version"))
+
+EVENT_CHANGE_SHARDS = 16
+
+@migration(7, "event change counter")
+def event_change_counter(conn: Connection):
+    """
+    The list validator (api/conditional.py): sum(eventchanges.changes) grows with every
+    committed write to the event table, from any code path.
+    """
+    event_changes.create(conn, checkfirst=True)
+    existing = set(conn.execute(select(event_changes.c.shard)).scalars())
+    missing = [{"shard": shard, "changes": 0} for shard in range(EVENT_CHANGE_SHARDS) if shard not in existing]
+    if missing:
+        conn.execute(insert(event_changes), missing)
+
+    if conn.dialect.name == "postgresql":
+        # Deferred to commit and run once per transaction, so the shard row is locked only while
+        # committing (after every event row lock the transaction takes). Shards spread
+        # concurrent writers; the transaction id picks one.
+        conn.execute(text(f"""CREATE OR REPLACE FUNCTION event_changes_bump() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF current_setting('umission.event_changes_bumped', true) IS DISTINCT FROM 'on' THEN
+                PERFORM set_config('umission.event_changes_bumped', 'on', true);
+                UPDATE eventchanges SET changes = changes + 1 WHERE shard = txid_current() % {EVENT_CHANGE_SHARDS};
+            END IF;
+            RETURN NULL;
+        END $$;"""))
+        exists = conn.execute(text(
+            "SELECT 1 FROM pg_trigger WHERE tgname = 'event_changes_bump' AND NOT tgisinternal"
+        )).first()
+        if not exists:
+            conn.execute(text("""CREATE CONSTRAINT TRIGGER event_changes_bump
+                AFTER INSERT OR UPDATE OR DELETE ON event DEFERRABLE INITIALLY DEFERRED
+                FOR EACH ROW EXECUTE FUNCTION event_changes_bump();"""))
+    else:
+        # SQLite serializes writers: a plain row trigger on one shard
+        for operation in ("INSERT", "UPDATE", "DELETE"):
+            conn.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS event_changes_{operation.lower()} AFTER {operation} ON event "
+                "BEGIN UPDATE eventchanges SET changes = changes + 1 WHERE shard = 0; END;"
+            ))
+
+# ==========================================
+# Runner
+# ==========================================
+
+def applied_versions(engine: Engine) -> Dict[int, dict]:
+    with engine.begin() as conn:
+        schema_metadata.create_all(conn)
+        rows = conn.execute(select(schema_version)).mappings().all()
+    return {row["version"]: dict(row) for row in rows}
+
+def _record(conn: Connection, step: Migration):
+    conn.execute(insert(schema_version).values(
+        version=step.version, name=step.name, appliedAt=datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    ))
+
+def upgrade(engine: Optional[Engine] = None, target: Optional[int] = None) -> List[int]:
+    """Applies every pending migration up to `target` (default: all), in order. Returns the versions applied."""
+    engine = engine or get_engine()
+    applied = applied_versions(engine)
+    done = []
+    for step in MIGRATIONS:
+        if step.version in applied or (target is not None and step.version > target):
+            continue
+        print(f"🚀 Applying migration {step.version}: {step.name}", flush=True)
+        if step.transactional or engine.dialect.name != "postgresql":
+            with engine.begin() as conn:
+                step.upgrade(conn)
+                _record(conn, step)
+        else:
+            with engine.connect() as conn:
+                conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+                step.upgrade(conn)
+                _record(conn, step)
+        done.append(step.version)
+    return done
+
+def status(engine: Optional[Engine] = None) -> List[dict]:
+    applied = applied_versions(engine or get_engine())
+    return [
+        {
+            "version": step.version,
+            "name": step.name,
+            "appliedAt": applied[step.version]["appliedAt"].isoformat() if step.version in applied else None,
+        }
+        for step in MIGRATIONS
+    ]
+
+if __name__ == "__main__":
+    # Usage: python -m api.migrations [upgrade [version]|status]
+    command = sys.argv[1] if len(sys.argv) > 1 else "upgrade"
+    if command == "status":
+        for row in status():
+            print(f"{row['version']:>4}  {row['appliedAt'] or 'pending':<26}  {row['name']}")
+    elif command == "upgrade":
+        applied = upgrade(target=int(sys.argv[2]) if len(sys.argv) > 2 else None)
+        print(f"🏁 Applied {len(applied)} migration(s)." if applied else "✅ Schema is up to date.")
+    else:
+        raise SystemExit(f"Unknown command {command!r} (expected upgrade or status)")
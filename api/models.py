@@ -1,9 +1,9 @@
 import uuid
-from datetime import date
+from datetime import date, datetime, timezone
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 
-from sqlmodel import Field, SQLModel, UniqueConstraint
+from sqlmodel import Field, Index, SQLModel, UniqueConstraint
 
 # ==========================================
 # Enums (Domain Constants)
@@ -26,11 +26,17 @@ class RegistrationStatus(str, Enum):
     PENDING = "pending"
     CONFIRMED = "confirmed"
     REJECTED = "rejected"
+    # Instant signup mode only: event was full, promoted automatically when a seat frees up
+    WAITLISTED = "waitlisted"
 
 # ==========================================
 # Domain Models (Database Tables)
 # ==========================================
 
+def utc_now() -> datetime:
+    """Naive UTC timestamp (columns are TIMESTAMP WITHOUT TIME ZONE)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 class Event(SQLModel, table=True):
     """
     Represents a volunteering opportunity/activity.
@@ -59,6 +65,31 @@ class Event(SQLModel, table=True):
     
     status: str = Field(default=EventStatus.UPCOMING)
 
+    # Denormalized rating aggregates (maintained by feedback writes, rebuilt by api/jobs.py)
+    ratingSum: int = Field(default=0)
+    ratingCount: int = Field(default=0)
+
+    # Change tracking (the single-event ETag is built from version): bumped by every write (see touch / version_bump)
+    version: int = Field(default=1)
+    updatedAt: Optional[datetime] = Field(default_factory=utc_now, index=True)
+
+    # Keyset pagination orders by (date, id), optionally filtered by status or organizer
+    __table_args__ = (
+        Index("ix_event_date_id", "date", "id"),
+        Index("ix_event_status_date_id", "status", "date", "id"),
+        Index("ix_event_organizer_date_id", "organizerId", "date", "id"),
+    )
+
+    def touch(self):
+        """Marks an ORM-loaded event as changed. The increment runs in SQL, so concurrent writers can't reuse a version."""
+        self.version = Event.version + 1
+        self.updatedAt = utc_now()
+
+    @staticmethod
+    def version_bump() -> dict:
+        """The same change for set-based UPDATE statements: update(Event).values(..., **Event.version_bump())."""
+        return {"version": Event.version + 1, "updatedAt": utc_now()}
+
 class EventReadWithStats(Event):
     """
     Extended Event model including aggregated statistics.
@@ -82,8 +113,15 @@ class Registration(SQLModel, table=True):
     userName: Optional[str] = "Student Volunteer"
     userAvatar: Optional[str] = None
 
-    # Prevent duplicate registrations for same event
-    __table_args__ = (UniqueConstraint("userId", "eventId", name="unique_registration"),)
+    # Ticket number while waitlisted (lower = earlier); cleared on promotion
+    waitlistPosition: Optional[int] = Field(default=None)
+
+    __table_args__ = (
+        # Prevent duplicate registrations for same event
+        UniqueConstraint("userId", "eventId", name="unique_registration"),
+        # A volunteer's registrations by status (dashboard, stats rebuild)
+        Index("ix_registration_user_status", "userId", "status"),
+    )
 
 class Feedback(SQLModel, table=True):
     """
@@ -95,6 +133,13 @@ class Feedback(SQLModel, table=True):
     rating: int = Field(ge=1, le=5) # Enforce 1-5 rating
     comment: str
 
+    __table_args__ = (
+        # One review per volunteer per event (keeps the event rating counters exact)
+        UniqueConstraint("userId", "eventId", name="unique_feedback"),
+        # An event's reviews, and "has this volunteer reviewed it" lookups from the event side
+        Index("ix_feedback_event_user", "eventId", "userId"),
+    )
+
 class Bookmark(SQLModel, table=True):
     """
     User's saved events for later viewing.
@@ -102,6 +147,65 @@ class Bookmark(SQLModel, table=True):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     userId: str = Field(index=True)
     eventId: str = Field(index=True)
+    # Delta sync (see api/bookmarks.py): removing keeps the row as a tombstone, and `version`
+    # is the user's BookmarkCounter value when the row last changed
+    removed: bool = Field(default=False)
+    version: int = Field(default=0)
+
+    __table_args__ = (
+        # One bookmark per user per event
+        Index("unique_bookmark", "userId", "eventId", unique=True),
+        # A user's bookmark changes after a version
+        Index("ix_bookmark_user_version", "userId", "version"),
+    )
+
+class BookmarkCounter(SQLModel, table=True):
+    """Last bookmark version handed out per user (same atomic upsert as WaitlistCounter)."""
+    userId: str = Field(primary_key=True)
+    lastVersion: int = Field(default=0)
+
+class WaitlistCounter(SQLModel, table=True):
+    """
+    Last waitlist ticket handed out per event. Kept off the Event row so waitlisting
+    doesn't change the event's version (ETag) or contend with its readers.
+    """
+    eventId: str = Field(primary_key=True)
+    lastPosition: int = Field(default=0)
+
+class EventChanges(SQLModel, table=True):
+    """
+    Committed changes to the event table, spread over a few shard rows. Bumped by a database
+    trigger once per writing transaction, at commit (see the event change counter migration),
+    so the sum only ever grows and grows with every commit: the list endpoints' validator.
+    """
+    shard: int = Field(primary_key=True)
+    changes: int = Field(default=0)
+
+class UserStats(SQLModel, table=True):
+    """
+    Per-volunteer counters, maintained incrementally on every registration/event transition.
+    Powers badges and the leaderboard without scanning the registration table.
+    """
+    userId: str = Field(primary_key=True)
+    # Snapshot of the latest name/avatar the volunteer joined with (for the leaderboard)
+    userName: Optional[str] = None
+    userAvatar: Optional[str] = None
+
+    pendingCount: int = Field(default=0)
+    confirmedCount: int = Field(default=0)
+    # Confirmed registrations for events that are now 'completed'
+    completedMissions: int = Field(default=0)
+
+    # Leaderboard: ORDER BY completedMissions DESC, userId
+    __table_args__ = (Index("ix_userstats_completed_user", "completedMissions", "userId"),)
+
+class UserBadge(SQLModel, table=True):
+    """
+    The date a volunteer first crossed a badge milestone.
+    """
+    userId: str = Field(primary_key=True)
+    badgeId: str = Field(primary_key=True)
+    earnedAt: date
 
 # ==========================================
 # Data Transfer Objects (DTOs)
@@ -110,6 +214,27 @@ class Bookmark(SQLModel, table=True):
 class BookmarkRequest(SQLModel):
     eventId: str
 
+class BookmarkSyncRequest(SQLModel):
+    """A batch of bookmark changes made offline, plus the last version the client has seen."""
+    add: List[str] = []
+    remove: List[str] = []
+    since: Optional[int] = None
+
+class EventImportRow(SQLModel):
+    """One row of a bulk import: the organizer-editable Event fields, validated like the Event body."""
+    title: str
+    date: date
+    location: str
+    locationCategory: str = Field(default=LocationCategory.OTHER)
+    category: str
+    maxVolunteers: int
+    description: str
+    organizerName: str
+    imageUrl: Optional[str] = None
+    tasks: str = ""
+    whatsappLink: Optional[str] = None
+    welcomeMessage: Optional[str] = None
+
 class JoinRequest(SQLModel):
     userId: str
     userName: Optional[str] = "Student"
@@ -121,6 +246,21 @@ class UpdateEventStatusRequest(SQLModel):
 class UpdateRegistrationStatusRequest(SQLModel):
     status: RegistrationStatus
 
+class RegistrationStatusUpdate(SQLModel):
+    """One item of a bulk approve/reject request."""
+    registrationId: str
+    status: RegistrationStatus
+
 class UpdateFeedbackRequest(SQLModel):
     rating: int = Field(ge=1, le=5)
-    comment: str
\ No newline at end of file
+    comment: str
+
+class EventPage(SQLModel):
+    """Cursor-paginated slice of the event feed. Pass nextCursor back as ?cursor= for the next page."""
+    items: List[Event]
+    nextCursor: Optional[str] = None
+
+class EventStatsPage(SQLModel):
+    """Cursor-paginated slice of the organizer dashboard."""
+    items: List[EventReadWithStats]
+    nextCursor: Optional[str] = None
\ No newline at end of file
@@ -0,0 +1,64 @@
+import base64
+import datetime
+import json
+from typing import List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+from api.models import Event
+
+# ==========================================
+# Keyset (Cursor) Pagination
+# ==========================================
+# Pages are ordered by the stable key (Event.date, Event.id). A cursor is the opaque,
+# base64-encoded key of the last row served; the next page starts strictly after it,
+# so deep pages cost the same as the first (index range scan, no OFFSET) and rows
+# can't repeat or shift when events are added between requests.
+
+EVENT_ORDER = (Event.date, Event.id)
+
+def encode_key(values: list) -> str:
+    """Opaque cursor from the sort-key values of the last row served (JSON-serializable)."""
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+def decode_key(cursor: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def encode_cursor(event_date: datetime.date, event_id: str) -> str:
+    return encode_key([event_date.isoformat(), event_id])
+
+def decode_cursor(cursor: str) -> Tuple[datetime.date, str]:
+    try:
+        event_date, event_id = decode_key(cursor)
+        return datetime.date.fromisoformat(event_date), str(event_id)
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def apply_keyset(query, cursor: Optional[str], limit: int):
+    """
+    Orders the query by (date, id), starts after the cursor (empty cursor = first page)
+    and fetches one extra row so the caller can tell whether a next page exists.
+    """
+    if cursor:
+        query = query.where(tuple_(*EVENT_ORDER) > tuple_(*decode_cursor(cursor)))
+    return query.order_by(*EVENT_ORDER).limit(limit + 1)
+
+def split_page(rows: Sequence, limit: int, key=lambda row: row) -> Tuple[List, Optional[str]]:
+    """Trims the look-ahead row and builds nextCursor from the last event on the page."""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = key(rows[-1])
+    return rows, encode_cursor(last.date, last.id)
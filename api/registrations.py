@@ -0,0 +1,216 @@
+import datetime
+from typing import Dict, List, Tuple
+
+from sqlalchemy import update
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api.config import settings
+from api.database import dialect_insert
+from api.models import (
+    Event,
+    EventStatus,
+    JoinRequest,
+    Registration,
+    RegistrationStatus,
+    RegistrationStatusUpdate,
+    WaitlistCounter,
+)
+from api.stats import StatsDeltas, apply_stats_deltas, new_deltas, registration_deltas
+
+# ==========================================
+# Lock-Free Joining
+# ==========================================
+# A join never takes the event row lock:
+#   - duplicates are rejected by the unique_registration constraint (INSERT ... ON CONFLICT DO NOTHING)
+#   - in instant mode a seat is reserved with one conditional UPDATE
+#     (currentVolunteers + 1 WHERE currentVolunteers < maxVolunteers), which can't overbook
+#   - waitlist tickets come from an atomic counter upsert on a separate row
+# If the insert then finds a duplicate, the transaction is rolled back, releasing the seat/ticket.
+
+def waitlist_active() -> bool:
+    """Waitlisted registrations only exist in instant signup mode."""
+    return settings.SIGNUP_MODE == "instant" and settings.WAITLIST_ENABLED
+
+def new_registration(event_id: str, payload: JoinRequest) -> Registration:
+    return Registration(
+        eventId=event_id,
+        userId=payload.userId,
+        joinedAt=datetime.date.today().isoformat(),
+        # Use provided name/avatar or fallback to a default if missing
+        userName=payload.userName or f"Student {payload.userId[-4:]}",
+        userAvatar=payload.userAvatar or "",
+        status=RegistrationStatus.PENDING
+    )
+
+async def reserve_seat(session: AsyncSession, event_id: str):
+    """
+    Takes one seat if any is left. Returns the event's (status, currentVolunteers,
+    maxVolunteers, version) after the update, or None if it is full or doesn't exist.
+    """
+    return (await session.exec(
+        update(Event)
+        .where(Event.id == event_id, Event.currentVolunteers < Event.maxVolunteers)
+        .values(currentVolunteers=Event.currentVolunteers + 1, **Event.version_bump())
+        .returning(Event.status, Event.currentVolunteers, Event.maxVolunteers, Event.version)
+    )).first()
+
+async def next_waitlist_position(session: AsyncSession, event_id: str) -> int:
+    stmt = dialect_insert(WaitlistCounter).values(eventId=event_id, lastPosition=1)
+    return (await session.exec(
+        stmt.on_conflict_do_update(
+            index_elements=[WaitlistCounter.eventId],
+            set_={"lastPosition": WaitlistCounter.lastPosition + 1}
+        ).returning(WaitlistCounter.lastPosition)
+    )).scalar()
+
+async def insert_registration(session: AsyncSession, reg: Registration) -> bool:
+    """INSERT ... ON CONFLICT DO NOTHING. False if the volunteer already joined this event."""
+    inserted = (await session.exec(
+        dialect_insert(Registration)
+        .values(**reg.model_dump())
+        .on_conflict_do_nothing(index_elements=[Registration.userId, Registration.eventId])
+        .returning(Registration.id)
+    )).first()
+    return inserted is not None
+
+async def promote_waitlist(session: AsyncSession, event: Event, seats: int, deltas: StatsDeltas) -> List[Tuple[str, str]]:
+    """
+    Confirms up to `seats` waitlisted volunteers in ticket order. The caller holds the event
+    lock and adds the promoted count to event.currentVolunteers.
+
+    Returns:
+        (registration id, user id) of every promoted registration.
+    """
+    if seats <= 0:
+        return []
+    promoted = (await session.exec(
+        select(Registration.id, Registration.userId)
+        .where(Registration.eventId == event.id, Registration.status == RegistrationStatus.WAITLISTED)
+        .order_by(Registration.waitlistPosition, Registration.id)
+        .limit(seats)
+    )).all()
+    if not promoted:
+        return []
+    completed = event.status == EventStatus.COMPLETED
+    for _, user_id in promoted:
+        registration_deltas(deltas, user_id, RegistrationStatus.WAITLISTED, RegistrationStatus.CONFIRMED, completed)
+    ids = [reg_id for reg_id, _ in promoted]
+    await session.exec(
+        update(Registration)
+        .where(col(Registration.id).in_(ids))
+        .values(status=RegistrationStatus.CONFIRMED, waitlistPosition=None)
+        .execution_options(synchronize_session="evaluate")
+    )
+    return [(reg_id, user_id) for reg_id, user_id in promoted]
+
+# ==========================================
+# Registration Status Transitions
+# ==========================================
+# Shared by the single PATCH /api/registrations/{id} and the bulk
+# PATCH /api/events/{event_id}/registrations endpoints. The caller holds the event row lock;
+# everything here runs inside its transaction.
+
+# Per-item outcomes
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+NOT_FOUND = "not_found"
+DUPLICATE = "duplicate"
+QUOTA_EXCEEDED = "quota_exceeded"
+# Waitlisting is done by joins, never by hand (it needs a ticket)
+INVALID_STATUS = "invalid_status"
+
+def plan_status_changes(
+    event: Event,
+    registrations: Dict[str, Registration],
+    updates: List[RegistrationStatusUpdate]
+) -> Tuple[List[dict], List[Tuple[Registration, str]]]:
+    """
+    Decides every update against one quota computation.
+    Seats released by the batch (confirmed -> pending/rejected) are counted first, so swapping
+    volunteers in one request works; confirmations then take the free seats in request order
+    and the rest are rejected with 'quota_exceeded'.
+
+    Returns:
+        (results, changes): one result per update (request order) and the (registration, new status)
+        pairs to apply.
+    """
+    results: List[dict] = [{} for _ in updates]
+    seen = set()
+    candidates = []
+    for index, item in enumerate(updates):
+        reg = registrations.get(item.registrationId)
+        if reg is None:
+            results[index] = {"registrationId": item.registrationId, "result": NOT_FOUND}
+        elif item.status == RegistrationStatus.WAITLISTED:
+            results[index] = {"registrationId": item.registrationId, "status": reg.status, "result": INVALID_STATUS}
+        elif item.registrationId in seen:
+            results[index] = {"registrationId": item.registrationId, "status": reg.status, "result": DUPLICATE}
+        elif reg.status == item.status:
+            seen.add(item.registrationId)
+            results[index] = {"registrationId": item.registrationId, "status": reg.status, "result": UNCHANGED}
+        else:
+            seen.add(item.registrationId)
+            candidates.append((index, reg, item.status))
+
+    released = sum(1 for _, reg, status in candidates if reg.status == RegistrationStatus.CONFIRMED)
+    free = event.maxVolunteers - event.currentVolunteers + released
+
+    changes = []
+    for index, reg, status in candidates:
+        if status == RegistrationStatus.CONFIRMED:
+            if free <= 0:
+                results[index] = {"registrationId": reg.id, "status": reg.status, "result": QUOTA_EXCEEDED}
+                continue
+            free -= 1
+        results[index] = {"registrationId": reg.id, "status": status, "result": UPDATED}
+        changes.append((reg, status))
+    return results, changes
+
+async def apply_status_changes(
+    session: AsyncSession,
+    event: Event,
+    changes: List[Tuple[Registration, str]]
+) -> Tuple[int, List[Tuple[str, str]]]:
+    """
+    Writes planned changes: one UPDATE per target status, one counter update on the (locked)
+    event and one batched UserStats upsert. Seats freed by the batch go to the waitlist first.
+
+    Returns:
+        (delta, promoted): change in the event's confirmed volunteer count and the
+        (registration id, user id) of waitlisted registrations promoted into freed seats.
+    """
+    if not changes:
+        return 0, []
+
+    by_status: Dict[str, List[str]] = {}
+    deltas = new_deltas()
+    delta = 0
+    completed = event.status == EventStatus.COMPLETED
+    for reg, status in changes:
+        by_status.setdefault(status, []).append(reg.id)
+        registration_deltas(deltas, reg.userId, reg.status, status, completed)
+        delta += (status == RegistrationStatus.CONFIRMED) - (reg.status == RegistrationStatus.CONFIRMED)
+
+    # synchronize_session also moves the loaded Registration objects to their new status
+    for status, ids in by_status.items():
+        await session.exec(
+            update(Registration)
+            .where(col(Registration.id).in_(ids))
+            .values(status=status, waitlistPosition=None)
+            .execution_options(synchronize_session="evaluate")
+        )
+
+    promoted = []
+    if delta < 0 and waitlist_active():
+        free = event.maxVolunteers - (event.currentVolunteers + delta)
+        promoted = await promote_waitlist(session, event, free, deltas)
+        delta += len(promoted)
+
+    if delta or promoted:
+        # A promotion changes who may see the private fields even when the count nets out
+        event.currentVolunteers = max(0, event.currentVolunteers + delta)
+        event.touch()
+        session.add(event)
+    await apply_stats_deltas(session, deltas)
+    return delta, promoted
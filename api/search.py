@@ -0,0 +1,110 @@
+import re
+from typing import List
+
+from sqlalchemy import column, func, literal_column, or_, table
+from sqlmodel import col
+
+from api.config import settings
+from api.database import is_sqlite
+from api.models import Event
+
+# ==========================================
+# Event Full-Text Search
+# ==========================================
+# Postgres: a weighted tsvector column over title/category/location/description with a GIN
+#           index, plus a pg_trgm index on title for typo tolerance. The column is filled by a
+#           BEFORE INSERT/UPDATE trigger rather than GENERATED ... STORED, so adding it doesn't
+#           rewrite the event table under an exclusive lock (see the search migration).
+# SQLite:   an FTS5 external-content table kept in sync by triggers (local dev & tests).
+# Both indexes are maintained by the database itself, so every write path (create_event,
+# update_event_details, bulk imports, manual SQL) stays in sync without application code.
+
+SEARCH_VECTOR = literal_column("event.search_vector")
+EVENT_FTS = table("event_fts", column("rowid"))
+
+POSTGRES_FUNCTIONS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm;",
+    """CREATE OR REPLACE FUNCTION event_search_vector(title text, category text, location text, description text)
+    RETURNS tsvector LANGUAGE sql IMMUTABLE AS $$
+        SELECT setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+               setweight(to_tsvector('simple', coalesce(category, '')), 'B') ||
+               setweight(to_tsvector('simple', coalesce(location, '')), 'B') ||
+               setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    $$;""",
+    """CREATE OR REPLACE FUNCTION event_search_vector_update() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.search_vector := event_search_vector(NEW.title, NEW.category, NEW.location, NEW.description);
+        RETURN NEW;
+    END $$;""",
+]
+
+POSTGRES_TRIGGER = """CREATE TRIGGER event_search_vector_update
+    BEFORE INSERT OR UPDATE OF title, category, location, description ON event
+    FOR EACH ROW EXECUTE FUNCTION event_search_vector_update();"""
+
+# Rows that existed before the trigger, a batch per statement (each commits on its own)
+POSTGRES_BACKFILL = """UPDATE event SET search_vector = event_search_vector(title, category, location, description)
+    WHERE id IN (SELECT id FROM event WHERE search_vector IS NULL LIMIT :batch);"""
+
+SQLITE_SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS event_fts USING fts5(
+        title, description, location, category,
+        content='event', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+    );""",
+    """CREATE TRIGGER IF NOT EXISTS event_fts_ai AFTER INSERT ON event BEGIN
+        INSERT INTO event_fts(rowid, title, description, location, category)
+        VALUES (new.rowid, new.title, new.description, new.location, new.category);
+    END;""",
+    """CREATE TRIGGER IF NOT EXISTS event_fts_ad AFTER DELETE ON event BEGIN
+        INSERT INTO event_fts(event_fts, rowid, title, description, location, category)
+        VALUES ('delete', old.rowid, old.title, old.description, old.location, old.category);
+    END;""",
+    """CREATE TRIGGER IF NOT EXISTS event_fts_au AFTER UPDATE ON event BEGIN
+        INSERT INTO event_fts(event_fts, rowid, title, description, location, category)
+        VALUES ('delete', old.rowid, old.title, old.description, old.location, old.category);
+        INSERT INTO event_fts(rowid, title, description, location, category)
+        VALUES (new.rowid, new.title, new.description, new.location, new.category);
+    END;""",
+    # Index rows that existed before the triggers were installed
+    "INSERT INTO event_fts(event_fts) VALUES ('rebuild');",
+]
+
+def _terms(search: str) -> List[str]:
+    # Word characters only: keeps user input out of the tsquery / FTS5 query syntax
+    return re.findall(r"\w+", search.lower())[:8]
+
+def apply_search(query, search: str, ranked: bool = True):
+    """
+    Filters an Event query by a free-text search over title/description/location/category.
+    Every term is prefix-matched (search-as-you-type). With `ranked`, results are ordered
+    by relevance first; callers append their own ORDER BY as the tie-breaker.
+    """
+    terms = _terms(search)
+    if not terms:
+        return query
+
+    if settings.SEARCH_MODE == "ilike":
+        # Legacy behaviour (no search schema installed)
+        return query.where(col(Event.title).ilike(f"%{search}%"))
+
+    if is_sqlite():
+        fts_query = " ".join(f'"{term}"*' for term in terms)
+        query = (
+            query.join(EVENT_FTS, EVENT_FTS.c.rowid == literal_column("event.rowid"))
+            .where(literal_column("event_fts").op("MATCH")(fts_query))
+        )
+        if ranked:
+            # bm25: lower is better. Column weights follow the FTS5 column order.
+            query = query.order_by(func.bm25(literal_column("event_fts"), 10.0, 2.0, 5.0, 5.0))
+        return query
+
+    ts_query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+    phrase = " ".join(terms)
+    query = query.where(or_(
+        SEARCH_VECTOR.op("@@")(ts_query),
+        # pg_trgm similarity operator (default threshold 0.3): "clenup" still finds "Cleanup"
+        col(Event.title).op("%")(phrase)
+    ))
+    if ranked:
+        query = query.order_by((func.ts_rank(SEARCH_VECTOR, ts_query) + func.similarity(Event.title, phrase)).desc())
+    return query
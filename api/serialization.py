@@ -0,0 +1,59 @@
+import datetime
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import Response
+from sqlalchemy import null
+from sqlmodel import select
+
+from api.config import settings
+from api.instrumentation import span
+from api.models import Event
+
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the stdlib encoder
+    orjson = None
+
+# ==========================================
+# Fast Serialization (list endpoints)
+# ==========================================
+# `response_model=List[Event]` re-validates every ORM row through Pydantic and then serializes
+# it again. For list endpoints we instead select plain columns, turn each row into a dict and
+# encode the list with orjson in one call. Private fields are masked in the SELECT itself
+# (NULL AS "whatsappLink"), so they never leave the database and no ORM object is mutated.
+# The JSON shape is identical to the Pydantic path (same keys, same order, same formats).
+
+PRIVATE_EVENT_FIELDS = ("whatsappLink", "welcomeMessage")
+
+def fast_mode() -> bool:
+    return settings.SERIALIZATION_MODE == "fast"
+
+def _default(value: Any):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    with span("serialize"):
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(content, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def json_response(body: bytes, headers: Optional[dict] = None, status_code: int = 200) -> Response:
+    """Already-encoded JSON body (skips FastAPI's response_model validation)."""
+    return Response(body, status_code=status_code, media_type="application/json", headers=headers)
+
+def event_columns(mask_private: bool = True) -> list:
+    """Every Event column in model field order; private ones become NULL when masked."""
+    return [
+        null().label(column.name) if mask_private and column.name in PRIVATE_EVENT_FIELDS else column
+        for column in Event.__table__.columns
+    ]
+
+def select_event_rows(mask_private: bool = True):
+    """Column-level SELECT of events: rows come back as tuples, never as ORM objects."""
+    return select(*event_columns(mask_private))
+
+def rows_to_dicts(rows: Sequence) -> List[Dict[str, Any]]:
+    return [dict(row._mapping) for row in rows]
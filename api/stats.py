@@ -0,0 +1,123 @@
+import datetime
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlmodel import Session, col, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api.database import dialect_insert
+from api.models import Registration, RegistrationStatus, UserBadge, UserStats
+
+# ==========================================
+# Incremental Volunteer Stats
+# ==========================================
+# Counters in UserStats are changed with relative deltas ("+1 pending", "-1 confirmed") through
+# one INSERT ... ON CONFLICT DO UPDATE per batch, so concurrent writers never overwrite each
+# other and users without a stats row yet are created on the fly.
+
+# Completed missions needed for each badge
+BADGE_THRESHOLDS = {"badge_1": 1, "badge_3": 3, "badge_5": 5}
+
+COUNTERS = ("pendingCount", "confirmedCount", "completedMissions")
+
+StatsDeltas = Dict[str, Dict[str, int]]  # userId -> {counter: increment}
+Profiles = Dict[str, Tuple[Optional[str], Optional[str]]]  # userId -> (userName, userAvatar)
+
+_CHUNK = 500
+
+def new_deltas() -> StatsDeltas:
+    return defaultdict(lambda: defaultdict(int))
+
+def registration_deltas(
+    deltas: StatsDeltas,
+    user_id: str,
+    old_status: Optional[str],
+    new_status: Optional[str],
+    event_completed: bool
+) -> StatsDeltas:
+    """
+    Records the counter changes for one registration moving old_status -> new_status
+    (None = the registration didn't exist / was removed).
+    """
+    for status, sign in ((old_status, -1), (new_status, 1)):
+        if status == RegistrationStatus.PENDING:
+            deltas[user_id]["pendingCount"] += sign
+        elif status == RegistrationStatus.CONFIRMED:
+            deltas[user_id]["confirmedCount"] += sign
+            if event_completed:
+                deltas[user_id]["completedMissions"] += sign
+    return deltas
+
+def confirmed_per_user(event_ids: List[str]):
+    """Confirmed registrations per volunteer across the given events (for completion transitions)."""
+    return (
+        select(Registration.userId, func.count(Registration.id))
+        .where(col(Registration.eventId).in_(event_ids))
+        .where(Registration.status == RegistrationStatus.CONFIRMED)
+        .group_by(Registration.userId)
+    )
+
+def completion_deltas(deltas: StatsDeltas, rows: Iterable[Tuple[str, int]], sign: int) -> StatsDeltas:
+    """+/- completed missions for each (userId, confirmedCount) row of confirmed_per_user()."""
+    for user_id, count in rows:
+        deltas[user_id]["completedMissions"] += sign * count
+    return deltas
+
+def _upsert_statements(deltas: StatsDeltas, profiles: Profiles):
+    rows = []
+    for user_id, changes in deltas.items():
+        profile = profiles.get(user_id, (None, None))
+        if not any(changes.values()) and profile == (None, None):
+            continue
+        rows.append({
+            "userId": user_id,
+            "userName": profile[0],
+            "userAvatar": profile[1],
+            **{counter: changes.get(counter, 0) for counter in COUNTERS},
+        })
+
+    for start in range(0, len(rows), _CHUNK):
+        stmt = dialect_insert(UserStats).values(rows[start:start + _CHUNK])
+        yield stmt.on_conflict_do_update(
+            index_elements=[UserStats.userId],
+            set_={
+                **{counter: getattr(UserStats, counter) + getattr(stmt.excluded, counter) for counter in COUNTERS},
+                "userName": func.coalesce(stmt.excluded.userName, UserStats.userName),
+                "userAvatar": func.coalesce(stmt.excluded.userAvatar, UserStats.userAvatar),
+            }
+        ).returning(UserStats.userId, UserStats.completedMissions)
+
+def _crossed_badges(returned, deltas: StatsDeltas, today: datetime.date) -> List[dict]:
+    """Badge rows for every milestone a volunteer just crossed (old < threshold <= new)."""
+    awarded = []
+    for user_id, completed in returned:
+        gained = deltas[user_id].get("completedMissions", 0)
+        if gained <= 0:
+            continue
+        previous = completed - gained
+        for badge_id, threshold in BADGE_THRESHOLDS.items():
+            if previous < threshold <= completed:
+                awarded.append({"userId": user_id, "badgeId": badge_id, "earnedAt": today})
+    return awarded
+
+def _badge_statement(rows: List[dict]):
+    # Keep the first earnedAt if a badge is lost (event reverted) and earned again
+    return dialect_insert(UserBadge).values(rows).on_conflict_do_nothing(index_elements=[UserBadge.userId, UserBadge.badgeId])
+
+async def apply_stats_deltas(session: AsyncSession, deltas: StatsDeltas, profiles: Optional[Profiles] = None):
+    """Applies counter deltas (and awards crossed badges) inside the caller's transaction."""
+    awarded = []
+    today = datetime.date.today()
+    for stmt in _upsert_statements(deltas, profiles or {}):
+        awarded += _crossed_badges((await session.exec(stmt)).all(), deltas, today)
+    if awarded:
+        await session.exec(_badge_statement(awarded))
+
+def apply_stats_deltas_sync(session: Session, deltas: StatsDeltas, profiles: Optional[Profiles] = None):
+    """Sync twin of apply_stats_deltas for background jobs."""
+    awarded = []
+    today = datetime.date.today()
+    for stmt in _upsert_statements(deltas, profiles or {}):
+        awarded += _crossed_badges(session.exec(stmt).all(), deltas, today)
+    if awarded:
+        session.exec(_badge_statement(awarded))
@@ -0,0 +1,103 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Add parent directory to path to allow importing api modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Default to a throwaway SQLite file so the benchmark runs offline
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'umission_bench.db')}")
+os.environ.setdefault("DEBUG", "false")
+
+from sqlalchemy import event, text
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api import database
+from api.database import ThreadpoolSession, get_pool_stats, is_sqlite
+
+
+def _install_sqlite_sleep(sync_engine):
+    """SQLite has no pg_sleep(); register one so 'slow queries' behave the same on both backends."""
+    @event.listens_for(sync_engine, "connect")
+    def _register(dbapi_connection, _):
+        dbapi_connection.create_function("pg_sleep", 1, lambda seconds: time.sleep(seconds) or 0)
+
+
+SLOW_QUERY = text("SELECT pg_sleep(:seconds)")
+
+
+async def _blocking(delay: float):
+    # The pre-port behaviour: sync Session called straight from an async handler
+    with Session(database.get_engine()) as session:
+        session.exec(SLOW_QUERY, params={"seconds": delay}).all()
+
+
+async def _threadpool(delay: float):
+    session = ThreadpoolSession(Session(database.get_engine()))
+    try:
+        (await session.exec(SLOW_QUERY, params={"seconds": delay})).all()
+    finally:
+        await session.close()
+
+
+async def _native(delay: float):
+    async with AsyncSession(database.get_async_engine()) as session:
+        (await session.exec(SLOW_QUERY, params={"seconds": delay})).all()
+
+
+async def _loop_lag_probe(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """Measures the worst event-loop stall while the queries run (what every other request would feel)."""
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def run_mode(name: str, runner, concurrency: int, delay: float) -> dict:
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_loop_lag_probe(stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(runner(delay) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    lag = await probe
+    return {
+        "mode": name,
+        "inFlight": concurrency,
+        "queryDelayMs": round(delay * 1000, 1),
+        "wallSeconds": round(elapsed, 3),
+        "throughputPerSec": round(concurrency / elapsed, 1),
+        "maxLoopLagMs": round(lag * 1000, 1),
+    }
+
+
+async def main(concurrency: int, delay: float):
+    async_engine = database.get_async_engine()
+    if is_sqlite():
+        _install_sqlite_sleep(database.get_engine())
+        if async_engine is not None:
+            _install_sqlite_sleep(async_engine.sync_engine)
+
+    modes = [("blocking-sync", _blocking), ("threadpool", _threadpool)]
+    if async_engine is not None:
+        modes.append(("async-driver", _native))
+
+    results = [await run_mode(name, runner, concurrency, delay) for name, runner in modes]
+    print(json.dumps({"results": results, "pool": get_pool_stats()}, indent=2))
+
+    await database.dispose_engines()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput with N slow queries in flight, per session mode.")
+    parser.add_argument("-n", "--concurrency", type=int, default=50)
+    parser.add_argument("-d", "--delay", type=float, default=0.1, help="Seconds each query sleeps")
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.delay))
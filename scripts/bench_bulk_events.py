@@ -0,0 +1,160 @@
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Add parent directory to path to allow importing api modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'umission_bulk.db')}")
+os.environ.setdefault("DEBUG", "false")
+os.environ["AUTO_CONCLUDE_BACKGROUND"] = "false"
+
+import httpx
+from sqlalchemy import delete, event, func
+from sqlmodel import Session, select
+
+from api.config import settings
+from api.database import get_async_engine, get_engine
+from api.exports import encode_csv
+from api.migrations import upgrade
+from api.models import Event
+from fake_issuer import FakeIssuer
+
+# ==========================================
+# Bulk Event Import Benchmark
+# ==========================================
+# Creates --events events for one organizer three ways through the ASGI app in-process:
+#   - per-event: one POST /api/events each, one after the other (what organizers script today)
+#   - bulk-json: one POST /api/events:bulk with a JSON array
+#   - bulk-csv:  the same rows as one CSV upload
+# and reports the wall time, events/s and SQL statements of each. Every run starts from an
+# empty set of the organizer's events and checks they were all created. Exit 1 when bulk
+# JSON is not at least --min-speedup times faster than per-event.
+
+ORGANIZER = "org-bulk"
+FIELDS = ["title", "date", "location", "locationCategory", "category", "maxVolunteers", "description", "organizerName", "tasks"]
+
+
+def event_rows(count: int) -> list:
+    start = datetime.date.today() + datetime.timedelta(days=1)
+    categories = ["Residential College", "Faculty", "Outdoor", "Other"]
+    return [{
+        "title": f"Tutoring session {i + 1}",
+        "date": (start + datetime.timedelta(days=i % 120)).isoformat(),
+        "location": f"Faculty of Computing, room {i % 12 + 1}",
+        "locationCategory": categories[i % len(categories)],
+        "category": "Education",
+        "maxVolunteers": 5 + i % 20,
+        "description": f"Weekly peer tutoring, session {i + 1} of the semester",
+        "organizerName": "Computing Club",
+        "organizerId": ORGANIZER,  # Required by POST /api/events (then taken from the token); bulk ignores it
+        "tasks": "Prepare exercises\nMark attendance",
+    } for i in range(count)]
+
+
+def clear():
+    with Session(get_engine()) as session:
+        session.exec(delete(Event).where(Event.organizerId == ORGANIZER))
+        session.commit()
+
+
+def created() -> int:
+    with Session(get_engine()) as session:
+        return session.exec(select(func.count()).select_from(Event).where(Event.organizerId == ORGANIZER)).one()
+
+
+class StatementCounter:
+    """Counts the statements the app sends to the database (async or threadpool engine)."""
+
+    def __init__(self):
+        self.count = 0
+        engine = get_async_engine()
+        self.engine = engine.sync_engine if engine is not None else get_engine()
+        event.listen(self.engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+    def close(self):
+        event.remove(self.engine, "before_cursor_execute", self._count)
+
+
+async def per_event(client: httpx.AsyncClient, rows: list, headers: dict) -> int:
+    for row in rows:
+        response = await client.post("/api/events", json=row, headers=headers)
+        response.raise_for_status()
+    return len(rows)
+
+
+async def bulk_json(client: httpx.AsyncClient, rows: list, headers: dict) -> int:
+    response = await client.post("/api/events:bulk", json=rows, headers=headers)
+    response.raise_for_status()
+    return len(response.json()["created"])
+
+
+async def bulk_csv(client: httpx.AsyncClient, rows: list, headers: dict) -> int:
+    body = encode_csv([[row[field] for field in FIELDS] for row in rows], header=FIELDS)
+    response = await client.post("/api/events:bulk", content=body, headers={**headers, "Content-Type": "text/csv"})
+    response.raise_for_status()
+    return len(response.json()["created"])
+
+
+async def run(count: int, repeat: int, issuer: FakeIssuer) -> dict:
+    from api.index import app
+
+    headers = {"Authorization": f"Bearer {issuer.mint(ORGANIZER, role='organizer')}"}
+    rows = event_rows(count)
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=300) as client:
+        # Warm-up: imports, JWKS cache, first connection
+        await bulk_json(client, rows[:2], headers)
+        for name, method in (("per-event", per_event), ("bulk-json", bulk_json), ("bulk-csv", bulk_csv)):
+            timings, statements = [], 0
+            for _ in range(repeat):
+                clear()
+                counter = StatementCounter()
+                started = time.perf_counter()
+                done = await method(client, rows, headers)
+                timings.append(time.perf_counter() - started)
+                counter.close()
+                statements = counter.count
+                if done != count or created() != count:
+                    raise SystemExit(f"❌ {name}: {created()} of {count} events created")
+            best = min(timings)
+            results[name] = {
+                "seconds": round(best, 3),
+                "eventsPerSecond": round(count / best),
+                "statements": statements,
+            }
+    clear()
+    return results
+
+
+def main(count: int, repeat: int, min_speedup: float):
+    upgrade(get_engine())
+    with FakeIssuer() as issuer:
+        settings.CLERK_ISSUER = issuer.url
+        results = asyncio.run(run(count, repeat, issuer))
+
+    speedup = results["per-event"]["seconds"] / results["bulk-json"]["seconds"]
+    print(json.dumps({"database": settings.DATABASE_URL.split("://")[0], "asyncDriver": settings.DB_ASYNC,
+                      "events": count, "runs": results, "speedup": round(speedup, 1)}, indent=2))
+    if speedup < min_speedup:
+        print(f"❌ Bulk import of {count} events is only {speedup:.1f}x faster than per-event POSTs (want {min_speedup:g}x)")
+        sys.exit(1)
+    print(f"✅ {count} events: {results['per-event']['seconds']}s one by one, "
+          f"{results['bulk-json']['seconds']}s in one bulk import ({speedup:.0f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare POST /api/events:bulk with one POST /api/events per event.")
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per method; the fastest counts")
+    parser.add_argument("--min-speedup", type=float, default=5, help="fail below this bulk vs per-event ratio; 0 = report only")
+    args = parser.parse_args()
+    main(args.events, args.repeat, args.min_speedup)
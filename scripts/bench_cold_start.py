@@ -0,0 +1,125 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from profile_imports import child_env
+
+# ==========================================
+# Cold-Start Benchmark
+# ==========================================
+# Starts fresh interpreters that import the Vercel entry point (api/index.py) and answer their
+# first GET /api/health, through the ASGI interface directly, as the serverless runtime does.
+# Reports import, first-request and whole-process times. Exits 1 when the median of
+# import + first request exceeds --budget-ms, or when a cold start loads a module that is
+# meant to be deferred to first use (DEFERRED_MODULES).
+#
+# --cold-bytecode also compiles every module from source (empty PYTHONPYCACHEPREFIX), the
+# worst case for deployments that don't ship __pycache__.
+
+# Heavy dependencies that the app only imports on first use (see api/auth.py, api/database.py)
+DEFERRED_MODULES = ("httpx", "jose", "asyncpg", "aiosqlite", "sqlalchemy.dialects.postgresql", "redis")
+
+def child():
+    """Runs inside the fresh interpreter; prints one JSON line."""
+    started = time.perf_counter()
+    from api.index import app
+    imported = time.perf_counter()
+
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "https",
+        "path": "/api/health", "raw_path": b"/api/health", "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"localhost")], "client": ("127.0.0.1", 50000), "server": ("localhost", 443),
+    }
+    asyncio.run(app(scope, receive, send))
+    answered = time.perf_counter()
+
+    print(json.dumps({
+        "importMs": (imported - started) * 1000,
+        "firstRequestMs": (answered - imported) * 1000,
+        "status": messages[0]["status"],
+        "deferredLoaded": [name for name in DEFERRED_MODULES if name in sys.modules],
+    }))
+
+def run_once(cold_bytecode: bool) -> dict:
+    env = child_env()
+    with tempfile.TemporaryDirectory() as pycache:
+        if cold_bytecode:
+            env["PYTHONPYCACHEPREFIX"] = pycache
+        started = time.perf_counter()
+        completed = subprocess.run([sys.executable, os.path.abspath(__file__), "--child"],
+                                   cwd=ROOT, env=env, capture_output=True, text=True)
+        process_ms = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        raise SystemExit(f"❌ Cold start failed:\n{completed.stderr[-2000:]}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["processMs"] = process_ms
+    result["totalMs"] = result["importMs"] + result["firstRequestMs"]
+    return result
+
+def summarize(runs: list) -> dict:
+    return {
+        key: {"median": round(statistics.median(r[key] for r in runs), 1), "max": round(max(r[key] for r in runs), 1)}
+        for key in ("importMs", "firstRequestMs", "totalMs", "processMs")
+    }
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        child()
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description="Measure cold import + first /api/health call in fresh interpreters.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=float(os.environ.get("COLD_START_BUDGET_MS", 1500)),
+                        help="max median import + first request time (default: $COLD_START_BUDGET_MS or 1500)")
+    parser.add_argument("--cold-bytecode", action="store_true", help="compile every module from source in each run")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    run_once(args.cold_bytecode)  # Warm-up: writes __pycache__ and the OS page cache
+    runs = [run_once(args.cold_bytecode) for _ in range(args.runs)]
+    summary = summarize(runs)
+    deferred = sorted({name for r in runs for name in r["deferredLoaded"]})
+    report = {
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "coldBytecode": args.cold_bytecode,
+        "budgetMs": args.budget_ms,
+        "summary": summary,
+        "statuses": sorted({r["status"] for r in runs}),
+        "deferredLoaded": deferred,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    problems = []
+    if summary["totalMs"]["median"] > args.budget_ms:
+        problems.append(f"median cold start {summary['totalMs']['median']}ms exceeds the {args.budget_ms:g}ms budget")
+    if deferred:
+        problems.append(f"deferred modules imported at startup: {', '.join(deferred)}")
+    if report["statuses"] != [200]:
+        problems.append(f"/api/health answered {report['statuses']}")
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        sys.exit(1)
+    print(f"✅ Cold start within budget ({summary['totalMs']['median']}ms median, budget {args.budget_ms:g}ms).")
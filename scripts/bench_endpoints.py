@@ -0,0 +1,405 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter
+from typing import Callable, Dict, List
+
+# Add parent directory to path to allow importing api modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'umission_seed.db')}")
+os.environ.setdefault("DEBUG", "false")
+os.environ["AUTO_CONCLUDE_BACKGROUND"] = "false"
+os.environ.setdefault("CRON_SECRET", "bench-cron-secret")
+# Measure the handlers, not the admission limits (scripts/load_admission.py covers those)
+os.environ.setdefault("ADMISSION_MAX_CONCURRENT", "0")
+os.environ.setdefault("RATE_LIMIT_BACKEND", "off")
+
+import httpx
+from fastapi.routing import APIRoute
+from sqlalchemy import event as sa_event
+from sqlmodel import Session, col, func, select
+
+from api.config import settings
+from api.database import get_async_engine, get_engine
+from api.models import Event, Feedback, Registration
+from fake_issuer import FakeIssuer
+from seed_data import CATEGORIES, TITLE_ACTIONS, TITLE_WORDS, add_seed_arguments, event_id, seed_from_args, user_id
+
+# ==========================================
+# Endpoint Benchmark
+# ==========================================
+# Seeds (or reuses) a deterministic dataset, mints Clerk-style RS256 tokens from a local
+# signing key (FakeIssuer), then drives every /api route in-process at a fixed concurrency.
+# Reports per-route p50/p95/p99, throughput and SQL statements per request as JSON; with
+# --baseline it compares against a previous report and exits 1 on regressions.
+#
+# Write routes really write: run against a freshly seeded database when comparing reports.
+
+
+class Fixtures:
+    """Sampled ids from the seeded database, so requests hit real rows."""
+
+    def __init__(self, rng: random.Random, sample: int = 200):
+        with Session(get_engine()) as session:
+            total = session.exec(select(func.count()).select_from(Event)).one()
+            wanted = [event_id(i) for i in rng.sample(range(total), min(sample, total))]
+            self.events: List[Event] = session.exec(select(Event).where(col(Event.id).in_(wanted)).order_by(Event.id)).all()
+            ids = [e.id for e in self.events]
+            self.registrations = session.exec(
+                select(Registration.id, Registration.eventId, Registration.userId, Registration.status)
+                .where(col(Registration.eventId).in_(ids)).order_by(Registration.id)
+            ).all()
+            self.feedbacks = session.exec(
+                select(Feedback.id, Feedback.userId).where(col(Feedback.eventId).in_(ids)).order_by(Feedback.id)
+            ).all()
+        self.organizer_of = {e.id: e.organizerId for e in self.events}
+        self.regs_by_event: Dict[str, list] = {}
+        for reg in self.registrations:
+            self.regs_by_event.setdefault(reg.eventId, []).append(reg)
+        self.event_ids = ids
+        self.users = sorted({reg.userId for reg in self.registrations}) or [user_id(0)]
+        self.organizers = sorted(set(self.organizer_of.values()))
+
+
+class Scenario:
+    """
+    One benchmarked request shape. `build(rng, i)` returns the request as
+    (path, identity, httpx kwargs); identity is a user id (or (user id, 'organizer')) to sign a token for.
+    """
+
+    def __init__(self, method: str, route: str, build: Callable, variant: str = "", weight: float = 1.0):
+        self.method = method
+        self.route = route
+        self.build = build
+        self.variant = variant
+        self.weight = weight
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.route}" + (f" [{self.variant}]" if self.variant else "")
+
+
+def scenarios(fx: Fixtures, nonce: str) -> List[Scenario]:
+    cron = {"headers": {"Authorization": f"Bearer {settings.CRON_SECRET}"}}
+    pick_event = lambda rng: rng.choice(fx.events)
+    pick_user = lambda rng: rng.choice(fx.users)
+    owned = lambda e: (fx.organizer_of[e.id], "organizer")
+    # Write routes get identities that have never acted before, so every request does the full write
+    joiner = lambda i: f"bench_{nonce}_{i:06d}"
+
+    def event_body(e: Event, rng: random.Random) -> dict:
+        body = e.model_dump(mode="json", exclude={"id", "version", "updatedAt", "ratingSum", "ratingCount"})
+        body["description"] = f"{e.description} (edited {rng.randrange(10_000)})"
+        return body
+
+    def bulk_registrations(rng, i):
+        e = rng.choice([e for e in fx.events if fx.regs_by_event.get(e.id)] or fx.events)
+        regs = fx.regs_by_event.get(e.id, [])[:10]
+        items = [{"registrationId": r.id, "status": rng.choice(["confirmed", "pending", "rejected"])} for r in regs]
+        return f"/api/events/{e.id}/registrations", owned(e), {"json": items}
+
+    def single_registration(rng, i):
+        reg = rng.choice(fx.registrations)
+        return f"/api/registrations/{reg.id}", (fx.organizer_of[reg.eventId], "organizer"), {
+            "json": {"status": rng.choice(["confirmed", "pending", "rejected"])}
+        }
+
+    def update_feedback(rng, i):
+        fb = rng.choice(fx.feedbacks)
+        return f"/api/feedbacks/{fb.id}", fb.userId, {"json": {"rating": rng.randint(1, 5), "comment": "Edited by bench"}}
+
+    def sync_bookmarks(rng, i):
+        events = [e.id for e in rng.sample(fx.events, min(6, len(fx.events)))]
+        return "/api/users/me/bookmarks:sync", pick_user(rng), {
+            "json": {"add": events[:-1], "remove": events[-1:], "since": rng.randrange(0, 4)}
+        }
+
+    def new_event(rng, i):
+        e = pick_event(rng)
+        return "/api/events", (rng.choice(fx.organizers), "organizer"), {"json": event_body(e, rng)}
+
+    def bulk_events(rng, i):
+        # A small import per request: the route is measured, not the size of the batch
+        return "/api/events:bulk", (rng.choice(fx.organizers), "organizer"), {
+            "json": [event_body(pick_event(rng), rng) for _ in range(20)]
+        }
+
+    return [
+        Scenario("GET", "/api/", lambda rng, i: ("/api/", None, {})),
+        Scenario("GET", "/api/health", lambda rng, i: ("/api/health", None, {})),
+        Scenario("GET", "/api/health/auth", lambda rng, i: ("/api/health/auth", None, {})),
+        Scenario("GET", "/api/health/db", lambda rng, i: ("/api/health/db", None, {})),
+        Scenario("GET", "/api/health/cache", lambda rng, i: ("/api/health/cache", None, {})),
+        Scenario("GET", "/api/health/sql", lambda rng, i: ("/api/health/sql", None, {})),
+        Scenario("GET", "/api/health/live", lambda rng, i: ("/api/health/live", None, {})),
+        Scenario("GET", "/api/health/admission", lambda rng, i: ("/api/health/admission", None, {})),
+        Scenario("GET", "/api/metrics", lambda rng, i: ("/api/metrics", None, {})),
+        Scenario("GET", "/api/jobs/auto-conclude", lambda rng, i: ("/api/jobs/auto-conclude", None, {**cron, "params": {"force": "true"}}), weight=0.05),
+        Scenario("GET", "/api/jobs/reconcile-ratings", lambda rng, i: ("/api/jobs/reconcile-ratings", None, cron), weight=0.05),
+        Scenario("GET", "/api/jobs/rebuild-user-stats", lambda rng, i: ("/api/jobs/rebuild-user-stats", None, cron), weight=0.05),
+
+        Scenario("GET", "/api/events", lambda rng, i: ("/api/events", None, {"params": {"cursor": "", "limit": 20}}), "feed"),
+        Scenario("GET", "/api/events", lambda rng, i: ("/api/events", None, {"params": {
+            "cursor": "", "limit": 20, "status": "upcoming", "category": rng.choice(CATEGORIES)}}), "filtered"),
+        Scenario("GET", "/api/events", lambda rng, i: ("/api/events", None, {"params": {
+            "cursor": "", "limit": 20, "search": f"{rng.choice(TITLE_WORDS)} {rng.choice(TITLE_ACTIONS)}"}}), "search"),
+        Scenario("GET", "/api/events", lambda rng, i: ("/api/events", None, {"params": {"skip": rng.randrange(0, 1000), "limit": 100}}), "legacy"),
+        Scenario("GET", "/api/events/ratings", lambda rng, i: ("/api/events/ratings", None, {"params": {
+            "ids": ",".join(rng.sample(fx.event_ids, min(10, len(fx.event_ids))))}})),
+        Scenario("GET", "/api/events/{event_id}", lambda rng, i: (f"/api/events/{pick_event(rng).id}", None, {}), "anonymous"),
+        Scenario("GET", "/api/events/{event_id}", lambda rng, i: (f"/api/events/{pick_event(rng).id}", pick_user(rng), {}), "signed-in"),
+        Scenario("POST", "/api/events", new_event),
+        Scenario("POST", "/api/events:bulk", bulk_events),
+        Scenario("PUT", "/api/events/{event_id}", lambda rng, i: (lambda e: (f"/api/events/{e.id}", owned(e), {"json": event_body(e, rng)}))(pick_event(rng))),
+        Scenario("PATCH", "/api/events/{event_id}", lambda rng, i: (lambda e: (f"/api/events/{e.id}", owned(e), {
+            "json": {"status": rng.choice(["upcoming", "completed"])}}))(pick_event(rng))),
+        Scenario("POST", "/api/events/{event_id}/join", lambda rng, i: (f"/api/events/{pick_event(rng).id}/join", joiner(i), {
+            "json": {"userId": joiner(i), "userName": f"Bench {i}"}})),
+        Scenario("GET", "/api/events/{event_id}/registrations", lambda rng, i: (lambda e: (f"/api/events/{e.id}/registrations", owned(e), {}))(pick_event(rng))),
+        Scenario("PATCH", "/api/registrations/{registration_id}", single_registration),
+        Scenario("PATCH", "/api/events/{event_id}/registrations", bulk_registrations),
+        Scenario("GET", "/api/users/{user_id}/registrations", lambda rng, i: (lambda u: (f"/api/users/{u}/registrations", u, {}))(pick_user(rng))),
+        Scenario("GET", "/api/events/{event_id}/rating", lambda rng, i: (f"/api/events/{pick_event(rng).id}/rating", None, {})),
+        Scenario("GET", "/api/feedbacks", lambda rng, i: ("/api/feedbacks", None, {"params": {"eventId": pick_event(rng).id}})),
+        Scenario("POST", "/api/feedbacks", lambda rng, i: ("/api/feedbacks", joiner(i), {"json": {
+            "eventId": pick_event(rng).id, "userId": joiner(i), "rating": rng.randint(1, 5), "comment": "Bench review"}})),
+        Scenario("PUT", "/api/feedbacks/{feedback_id}", update_feedback),
+        Scenario("GET", "/api/users/{user_id}/bookmarks", lambda rng, i: (lambda u: (f"/api/users/{u}/bookmarks", u, {}))(pick_user(rng))),
+        Scenario("POST", "/api/users/{user_id}/bookmarks", lambda rng, i: (lambda u: (f"/api/users/{u}/bookmarks", u, {
+            "json": {"eventId": pick_event(rng).id}}))(pick_user(rng))),
+        Scenario("PUT", "/api/users/me/bookmarks/{event_id}", lambda rng, i: (
+            f"/api/users/me/bookmarks/{pick_event(rng).id}", pick_user(rng), {})),
+        Scenario("DELETE", "/api/users/me/bookmarks/{event_id}", lambda rng, i: (
+            f"/api/users/me/bookmarks/{pick_event(rng).id}", pick_user(rng), {})),
+        Scenario("POST", "/api/users/me/bookmarks:sync", sync_bookmarks),
+        Scenario("GET", "/api/users/{user_id}/badges", lambda rng, i: (f"/api/users/{pick_user(rng)}/badges", None, {})),
+        Scenario("GET", "/api/leaderboard", lambda rng, i: ("/api/leaderboard", None, {"params": {"limit": 20}})),
+        Scenario("GET", "/api/organizers/dashboard", lambda rng, i: ("/api/organizers/dashboard", (rng.choice(fx.organizers), "organizer"), {
+            "params": {"cursor": "", "limit": 20}})),
+        Scenario("GET", "/api/events/{event_id}/registrations/export", lambda rng, i: (lambda e: (
+            f"/api/events/{e.id}/registrations/export", owned(e), {"params": {"format": "csv"}}))(pick_event(rng))),
+        Scenario("GET", "/api/events/{event_id}/feedbacks/export", lambda rng, i: (lambda e: (
+            f"/api/events/{e.id}/feedbacks/export", owned(e), {"params": {"format": "ndjson"}}))(pick_event(rng))),
+        Scenario("GET", "/api/organizers/export", lambda rng, i: ("/api/organizers/export", (rng.choice(fx.organizers), "organizer"), {
+            "params": {"kind": "registrations", "format": "csv"}})),
+        Scenario("GET", "/api/users/me/bookmarks/events", lambda rng, i: ("/api/users/me/bookmarks/events", pick_user(rng), {})),
+        Scenario("GET", "/api/users/me/summary", lambda rng, i: ("/api/users/me/summary", pick_user(rng), {}), "all"),
+        Scenario("GET", "/api/users/me/summary", lambda rng, i: ("/api/users/me/summary", pick_user(rng), {
+            "params": {"include": "registrations,feedbackPrompts"}}), "registrations"),
+    ]
+
+
+# Long-lived streams: a request/response timing says nothing about them (see scripts/load_live.py)
+NOT_BENCHMARKED = {("GET", "/api/live")}
+
+def uncovered_routes(app, covered: List[Scenario]) -> List[str]:
+    seen = {(s.method, s.route) for s in covered} | NOT_BENCHMARKED
+    missing = []
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path.startswith("/api"):
+            for method in sorted(route.methods - {"HEAD", "OPTIONS"}):
+                if (method, route.path) not in seen:
+                    missing.append(f"{method} {route.path}")
+    return missing
+
+
+class QueryCounter:
+    """Counts SQL statements on both engines (requests of one scenario run alone, so the total is theirs)."""
+
+    def __init__(self):
+        self.count = 0
+        engines = [get_engine()]
+        if get_async_engine() is not None:
+            engines.append(get_async_engine().sync_engine)
+        for engine in engines:
+            sa_event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+class Tokens:
+    def __init__(self, issuer: FakeIssuer):
+        self.issuer = issuer
+        self._cache: Dict[tuple, str] = {}
+
+    def headers(self, identity) -> dict:
+        if identity is None:
+            return {}
+        key = identity if isinstance(identity, tuple) else (identity, None)
+        if key not in self._cache:
+            self._cache[key] = self.issuer.mint(key[0], role=key[1])
+        return {"Authorization": f"Bearer {self._cache[key]}"}
+
+
+def percentile(samples: List[float], q: float) -> float:
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, tokens: Tokens, counter: QueryCounter,
+                       requests: int, concurrency: int, seed: int) -> dict:
+    rng = random.Random(f"{seed}:{scenario.name}")
+    calls = []
+    for i in range(max(1, int(requests * scenario.weight))):
+        path, identity, kwargs = scenario.build(rng, i)
+        kwargs = dict(kwargs)
+        kwargs["headers"] = {**tokens.headers(identity), **kwargs.get("headers", {})}
+        calls.append((path, kwargs))
+
+    semaphore = asyncio.Semaphore(concurrency)
+    samples: List[float] = []
+    statuses: Counter = Counter()
+
+    async def call(path: str, kwargs: dict):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, path, **kwargs)
+                statuses[str(response.status_code)] += 1
+            except Exception as e:
+                statuses[type(e).__name__] += 1
+            samples.append(time.perf_counter() - started)
+
+    queries_before = counter.count
+    started = time.perf_counter()
+    await asyncio.gather(*(call(path, kwargs) for path, kwargs in calls))
+    elapsed = time.perf_counter() - started
+    queries = counter.count - queries_before
+
+    samples.sort()
+    ms = lambda seconds: round(seconds * 1000, 3)
+    errors = sum(n for status, n in statuses.items() if not status.isdigit() or status.startswith("5"))
+    return {
+        "requests": len(calls),
+        "errors": errors,
+        "status": dict(sorted(statuses.items())),
+        "p50Ms": ms(percentile(samples, 0.50)),
+        "p95Ms": ms(percentile(samples, 0.95)),
+        "p99Ms": ms(percentile(samples, 0.99)),
+        "meanMs": ms(statistics.fmean(samples)),
+        "throughputRps": round(len(calls) / elapsed, 1),
+        "queriesPerRequest": round(queries / len(calls), 2),
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> dict:
+    """A route regresses when its p95 grows past tolerance (and min_delta_ms), or it issues more queries."""
+    comparison = {}
+    for name, current in report["routes"].items():
+        before = baseline.get("routes", {}).get(name)
+        if before is None:
+            comparison[name] = {"new": True}
+            continue
+        p95_ratio = current["p95Ms"] / max(before["p95Ms"], 0.001)
+        slower = p95_ratio > 1 + tolerance and current["p95Ms"] - before["p95Ms"] > min_delta_ms
+        more_queries = current["queriesPerRequest"] > before["queriesPerRequest"] + 0.5
+        comparison[name] = {
+            "p95Ratio": round(p95_ratio, 2),
+            "p99Ratio": round(current["p99Ms"] / max(before["p99Ms"], 0.001), 2),
+            "throughputRatio": round(current["throughputRps"] / max(before["throughputRps"], 0.001), 2),
+            "queriesDelta": round(current["queriesPerRequest"] - before["queriesPerRequest"], 2),
+            "regressed": slower or more_queries,
+        }
+    return comparison
+
+
+async def bench(args, issuer: FakeIssuer, dataset: dict) -> dict:
+    from api.index import app
+
+    selected = scenarios(Fixtures(random.Random(args.seed)), uuid.uuid4().hex[:8])
+    missing = uncovered_routes(app, selected)
+    if args.only:
+        selected = [s for s in selected if any(part in s.name for part in args.only)]
+
+    counter = QueryCounter()
+    tokens = Tokens(issuer)
+    report = {
+        "meta": {
+            "dataset": dataset,
+            "database": get_engine().dialect.name,
+            "dbAsync": settings.DB_ASYNC,
+            "responseCache": settings.RESPONSE_CACHE_BACKEND,
+            "serialization": settings.SERIALIZATION_MODE,
+            "signupMode": settings.SIGNUP_MODE,
+            "concurrency": args.concurrency,
+            "requestsPerRoute": args.requests,
+            "seed": args.seed,
+            "python": platform.python_version(),
+        },
+        "uncoveredRoutes": missing,
+        "routes": {},
+    }
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=300) as client:
+        # Warm the JWKS cache and the lazily created engines/pools
+        await client.get("/api/users/me/bookmarks/events", headers=tokens.headers(user_id(0)))
+        for scenario in selected:
+            report["routes"][scenario.name] = await run_scenario(
+                client, scenario, tokens, counter, args.requests, args.concurrency, args.seed
+            )
+            if not args.quiet:
+                row = report["routes"][scenario.name]
+                print(f"  {scenario.name:<55} p50 {row['p50Ms']:>9.2f}ms  p99 {row['p99Ms']:>9.2f}ms  "
+                      f"{row['throughputRps']:>8.1f} rps  {row['queriesPerRequest']:>5.2f} q/req  {row['status']}",
+                      file=sys.stderr)
+    return report
+
+
+def main(args):
+    if args.skip_seed:
+        dataset = {"reused": True}
+    else:
+        print("🌱 Seeding benchmark database...", file=sys.stderr)
+        dataset = seed_from_args(args)
+
+    with FakeIssuer() as issuer:
+        settings.CLERK_ISSUER = issuer.url
+        report = asyncio.run(bench(args, issuer, dataset))
+
+    failed = []
+    if report["uncoveredRoutes"]:
+        failed.append(f"routes without a scenario: {', '.join(report['uncoveredRoutes'])}")
+    failed += [f"{name}: {row['errors']} errors" for name, row in report["routes"].items() if row["errors"]]
+    # A scenario that never succeeds is measuring an error page, not the route
+    failed += [f"{name}: no 2xx responses {row['status']}" for name, row in report["routes"].items()
+               if not any(status.startswith("2") for status in row["status"])]
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["comparison"] = compare(report, json.load(f), args.tolerance, args.min_delta_ms)
+        failed += [f"{name} regressed {row}" for name, row in report["comparison"].items() if row.get("regressed")]
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+    if failed:
+        for problem in failed:
+            print(f"❌ {problem}", file=sys.stderr)
+        sys.exit(1)
+    print(f"✅ {len(report['routes'])} scenarios benchmarked" + (" against the baseline" if args.baseline else ""), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark every API route against a deterministic synthetic dataset.")
+    add_seed_arguments(parser)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the database as it is")
+    parser.add_argument("--requests", type=int, default=200, help="requests per route (jobs run a fraction of this)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--only", nargs="+", help="only run scenarios whose name contains one of these")
+    parser.add_argument("--output", help="also write the JSON report to this file (use it as a later --baseline)")
+    parser.add_argument("--baseline", help="previous report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95 growth before a route counts as regressed")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="ignore p95 growth smaller than this")
+    parser.add_argument("--quiet", action="store_true")
+    main(parser.parse_args())
@@ -0,0 +1,100 @@
+import argparse
+import datetime
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Add parent directory to path to allow importing api modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BENCH_DB = os.path.join(tempfile.gettempdir(), "umission_pagination.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{BENCH_DB}"
+os.environ.setdefault("DEBUG", "false")
+
+from sqlalchemy import insert, text
+from sqlmodel import Session, SQLModel, select
+
+from api.database import get_engine
+from api.models import Event
+from api.pagination import EVENT_ORDER, apply_keyset, split_page
+
+
+def seed(rows: int):
+    """Deterministic synthetic feed: `rows` events spread over ~3 years, many per day."""
+    if os.path.exists(BENCH_DB):
+        os.remove(BENCH_DB)
+    engine = get_engine()
+    SQLModel.metadata.create_all(engine)
+    rng = random.Random(42)
+    start = datetime.date(2024, 1, 1)
+    batch = []
+    with engine.begin() as conn:
+        for i in range(rows):
+            batch.append({
+                "id": f"evt-{i:08d}", "title": f"Event {i}", "date": start + datetime.timedelta(days=rng.randrange(1000)),
+                "location": "Campus", "locationCategory": "Other", "category": "Education",
+                "maxVolunteers": 10, "currentVolunteers": 0, "description": "Synthetic",
+                "organizerId": f"org-{i % 50}", "organizerName": "Org", "tasks": "", "status": "upcoming",
+            })
+            if len(batch) == 5000:
+                conn.execute(insert(Event), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Event), batch)
+        conn.execute(text("ANALYZE"))
+
+
+def timed(session: Session, query, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        session.exec(query).all()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main(rows: int, limit: int, page: int, repeats: int, max_ratio: float):
+    seed(rows)
+    base = select(Event).where(Event.status == "upcoming")
+
+    with Session(get_engine()) as session:
+        # Walk to the target page to obtain its cursor, exactly as a client would
+        cursor = ""
+        for _ in range(page - 1):
+            _, cursor = split_page(session.exec(apply_keyset(base, cursor, limit)).all(), limit)
+
+        results = {
+            "rows": rows, "limit": limit, "page": page,
+            "keysetPage1Ms": timed(session, apply_keyset(base, "", limit), repeats),
+            f"keysetPage{page}Ms": timed(session, apply_keyset(base, cursor, limit), repeats),
+            "offsetPage1Ms": timed(session, base.order_by(*EVENT_ORDER).offset(0).limit(limit), repeats),
+            f"offsetPage{page}Ms": timed(session, base.order_by(*EVENT_ORDER).offset((page - 1) * limit).limit(limit), repeats),
+        }
+        compiled = apply_keyset(base, cursor, limit).compile(get_engine(), compile_kwargs={"literal_binds": True})
+        plan = session.exec(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+        results["keysetPlan"] = [row[-1] for row in plan]
+
+    results = {k: round(v, 3) if isinstance(v, float) else v for k, v in results.items()}
+    ratio = results[f"keysetPage{page}Ms"] / max(results["keysetPage1Ms"], 0.001)
+    results["keysetDeepToFirstRatio"] = round(ratio, 2)
+    print(json.dumps(results, indent=2))
+
+    if ratio > max_ratio:
+        print(f"❌ Keyset page {page} costs {ratio:.1f}x page 1 (budget {max_ratio}x)")
+        sys.exit(1)
+    print(f"✅ Keyset page {page} costs the same as page 1 ({ratio:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare keyset vs offset pagination cost on a synthetic feed.")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--page", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=25)
+    parser.add_argument("--max-ratio", type=float, default=3.0)
+    args = parser.parse_args()
+    main(args.rows, args.limit, args.page, args.repeats, args.max_ratio)
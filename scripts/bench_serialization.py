@@ -0,0 +1,148 @@
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import List, Union
+
+# Add parent directory to path to allow importing api modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BENCH_DB = os.path.join(tempfile.gettempdir(), "umission_serialization.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{BENCH_DB}"
+os.environ.setdefault("DEBUG", "false")
+os.environ["AUTO_CONCLUDE_BACKGROUND"] = "false"
+# Measure serialization, not the response cache
+os.environ["RESPONSE_CACHE_BACKEND"] = "off"
+
+import httpx
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlmodel import Session, SQLModel, select
+
+from api.config import settings
+from api.database import get_engine
+from api.models import Event, EventPage, EventReadWithStats, EventStatsPage
+from api.serialization import dumps, orjson, rows_to_dicts, select_event_rows
+
+# What FastAPI does with response_model: validate the return value, dump it to JSON-able python, json.dumps
+EVENTS_RESPONSE = TypeAdapter(Union[List[Event], EventPage])
+DASHBOARD_RESPONSE = TypeAdapter(Union[List[EventReadWithStats], EventStatsPage])
+
+
+def seed(rows: int):
+    if os.path.exists(BENCH_DB):
+        os.remove(BENCH_DB)
+    engine = get_engine()
+    SQLModel.metadata.create_all(engine)
+    start = datetime.date(2025, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Event), [{
+            "id": f"evt-{i:06d}", "title": f"Beach Cleanup #{i}", "date": start + datetime.timedelta(days=i % 365),
+            "location": "Kolej Kediaman 12", "locationCategory": "Residential College", "category": "Environment",
+            "maxVolunteers": 30, "currentVolunteers": i % 30, "description": "Help us clean the beach. " * 8,
+            "organizerId": "org-1", "organizerName": "Green Club", "imageUrl": "https://example.com/img.jpg",
+            "tasks": "Collect litter\nSort recyclables", "whatsappLink": "https://chat.whatsapp.com/x",
+            "welcomeMessage": "Welcome aboard!", "status": "upcoming", "ratingSum": i % 50, "ratingCount": i % 11,
+            "version": 1, "updatedAt": datetime.datetime(2025, 1, 1),
+        } for i in range(rows)])
+
+
+def events_current(session: Session, n: int) -> bytes:
+    events = session.exec(select(Event).limit(n)).all()
+    for e in events:
+        e.whatsappLink = None
+        e.welcomeMessage = None
+    content = EVENTS_RESPONSE.dump_python(EVENTS_RESPONSE.validate_python(events), mode="json")
+    return json.dumps(content, separators=(",", ":")).encode("utf-8")
+
+
+def events_fast(session: Session, n: int) -> bytes:
+    return dumps(rows_to_dicts(session.exec(select_event_rows(mask_private=True).limit(n)).all()))
+
+
+def dashboard_current(session: Session, n: int) -> bytes:
+    data = []
+    for event in session.exec(select(Event).limit(n)).all():
+        with_stats = EventReadWithStats.model_validate(event)
+        with_stats.avgRating = round(event.ratingSum / event.ratingCount, 1) if event.ratingCount else 0
+        with_stats.feedbackCount = event.ratingCount
+        data.append(with_stats)
+    content = DASHBOARD_RESPONSE.dump_python(DASHBOARD_RESPONSE.validate_python(data), mode="json")
+    return json.dumps(content, separators=(",", ":")).encode("utf-8")
+
+
+def dashboard_fast(session: Session, n: int) -> bytes:
+    items = rows_to_dicts(session.exec(select_event_rows(mask_private=False).limit(n)).all())
+    for item in items:
+        item["avgRating"] = round(item["ratingSum"] / item["ratingCount"], 1) if item["ratingCount"] else 0.0
+        item["feedbackCount"] = item["ratingCount"]
+    return dumps(items)
+
+
+def timed(fn, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+async def timed_endpoint(n: int, repeats: int, mode: str) -> float:
+    """Full GET /api/events round trip in-process (routing, validation, encoding; no network)."""
+    from api.index import app
+
+    settings.SERIALIZATION_MODE = mode
+    samples = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            response = await client.get("/api/events", params={"limit": n})
+            samples.append(time.perf_counter() - started)
+            assert response.status_code == 200 and len(response.json()) == n
+    return statistics.median(samples) * 1000
+
+
+def main(sizes: List[int], repeats: int, min_speedup: float):
+    seed(max(sizes))
+    results = {"orjson": orjson is not None, "repeats": repeats, "sizes": {}}
+    worst = None
+
+    with Session(get_engine()) as session:
+        for n in sizes:
+            # Same payload either way (key order aside): the fast path is a drop-in replacement
+            assert json.loads(events_current(session, n)) == json.loads(events_fast(session, n))
+            assert json.loads(dashboard_current(session, n)) == json.loads(dashboard_fast(session, n))
+            row = {
+                "eventsCurrentMs": timed(lambda: events_current(session, n), repeats),
+                "eventsFastMs": timed(lambda: events_fast(session, n), repeats),
+                "dashboardCurrentMs": timed(lambda: dashboard_current(session, n), repeats),
+                "dashboardFastMs": timed(lambda: dashboard_fast(session, n), repeats),
+                "endpointCurrentMs": asyncio.run(timed_endpoint(n, repeats, "pydantic")),
+                "endpointFastMs": asyncio.run(timed_endpoint(n, repeats, "fast")),
+            }
+            for name in ("events", "dashboard", "endpoint"):
+                speedup = row[f"{name}CurrentMs"] / max(row[f"{name}FastMs"], 0.001)
+                row[f"{name}Speedup"] = speedup
+                worst = speedup if worst is None else min(worst, speedup)
+            results["sizes"][n] = {k: round(v, 3) if k.endswith("Ms") else round(v, 2) for k, v in row.items()}
+
+    print(json.dumps(results, indent=2))
+    if worst < min_speedup:
+        print(f"❌ Fast serialization is only {worst:.2f}x the current path (budget {min_speedup}x)")
+        sys.exit(1)
+    print(f"✅ Fast serialization is at least {worst:.2f}x faster than the current path")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare Pydantic response_model serialization with the fast (column + orjson) path.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeats", type=int, default=30)
+    parser.add_argument("--min-speedup", type=float, default=1.0)
+    args = parser.parse_args()
+    main(args.sizes, args.repeats, args.min_speedup)
@@ -0,0 +1,176 @@
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add parent directory to path to allow importing api modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'umission_export.db')}")
+os.environ.setdefault("DEBUG", "false")
+os.environ["AUTO_CONCLUDE_BACKGROUND"] = "false"
+
+from sqlalchemy import delete, insert
+from sqlmodel import Session
+
+from api.config import settings
+from api.database import get_engine
+from api.migrations import upgrade
+from api.models import Event, Feedback, Registration
+from fake_issuer import FakeIssuer
+
+# ==========================================
+# Export Memory Check
+# ==========================================
+# Seeds one event per --sizes entry, downloads each export of every event (CSV and NDJSON)
+# through the ASGI app in-process, counting the body without keeping it, and records the
+# peak Python memory (tracemalloc) of every download. A streamed export holds at most one
+# batch (EXPORT_BATCH_SIZE rows), so from one batch up its peak must not grow with the row
+# count: exit 1 when the largest export peaks more than --tolerance-kb above the
+# second-largest, when any export peaks above --max-peak-kb, or when a download has the
+# wrong number of lines.
+
+ORGANIZER = "org-export"
+
+
+def event_for(size: int) -> str:
+    return f"export-{size}"
+
+
+def seed(sizes: list):
+    engine = get_engine()
+    upgrade(engine)
+    today = datetime.date.today()
+    with Session(engine) as session:
+        # Every export-* event, including those of earlier runs with other sizes
+        for model, column in ((Registration, Registration.eventId), (Feedback, Feedback.eventId), (Event, Event.id)):
+            session.exec(delete(model).where(column.startswith("export-")))
+        for days, size in enumerate(sizes, start=1):
+            session.add(Event(
+                id=event_for(size), title=f"Export of {size} rows", date=today + datetime.timedelta(days=days),
+                location="Dewan Tunku Canselor", category="Community", maxVolunteers=size,
+                description="Export memory check", organizerId=ORGANIZER, organizerName="Export Club"
+            ))
+        session.commit()
+
+    with engine.begin() as conn:
+        for event_id, count in ((event_for(size), size) for size in sizes):
+            for start in range(0, count, 10_000):
+                users = range(start, min(count, start + 10_000))
+                conn.execute(insert(Registration), [{
+                    "id": f"{event_id}-reg-{i:08d}", "eventId": event_id, "userId": f"user_export_{i:08d}",
+                    "joinedAt": today.isoformat(), "userName": f"Volunteer {i}", "userAvatar": "", "status": "confirmed",
+                } for i in users])
+                conn.execute(insert(Feedback), [{
+                    "id": f"{event_id}-fb-{i:08d}", "eventId": event_id, "userId": f"user_export_{i:08d}",
+                    "rating": 1 + i % 5, "comment": f"Review number {i}, thanks for organizing",
+                } for i in users])
+
+
+async def download(app, path: str, query: str, token: str) -> dict:
+    """Runs one GET through the app; counts bytes and lines of the body and drops them."""
+    stats = {"status": None, "bytes": 0, "lines": 0, "chunks": 0}
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()  # The client never disconnects early
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            stats["status"] = message["status"]
+        elif message["type"] == "http.response.body" and message.get("body"):
+            stats["bytes"] += len(message["body"])
+            stats["lines"] += message["body"].count(b"\n")
+            stats["chunks"] += 1
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": query.encode(),
+        "headers": [(b"host", b"export"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 50000), "server": ("export", 80),
+    }
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    await app(scope, receive, send)
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    stats["peakKb"] = round((tracemalloc.get_traced_memory()[1] - baseline) / 1024, 1)
+    return stats
+
+
+async def run(sizes: list, issuer: FakeIssuer) -> dict:
+    from api.index import app
+
+    token = issuer.mint(ORGANIZER, role="organizer")
+    exports = {
+        "registrations": "/api/events/{}/registrations/export",
+        "feedback": "/api/events/{}/feedbacks/export",
+    }
+    tracemalloc.start()
+    # Warm-up: imports, JWKS cache, first connection
+    await download(app, exports["registrations"].format(event_for(sizes[0])), "format=csv", token)
+
+    results = {}
+    for kind, path in exports.items():
+        for format in ("csv", "ndjson"):
+            results[f"{kind}.{format}"] = {
+                str(size): await download(app, path.format(event_for(size)), f"format={format}", token) for size in sizes
+            }
+    results["organizer.csv"] = {
+        str(sum(sizes)): await download(app, "/api/organizers/export", "kind=registrations&format=csv", token)
+    }
+    tracemalloc.stop()
+    return results
+
+
+def check(results: dict, sizes: list, tolerance_kb: float, max_peak_kb: float) -> list:
+    problems = []
+    for name, runs in results.items():
+        for size, stats in runs.items():
+            expected = int(size) + name.endswith(".csv")  # CSV has a header line
+            if stats["status"] != 200 or stats["lines"] != expected:
+                problems.append(f"{name} ({size} rows): status {stats['status']}, {stats['lines']} lines, expected {expected}")
+            if max_peak_kb and stats["peakKb"] > max_peak_kb:
+                problems.append(f"{name} ({size} rows): peaked at {stats['peakKb']} KB, budget {max_peak_kb:g} KB")
+        if len(sizes) > 1 and str(sizes[-1]) in runs:
+            before, after = runs[str(sizes[-2])]["peakKb"], runs[str(sizes[-1])]["peakKb"]
+            if after > before + tolerance_kb:
+                problems.append(f"{name}: peak grew from {before} KB ({sizes[-2]:,} rows) to {after} KB ({sizes[-1]:,} rows)")
+    return problems
+
+
+def main(sizes: list, tolerance_kb: float, max_peak_kb: float):
+    seed(sizes)
+    with FakeIssuer() as issuer:
+        settings.CLERK_ISSUER = issuer.url
+        results = asyncio.run(run(sizes, issuer))
+
+    problems = check(results, sizes, tolerance_kb, max_peak_kb)
+    print(json.dumps({"database": settings.DATABASE_URL.split("://")[0], "asyncDriver": settings.DB_ASYNC,
+                      "sizes": sizes, "exports": results}, indent=2))
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        sys.exit(1)
+    peak = max(stats["peakKb"] for runs in results.values() for stats in runs.values())
+    print(f"✅ Exports stream in flat memory: {sizes[0]:,} to {sizes[-1]:,} rows, every download peaked under {peak:,.0f} KB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that organizer exports stream in constant memory.")
+    parser.add_argument("--sizes", default="100,10000,200000",
+                        help="comma-separated row counts, one event each (try 100,10000,1000000)")
+    parser.add_argument("--tolerance-kb", type=float, default=256,
+                        help="how much more the largest export may peak than the second-largest")
+    parser.add_argument("--max-peak-kb", type=float, default=8192, help="peak budget per download; 0 = none")
+    args = parser.parse_args()
+    main(sorted(int(size) for size in args.sizes.split(",")), args.tolerance_kb, args.max_peak_kb)
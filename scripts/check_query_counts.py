@@ -0,0 +1,165 @@
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import re
+import sys
+import tempfile
+
+# Add parent directory to path to allow importing api modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'umission_query_counts.db')}")
+os.environ.setdefault("DEBUG", "false")
+os.environ["AUTO_CONCLUDE_BACKGROUND"] = "false"
+# The statement counts come from the per-request SQL instrumentation (Server-Timing "db" entry)
+os.environ["SQL_INSTRUMENTATION"] = "true"
+# Not what is measured here, and the bucket would run dry on the writes
+os.environ["RATE_LIMIT_BACKEND"] = "off"
+
+import httpx
+from sqlalchemy import delete, insert
+from sqlmodel import Session
+
+from api.config import settings
+from api.database import get_engine
+from api.migrations import upgrade
+from api.models import Bookmark, BookmarkCounter, Event, Feedback, Registration
+from fake_issuer import FakeIssuer
+
+# ==========================================
+# Query Count Check (batch loaders, no N+1)
+# ==========================================
+# Seeds one volunteer per --sizes entry with that many events, each registered (confirmed),
+# bookmarked and, for every other one, reviewed. Then, for each volunteer, runs the same
+# requests through the ASGI app in-process: their registrations, an event they joined, and
+# every bookmark endpoint (list, events, toggle on and off, PUT, DELETE, sync). The SQL
+# statements of each request are read from its Server-Timing header. Exit 1 when any
+# request runs a different number of statements for the smallest and the largest volunteer:
+# a loop of lookups per row would grow with it.
+
+USER_PREFIX = "user_qc_"
+EVENT_PREFIX = "qc-"
+SPARE_EVENT = "qc-spare"  # Never bookmarked by the seed: toggled, added and removed by the requests
+QUERIES = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def user_for(size: int) -> str:
+    return f"{USER_PREFIX}{size}"
+
+
+def event_for(size: int, i: int) -> str:
+    return f"{EVENT_PREFIX}{size}-{i:06d}"
+
+
+def seed(sizes: list):
+    engine = get_engine()
+    upgrade(engine)
+    today = datetime.date.today()
+    with engine.begin() as conn:
+        # Everything of earlier runs, whatever their sizes
+        for model, column in (
+            (Registration, Registration.userId), (Feedback, Feedback.userId),
+            (Bookmark, Bookmark.userId), (BookmarkCounter, BookmarkCounter.userId),
+        ):
+            conn.execute(delete(model).where(column.startswith(USER_PREFIX)))
+        conn.execute(delete(Event).where(Event.id.startswith(EVENT_PREFIX)))
+
+        def event_row(event_id: str, days: int) -> dict:
+            return {
+                "id": event_id, "title": f"Query count event {event_id}", "date": today + datetime.timedelta(days=days),
+                "location": "Dewan Tunku Canselor", "locationCategory": "Other", "category": "Community",
+                "maxVolunteers": 50, "currentVolunteers": 1, "description": "Query count check",
+                "organizerId": "org-query-counts", "organizerName": "Query Club", "status": "Upcoming",
+                "ratingSum": 0, "ratingCount": 0, "version": 1,
+            }
+
+        conn.execute(insert(Event), [event_row(SPARE_EVENT, 1)])
+        for size in sizes:
+            user_id = user_for(size)
+            events = [event_for(size, i) for i in range(size)]
+            conn.execute(insert(Event), [event_row(event_id, 1 + i % 90) for i, event_id in enumerate(events)])
+            conn.execute(insert(Registration), [{
+                "id": f"{event_id}-reg", "eventId": event_id, "userId": user_id, "joinedAt": today.isoformat(),
+                "userName": f"Volunteer {size}", "userAvatar": "", "status": "confirmed",
+            } for event_id in events])
+            conn.execute(insert(Feedback), [{
+                "id": f"{event_id}-fb", "eventId": event_id, "userId": user_id, "rating": 4, "comment": "Well run",
+            } for event_id in events[::2]])
+            conn.execute(insert(Bookmark), [{
+                "id": f"{event_id}-bm", "userId": user_id, "eventId": event_id, "removed": False, "version": 1,
+            } for event_id in events])
+            conn.execute(insert(BookmarkCounter), [{"userId": user_id, "lastVersion": 1}])
+
+
+def statements(response: httpx.Response) -> int:
+    match = QUERIES.search(response.headers.get("server-timing", ""))
+    if match is None:
+        raise SystemExit(f"❌ {response.request.method} {response.request.url.path}: no Server-Timing db entry")
+    return int(match.group(1))
+
+
+async def requests_for(client: httpx.AsyncClient, size: int, token: str) -> dict:
+    """Statements per request, keyed by a size-independent label, in a fixed order."""
+    user_id = user_for(size)
+    headers = {"Authorization": f"Bearer {token}"}
+    calls = [
+        ("GET registrations", "GET", f"/api/users/{user_id}/registrations", None),
+        ("GET event (joined)", "GET", f"/api/events/{event_for(size, 0)}", None),
+        ("GET bookmarks", "GET", f"/api/users/{user_id}/bookmarks", None),
+        ("GET bookmarked events", "GET", "/api/users/me/bookmarks/events", None),
+        ("POST bookmark toggle (add)", "POST", f"/api/users/{user_id}/bookmarks", {"eventId": SPARE_EVENT}),
+        ("POST bookmark toggle (remove)", "POST", f"/api/users/{user_id}/bookmarks", {"eventId": SPARE_EVENT}),
+        ("PUT bookmark", "PUT", f"/api/users/me/bookmarks/{SPARE_EVENT}", None),
+        ("DELETE bookmark", "DELETE", f"/api/users/me/bookmarks/{SPARE_EVENT}", None),
+        ("POST bookmarks:sync", "POST", "/api/users/me/bookmarks:sync", {"add": [SPARE_EVENT], "since": 0}),
+    ]
+    counts = {}
+    for label, method, path, body in calls:
+        response = await client.request(method, path, json=body, headers=headers)
+        if response.status_code != 200:
+            raise SystemExit(f"❌ {label} ({size} registrations): HTTP {response.status_code} {response.text[:200]}")
+        counts[label] = statements(response)
+    return counts
+
+
+async def run(sizes: list, issuer: FakeIssuer) -> dict:
+    from api.index import app
+
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://counts", timeout=60) as client:
+        # Warm-up: imports, JWKS cache, first connection
+        await client.get(f"/api/users/{user_for(sizes[0])}/registrations",
+                         headers={"Authorization": f"Bearer {issuer.mint(user_for(sizes[0]))}"})
+        for size in sizes:
+            results[size] = await requests_for(client, size, issuer.mint(user_for(size)))
+    return results
+
+
+def main(sizes: list):
+    seed(sizes)
+    with FakeIssuer() as issuer:
+        settings.CLERK_ISSUER = issuer.url
+        results = asyncio.run(run(sizes, issuer))
+
+    smallest, largest = results[sizes[0]], results[sizes[-1]]
+    report = {label: {str(size): results[size][label] for size in sizes} for label in smallest}
+    print(json.dumps({"database": settings.DATABASE_URL.split("://")[0], "asyncDriver": settings.DB_ASYNC,
+                      "statements": report}, indent=2))
+    problems = [
+        f"{label}: {smallest[label]} statements with {sizes[0]} registrations, {largest[label]} with {sizes[-1]}"
+        for label in smallest if smallest[label] != largest[label]
+    ]
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        sys.exit(1)
+    print(f"✅ Same statement count for {sizes[0]} and {sizes[-1]} registrations on all {len(smallest)} requests")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check registration and bookmark reads run a constant number of SQL statements.")
+    parser.add_argument("--sizes", default="3,300", help="comma-separated registrations (and bookmarks) per volunteer")
+    args = parser.parse_args()
+    main(sorted(int(size) for size in args.sizes.split(",")))
@@ -0,0 +1,153 @@
+import argparse
+import datetime
+import json
+import os
+import re
+import sys
+import tempfile
+from typing import Callable, Dict, List, Tuple
+
+# Add parent directory to path to allow importing api modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'umission_plans.db')}")
+os.environ.setdefault("DEBUG", "false")
+os.environ["AUTO_CONCLUDE_BACKGROUND"] = "false"
+
+from sqlmodel import col, select
+
+from api.database import get_engine
+from api.exports import select_feedback_export, select_registrations_export
+from api.index import select_user_badges, select_user_registrations
+from api.loaders import pairs_in
+from api.migrations import upgrade
+from api.models import Bookmark, Event, EventStatus, Feedback, Registration, RegistrationStatus, UserStats
+from api.pagination import EVENT_ORDER, apply_keyset, encode_cursor
+from api.search import apply_search
+from api.stats import confirmed_per_user
+from seed_data import add_seed_arguments, event_id, organizer_id, seed_from_args, user_id
+
+# ==========================================
+# Query Plan Check
+# ==========================================
+# EXPLAINs the hot queries of api/index.py and api/jobs.py against a seeded database and
+# fails (exit 1) when one of them reads a table without an index: a missing or unusable
+# index shows up here before it shows up as a slow endpoint.
+#   SQLite:   EXPLAIN QUERY PLAN; a "SCAN <table>" step without an index is a failure.
+#   Postgres: EXPLAIN (FORMAT JSON) with enable_seqscan off, so the planner only picks a
+#             Seq Scan when no index can serve the query (small seeds would otherwise make
+#             sequential scans legitimately cheaper).
+
+def explain(conn, statement, prefix: str):
+    # Literal values: the plan Postgres picks for a one-off query, and no result-type processing
+    sql = statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    return conn.exec_driver_sql(f"{prefix} {sql}")
+
+def hot_queries(today: datetime.date) -> Dict[str, Callable[[], object]]:
+    """Each query as the endpoint builds it, with ids that exist in the seeded dataset."""
+    event, other, user, organizer = event_id(7), event_id(11), user_id(3), organizer_id(1)
+    cursor = encode_cursor(today, event_id(0))
+    status_feed = select(Event).where(Event.status == EventStatus.UPCOMING)
+    dashboard = select(Event).where(Event.organizerId == organizer)
+    return {
+        # api/jobs.py
+        "auto-conclude sweep": lambda: select(Event.id).where(Event.status == EventStatus.UPCOMING, Event.date < today),
+        "confirmed volunteers of events": lambda: confirmed_per_user([event, other]),
+        # GET /api/events, GET /api/organizers/dashboard (the validator sums the fixed-size
+        # eventchanges table: a scan by design, not listed)
+        "feed page (status, cursor)": lambda: apply_keyset(status_feed, cursor, 20),
+        "feed page (first)": lambda: apply_keyset(select(Event), "", 20),
+        "feed search": lambda: apply_search(select(Event), "beach cleanup").order_by(*EVENT_ORDER).limit(20),
+        "dashboard page (cursor)": lambda: apply_keyset(dashboard, cursor, 20),
+        # GET /api/events/{id}, /ratings, PUT/PATCH events
+        "event by id": lambda: select(Event).where(Event.id == event),
+        "event ratings batch": lambda: select(Event.id, Event.ratingSum, Event.ratingCount).where(col(Event.id).in_([event, other])),
+        # Registrations
+        "event registrations": lambda: select(Registration).where(Registration.eventId == event),
+        "user registrations": lambda: select(Registration).where(Registration.userId == user),
+        "user registrations with events": lambda: select_user_registrations(user),
+        "user registrations by status": lambda: select(Registration.id).where(
+            Registration.userId == user, Registration.status == RegistrationStatus.CONFIRMED
+        ),
+        "registration loader": lambda: select(Registration).where(
+            pairs_in(Registration.userId, Registration.eventId, [(user, event), (user, other)])
+        ),
+        "waitlist promotion": lambda: select(Registration.id, Registration.userId).where(
+            Registration.eventId == event, Registration.status == RegistrationStatus.WAITLISTED
+        ).order_by(Registration.waitlistPosition),
+        # Exports
+        "event registrations export": lambda: select_registrations_export(event_id=event),
+        "organizer registrations export": lambda: select_registrations_export(organizer_id=organizer),
+        "event feedback export": lambda: select_feedback_export(event_id=event),
+        "organizer feedback export": lambda: select_feedback_export(organizer_id=organizer),
+        # Feedback
+        "event feedbacks": lambda: select(Feedback).where(Feedback.eventId == event),
+        "user feedbacks": lambda: select(Feedback).where(Feedback.userId == user),
+        # Bookmarks, badges, leaderboard
+        "bookmarks loader": lambda: select(Bookmark.userId, Bookmark.eventId).where(col(Bookmark.userId).in_([user]), ~col(Bookmark.removed)),
+        "bookmarked events": lambda: select(Event).join(Bookmark, Bookmark.eventId == Event.id).where(
+            Bookmark.userId == user, ~col(Bookmark.removed)
+        ),
+        "bookmark delta": lambda: select(Bookmark.eventId, Bookmark.removed).where(Bookmark.userId == user, Bookmark.version > 3),
+        "user badges": lambda: select_user_badges(user),
+        "leaderboard": lambda: select(UserStats).where(UserStats.completedMissions > 0)
+            .order_by(col(UserStats.completedMissions).desc(), UserStats.userId).limit(21),
+    }
+
+_SQLITE_FULL_SCAN = re.compile(r"^SCAN (\w+)\b(?! USING| VIRTUAL TABLE INDEX)")
+
+def _sqlite_plan(conn, statement) -> Tuple[List[str], List[str]]:
+    steps = [row[3] for row in explain(conn, statement, "EXPLAIN QUERY PLAN").all()]
+    return steps, [m.group(1) for m in map(_SQLITE_FULL_SCAN.match, steps) if m]
+
+def _postgres_plan(conn, statement) -> Tuple[List[str], List[str]]:
+    steps, full_scans = [], []
+
+    def walk(node: dict, depth: int):
+        relation = node.get("Relation Name")
+        steps.append("  " * depth + node["Node Type"] + (f" on {relation}" if relation else "")
+                     + (f" using {node['Index Name']}" if "Index Name" in node else ""))
+        if node["Node Type"] == "Seq Scan":
+            full_scans.append(relation)
+        for child in node.get("Plans", []):
+            walk(child, depth + 1)
+
+    walk(explain(conn, statement, "EXPLAIN (FORMAT JSON)").scalar()[0]["Plan"], 0)
+    return steps, full_scans
+
+def check_plans(today: datetime.date) -> dict:
+    engine = get_engine()
+    plan = _sqlite_plan if engine.dialect.name == "sqlite" else _postgres_plan
+    results = {}
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.exec_driver_sql("SET enable_seqscan = off")
+        for name, build in hot_queries(today).items():
+            steps, full_scans = plan(conn, build())
+            results[name] = {"ok": not full_scans, "fullScans": full_scans, "plan": steps}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that every hot query is served by an index (EXPLAIN on a seeded database).")
+    add_seed_arguments(parser)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the database as it is (migrations are still applied)")
+    parser.add_argument("--verbose", action="store_true", help="print every plan, not only the failing ones")
+    args = parser.parse_args()
+
+    if args.skip_seed:
+        upgrade()
+    else:
+        print(f"🌱 Seeding {get_engine().url.render_as_string(hide_password=True)} ({args.profile} profile)...", flush=True)
+        seed_from_args(args)
+
+    results = check_plans(args.anchor or datetime.date.today())
+    failed = [name for name, result in results.items() if not result["ok"]]
+    for name, result in results.items():
+        print(f"{'✅' if result['ok'] else '❌'} {name}")
+        if args.verbose or not result["ok"]:
+            print("\n".join(f"     {step}" for step in result["plan"]))
+    if failed:
+        print(json.dumps({"failed": failed}, indent=2))
+        sys.exit(1)
+    print(f"🏁 All {len(results)} hot queries use an index.")
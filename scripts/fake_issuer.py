@@ -0,0 +1,151 @@
+import asyncio
+import base64
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path to allow importing api modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwt
+
+
+def _b64url_uint(value: int) -> str:
+    raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+class FakeIssuer:
+    """
+    Local stand-in for Clerk: serves a JWKS document over HTTP and mints RS256 tokens.
+    Lets the auth caches be exercised offline (no network, no Clerk account).
+
+    Usage:
+        with FakeIssuer() as issuer:
+            settings.CLERK_ISSUER = issuer.url
+            token = issuer.mint("user_123", role="organizer")
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.keys = {}
+        self.active_kid = None
+        self.jwks_requests = 0
+        self.delay = 0.0
+        self.rotate()
+
+        issuer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/.well-known/jwks.json":
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                issuer.jwks_requests += 1
+                if issuer.delay:
+                    time.sleep(issuer.delay)
+                body = json.dumps(issuer.jwks()).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self.url = f"http://{host}:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def rotate(self) -> str:
+        """Add a new signing key and make it the active one (old keys stay published)."""
+        kid = f"fake-{uuid.uuid4().hex[:8]}"
+        self.keys[kid] = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.active_kid = kid
+        return kid
+
+    def jwks(self) -> dict:
+        keys = []
+        for kid, private_key in self.keys.items():
+            numbers = private_key.public_key().public_numbers()
+            keys.append({
+                "kty": "RSA", "kid": kid, "use": "sig", "alg": "RS256",
+                "n": _b64url_uint(numbers.n), "e": _b64url_uint(numbers.e)
+            })
+        return {"keys": keys}
+
+    def mint(self, sub: str, role: str = None, ttl: int = 3600, kid: str = None, **claims) -> str:
+        kid = kid or self.active_kid
+        now = int(time.time())
+        payload = {"sub": sub, "iss": self.url, "iat": now, "nbf": now, "exp": now + ttl, **claims}
+        if role:
+            payload["unsafe_metadata"] = {"role": role}
+        pem = self.keys[kid].private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        )
+        return jwt.encode(payload, pem, algorithm="RS256", headers={"kid": kid})
+
+
+async def _self_check(issuer: FakeIssuer):
+    from fastapi.security import HTTPAuthorizationCredentials
+
+    from api.auth import close_http_client, get_auth_cache_stats, get_current_user, jwks_cache, token_cache
+    from api.config import settings
+
+    settings.CLERK_ISSUER = issuer.url
+    settings.JWKS_MIN_REFRESH_INTERVAL = 0
+    jwks_cache.clear()
+    token_cache.clear()
+
+    def creds(token):
+        return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    # 1. Many distinct users, one JWKS fetch (concurrent misses share a single refresh)
+    issuer.delay = 0.2
+    tokens = [issuer.mint(f"user_{i}") for i in range(50)]
+    await asyncio.gather(*(get_current_user(creds(t)) for t in tokens))
+    assert issuer.jwks_requests == 1, issuer.jwks_requests
+    issuer.delay = 0.0
+
+    # 2. Repeated token -> served from the verified-token cache
+    for _ in range(10):
+        await get_current_user(creds(tokens[0]))
+    assert token_cache.hits == 10, token_cache.stats()
+
+    # 3. Key rotation -> unknown kid triggers exactly one refresh
+    issuer.rotate()
+    await get_current_user(creds(issuer.mint("user_rotated")))
+    assert issuer.jwks_requests == 2, issuer.jwks_requests
+
+    # 4. Stale keys are served immediately, refreshed in the background
+    settings.JWKS_CACHE_TTL = 0
+    await get_current_user(creds(issuer.mint("user_stale")))
+    await asyncio.sleep(0.1)
+    assert issuer.jwks_requests == 3, issuer.jwks_requests
+
+    print(json.dumps(get_auth_cache_stats(), indent=2))
+    await close_http_client()
+
+
+if __name__ == "__main__":
+    with FakeIssuer() as fake:
+        print(f"🔑 Fake issuer running at {fake.url}")
+        asyncio.run(_self_check(fake))
+    print("✅ Auth cache self-check passed.")
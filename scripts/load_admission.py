@@ -0,0 +1,264 @@
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import List, Optional
+
+# Add parent directory to path to allow importing api modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'umission_admission.db')}")
+os.environ.setdefault("DEBUG", "false")
+os.environ["AUTO_CONCLUDE_BACKGROUND"] = "false"
+# Sync sessions in the threadpool: the simulated query time below then blocks a worker thread
+# and holds a pooled connection, like a real database round trip
+os.environ["DB_ASYNC"] = "false"
+
+import httpx
+from sqlalchemy import delete, event
+from sqlmodel import Session
+
+from api.admission import limiter, rate_limiter
+from api.config import settings
+from api.database import get_engine
+from api.migrations import upgrade
+from api.models import Bookmark, BookmarkCounter, Event
+from fake_issuer import FakeIssuer
+
+# ==========================================
+# Admission Control Load Test
+# ==========================================
+# For every --sizes entry, fires that many reads at once against a database made slow on
+# purpose (every statement sleeps --query-ms), first without admission control, then with it,
+# in-process. Reports server-side latency percentiles of the answered and of the shed
+# requests, and the most database connections checked out at once: without admission control
+# both grow with the burst, with it they must not. Then empties a user's and an IP's token
+# bucket on the bookmark write endpoint. Exit 1 when, at any size with admission control:
+#   - an admitted request took longer than the queue timeout plus --service-budget-ms (p99)
+#   - shed requests took longer than --max-shed-ms to be told (p50; the ones that timed out in
+#     the queue: the same bound as admitted ones), or came without Retry-After
+#   - more connections were open than ADMISSION_MAX_CONCURRENT
+#   - any answer was neither 200 nor 503, or a slot was still held afterwards
+# or when the token buckets let through more (or fewer) writes than their burst.
+
+EVENT_ID = "admission-event"
+
+
+def seed():
+    engine = get_engine()
+    upgrade(engine)
+    with Session(engine) as session:
+        for model in (Bookmark, BookmarkCounter):
+            session.exec(delete(model))
+        session.exec(delete(Event).where(Event.id == EVENT_ID))
+        session.add(Event(
+            id=EVENT_ID, title="Admission control load test", date=datetime.date.today() + datetime.timedelta(days=7),
+            location="Dewan Tunku Canselor", category="Community", maxVolunteers=100,
+            description="Everyone opens the same event at once", organizerId="org-admission", organizerName="Load Club"
+        ))
+        session.commit()
+
+
+class SlowDatabase:
+    """Engine hooks: sleep before every statement, and track connections and statements in use."""
+
+    def __init__(self, query_ms: float):
+        self.query_seconds = query_ms / 1000
+        self.engine = get_engine()
+        self._lock = threading.Lock()
+        self.connections = self.max_connections = 0
+        self.statements = self.max_statements = 0
+        event.listen(self.engine, "checkout", self._checkout)
+        event.listen(self.engine, "checkin", self._checkin)
+        event.listen(self.engine, "before_cursor_execute", self._before)
+        event.listen(self.engine, "after_cursor_execute", self._after)
+
+    def reset(self):
+        with self._lock:
+            self.max_connections = self.connections
+            self.max_statements = self.statements
+
+    def _checkout(self, *args):
+        with self._lock:
+            self.connections += 1
+            self.max_connections = max(self.max_connections, self.connections)
+
+    def _checkin(self, *args):
+        with self._lock:
+            self.connections -= 1
+
+    def _before(self, *args):
+        with self._lock:
+            self.statements += 1
+            self.max_statements = max(self.max_statements, self.statements)
+        time.sleep(self.query_seconds)
+
+    def _after(self, *args):
+        with self._lock:
+            self.statements -= 1
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 1)
+
+
+class ServerTiming:
+    """
+    Wraps the app: time from a request reaching the app to its response headers. Client-side
+    timings of a thousand in-process requests mostly measure the shared event loop instead.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.timings: dict = {}
+
+    async def __call__(self, scope, receive, send):
+        started = time.perf_counter()
+
+        async def timed_send(message):
+            if message["type"] == "http.response.start":
+                request_id = dict(scope["headers"]).get(b"x-load-id")
+                self.timings[request_id] = (time.perf_counter() - started) * 1000
+            await send(message)
+
+        await self.app(scope, receive, timed_send)
+
+
+async def timed_get(client: httpx.AsyncClient, server: ServerTiming, path: str, request_id: int) -> tuple:
+    response = await client.get(path, headers={"X-Load-Id": str(request_id)})
+    return response.status_code, response.headers.get("retry-after"), server.timings.pop(str(request_id).encode())
+
+
+async def burst(client: httpx.AsyncClient, server: ServerTiming, db: SlowDatabase, requests: int) -> dict:
+    db.reset()
+    started = time.perf_counter()
+    results = await asyncio.gather(*(timed_get(client, server, f"/api/events/{EVENT_ID}", i) for i in range(requests)))
+    ok = [ms for status, _, ms in results if status == 200]
+    shed = [ms for status, _, ms in results if status == 503]
+    return {
+        "seconds": round(time.perf_counter() - started, 2),
+        "ok": len(ok),
+        "shed": len(shed),
+        "other": sorted({status for status, _, _ in results if status not in (200, 503)}),
+        "shedWithoutRetryAfter": sum(1 for status, retry, _ in results if status == 503 and not retry),
+        "okMs": {"p50": percentile(ok, 0.5), "p95": percentile(ok, 0.95), "p99": percentile(ok, 0.99), "max": percentile(ok, 1)},
+        "shedMs": {"p50": percentile(shed, 0.5), "p99": percentile(shed, 0.99), "max": percentile(shed, 1)},
+        "maxConnections": db.max_connections,
+        "maxStatements": db.max_statements,
+    }
+
+
+async def drain_bucket(client: httpx.AsyncClient, tokens: List[str], attempts: int) -> dict:
+    """One bookmark write per attempt, cycling through the given users; counts 200s and 429s."""
+    counts = {"ok": 0, "limited": 0, "other": 0, "retryAfter": None}
+    for i in range(attempts):
+        response = await client.put(f"/api/users/me/bookmarks/{EVENT_ID}",
+                                    headers={"Authorization": f"Bearer {tokens[i % len(tokens)]}"})
+        if response.status_code == 200:
+            counts["ok"] += 1
+        elif response.status_code == 429:
+            counts["limited"] += 1
+            counts["retryAfter"] = response.headers.get("retry-after")
+        else:
+            counts["other"] += 1
+    return counts
+
+
+async def run(args, issuer: FakeIssuer) -> dict:
+    from api.index import app
+
+    db = SlowDatabase(args.query_ms)
+    server = ServerTiming(app)
+    problems = []
+    report = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=server), base_url="http://load", timeout=120) as client:
+        await timed_get(client, server, f"/api/events/{EVENT_ID}", -1)  # Warm-up: imports, first connection
+        budget_ms = args.queue_timeout * 1000 + args.service_budget_ms
+        for size in args.sizes:
+            settings.ADMISSION_MAX_CONCURRENT = 0
+            off = await burst(client, server, db, size)
+            settings.ADMISSION_MAX_CONCURRENT = args.max_concurrent
+            settings.ADMISSION_MAX_QUEUE = args.max_queue
+            settings.ADMISSION_QUEUE_TIMEOUT = args.queue_timeout
+            on = await burst(client, server, db, size)
+            report[str(size)] = {"withoutAdmission": off, "withAdmission": on}
+
+            if on["okMs"]["p99"] is None or on["okMs"]["p99"] > budget_ms:
+                problems.append(f"{size} requests: admitted p99 {on['okMs']['p99']}ms is over {budget_ms:g}ms (queue timeout + service budget)")
+            # Shed on arrival (queue full) right away; shed from the queue (timed out) after the queue timeout
+            if on["shed"] and on["shedMs"]["p50"] > args.max_shed_ms:
+                problems.append(f"{size} requests: shed p50 {on['shedMs']['p50']}ms is over {args.max_shed_ms:g}ms")
+            if on["shed"] and on["shedMs"]["max"] > budget_ms:
+                problems.append(f"{size} requests: a shed request waited {on['shedMs']['max']}ms, over {budget_ms:g}ms")
+            if on["shedWithoutRetryAfter"]:
+                problems.append(f"{size} requests: {on['shedWithoutRetryAfter']} shed responses without Retry-After")
+            if on["maxConnections"] > args.max_concurrent:
+                problems.append(f"{size} requests: {on['maxConnections']} connections open at once, cap is {args.max_concurrent}")
+            if on["other"] or off["other"]:
+                problems.append(f"{size} requests: unexpected statuses {on['other'] or off['other']}")
+            if on["ok"] < min(size, args.max_concurrent):
+                problems.append(f"{size} requests: only {on['ok']} admitted")
+        report["admission"] = limiter.stats()
+        if limiter.active or report["admission"]["waiting"]:
+            problems.append(f"slots leaked: {limiter.active} still held, {report['admission']['waiting']} waiting")
+
+        # Token buckets, tight and without refill during the check
+        settings.ADMISSION_MAX_CONCURRENT = 0
+        settings.RATE_LIMIT_USER_BURST, settings.RATE_LIMIT_USER_PER_MINUTE = 5, 0.001
+        settings.RATE_LIMIT_IP_BURST, settings.RATE_LIMIT_IP_PER_MINUTE = 20, 0.001
+        user = await drain_bucket(client, [issuer.mint("user_admission_solo")], 8)
+        crowd = await drain_bucket(client, [issuer.mint(f"user_admission_{i:02d}") for i in range(10)], 25)
+        report["rateLimit"] = {"oneUser": user, "oneIp": crowd, "limiter": rate_limiter.stats()}
+        if (user["ok"], user["limited"]) != (5, 3) or not user["retryAfter"]:
+            problems.append(f"one user's bucket (burst 5): {user}")
+        # The IP bucket already gave 5 tokens to the single user above
+        if (crowd["ok"], crowd["limited"]) != (15, 10) or not crowd["retryAfter"]:
+            problems.append(f"one IP's bucket (burst 20, 5 spent): {crowd}")
+
+    return {"report": report, "problems": problems}
+
+
+def main(args):
+    if rate_limiter.backend is None:
+        sys.exit("❌ RATE_LIMIT_BACKEND is off")
+    seed()
+    with FakeIssuer() as issuer:
+        settings.CLERK_ISSUER = issuer.url
+        result = asyncio.run(run(args, issuer))
+
+    report, problems = result["report"], result["problems"]
+    print(json.dumps(report, indent=2))
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        sys.exit(1)
+    for size in args.sizes:
+        off, on = report[str(size)]["withoutAdmission"], report[str(size)]["withAdmission"]
+        print(f"✅ {size} requests at once: p99 {off['okMs']['p99']}ms over {off['maxConnections']} connections "
+              f"without admission control, {on['okMs']['p99']}ms over {on['maxConnections']} with it "
+              f"({on['shed']} shed, p50 {on['shedMs']['p50'] or 0}ms)")
+    print("✅ Token buckets enforced per user and per IP")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Overload the API in-process and check admission control keeps latency bounded.")
+    parser.add_argument("--sizes", default="100,400,1600",
+                        help="comma-separated burst sizes (requests fired at once); latency must stay bounded at each")
+    parser.add_argument("--query-ms", type=float, default=20, help="simulated time of every SQL statement")
+    parser.add_argument("--max-concurrent", type=int, default=8)
+    parser.add_argument("--max-queue", type=int, default=32)
+    parser.add_argument("--queue-timeout", type=float, default=0.5)
+    parser.add_argument("--service-budget-ms", type=float, default=500,
+                        help="allowed time for an admitted request after its wait, on top of the queue timeout")
+    parser.add_argument("--max-shed-ms", type=float, default=100, help="how long a shed request may take to be told (median)")
+    args = parser.parse_args()
+    args.sizes = sorted(int(size) for size in args.sizes.split(","))
+    main(args)
@@ -0,0 +1,186 @@
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Optional
+
+# Add parent directory to path to allow importing api modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Default to a throwaway SQLite file; point DATABASE_URL at Postgres for the real contention test
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'umission_load_join.db')}")
+os.environ.setdefault("DEBUG", "false")
+os.environ["AUTO_CONCLUDE_BACKGROUND"] = "false"
+os.environ["SIGNUP_MODE"] = "instant"
+# Every join at once is the point here: no admission queue or rate limit in between
+os.environ["ADMISSION_MAX_CONCURRENT"] = "0"
+os.environ["RATE_LIMIT_BACKEND"] = "off"
+
+import httpx
+from sqlalchemy import delete, event
+from sqlmodel import Session, SQLModel, select
+
+from api.config import settings
+from api.database import get_async_engine, get_engine, is_sqlite
+from api.models import Event, Registration, RegistrationStatus, UserBadge, UserStats, WaitlistCounter
+from fake_issuer import FakeIssuer
+
+EVENT_ID = "load-join-event"
+# SQLite takes one writer at a time: the rest wait up to this long for the lock (default 5s)
+# instead of failing with "database is locked", since every join of the wave queues behind it
+SQLITE_BUSY_TIMEOUT_MS = 120_000
+# Threadpool sessions wait for that lock on a worker thread. With every thread of the pool
+# (40) waiting, the transaction holding the lock never gets one to commit on: stay below it
+SQLITE_THREADPOOL_CONCURRENCY = 32
+
+
+def wait_for_sqlite_lock():
+    """Sets the busy timeout on every connection the app opens (threadpool and async engines)."""
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+
+    async_engine = get_async_engine()
+    for engine in (get_engine(), async_engine.sync_engine if async_engine is not None else None):
+        if engine is not None:
+            event.listen(engine, "connect", on_connect)
+
+
+def seed(capacity: int):
+    engine = get_engine()
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        for model in (Registration, WaitlistCounter, UserBadge, UserStats):
+            session.exec(delete(model))
+        session.exec(delete(Event).where(Event.id == EVENT_ID))
+        session.add(Event(
+            id=EVENT_ID, title="Load test", date=datetime.date.today() + datetime.timedelta(days=7),
+            location="Dewan Tunku Canselor", category="Community", maxVolunteers=capacity,
+            description="Concurrent join load test", organizerId="org-load", organizerName="Load Club"
+        ))
+        session.commit()
+
+
+async def join(client: httpx.AsyncClient, user_id: str, token: str, samples: list, slots: asyncio.Semaphore) -> httpx.Response:
+    async with slots:
+        started = time.perf_counter()
+        response = await client.post(
+            f"/api/events/{EVENT_ID}/join",
+            json={"userId": user_id, "userName": user_id},
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        samples.append(time.perf_counter() - started)
+    return response
+
+
+async def run(volunteers: int, capacity: int, duplicates: int, concurrency: int, issuer: FakeIssuer) -> dict:
+    from api.index import app
+
+    users = [f"user_load_{i:04d}" for i in range(volunteers)]
+    tokens = {user: issuer.mint(user) for user in users}
+    # Some volunteers double-click: the extra requests must all be rejected
+    attempts = users + users[:duplicates]
+
+    samples = []
+    slots = asyncio.Semaphore(concurrency or len(attempts))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load", timeout=120) as client:
+        # Warm the JWKS cache so the first wave doesn't measure the key fetch
+        await client.get(f"/api/users/{users[0]}/registrations", headers={"Authorization": f"Bearer {tokens[users[0]]}"})
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(join(client, user, tokens[user], samples, slots) for user in attempts))
+        elapsed = time.perf_counter() - started
+
+    statuses = Counter(response.status_code for response in responses)
+    outcomes = Counter(response.json()["status"] for response in responses if response.status_code == 200)
+    samples.sort()
+    quantile = lambda q: round(samples[min(len(samples) - 1, int(q * len(samples)))] * 1000, 2)
+    return {
+        "database": settings.DATABASE_URL.split("://")[0],
+        "asyncDriver": settings.DB_ASYNC,
+        "requests": len(attempts),
+        "concurrency": concurrency or len(attempts),
+        "volunteers": volunteers,
+        "capacity": capacity,
+        "elapsedSeconds": round(elapsed, 3),
+        "throughputRps": round(len(attempts) / elapsed, 1),
+        "latencyMs": {
+            "p50": quantile(0.50), "p95": quantile(0.95), "p99": quantile(0.99),
+            "max": round(samples[-1] * 1000, 2), "mean": round(statistics.fmean(samples) * 1000, 2),
+        },
+        "httpStatus": dict(statuses),
+        "outcomes": dict(outcomes),
+    }
+
+
+def verify(report: dict) -> list:
+    """Reads the final state back and lists every invariant it breaks."""
+    problems = []
+    with Session(get_engine()) as session:
+        event = session.get(Event, EVENT_ID)
+        regs = session.exec(select(Registration).where(Registration.eventId == EVENT_ID)).all()
+
+    confirmed = [r for r in regs if r.status == RegistrationStatus.CONFIRMED]
+    waitlisted = [r for r in regs if r.status == RegistrationStatus.WAITLISTED]
+    expected = min(report["volunteers"], report["capacity"])
+    if len(confirmed) > event.maxVolunteers:
+        problems.append(f"overbooked: {len(confirmed)} confirmed for {event.maxVolunteers} seats")
+    if len(confirmed) != expected:
+        problems.append(f"{len(confirmed)} confirmed, expected {expected}")
+    if event.currentVolunteers != len(confirmed):
+        problems.append(f"currentVolunteers={event.currentVolunteers} but {len(confirmed)} confirmed rows")
+    if len(regs) != report["volunteers"] or len({r.userId for r in regs}) != len(regs):
+        problems.append(f"{len(regs)} registrations for {report['volunteers']} volunteers")
+    positions = [r.waitlistPosition for r in waitlisted]
+    if len(set(positions)) != len(positions) or None in positions:
+        problems.append("waitlist positions are missing or repeated")
+    if report["httpStatus"].get(500):
+        problems.append(f"{report['httpStatus'][500]} requests failed with 500")
+
+    report["final"] = {
+        "currentVolunteers": event.currentVolunteers,
+        "confirmed": len(confirmed),
+        "waitlisted": len(waitlisted),
+        "version": event.version,
+    }
+    return problems
+
+
+def main(volunteers: int, capacity: int, duplicates: int, concurrency: Optional[int], max_p99: float):
+    if is_sqlite():
+        wait_for_sqlite_lock()
+        if concurrency is None and get_async_engine() is None:
+            concurrency = SQLITE_THREADPOOL_CONCURRENCY
+    seed(capacity)
+    with FakeIssuer() as issuer:
+        settings.CLERK_ISSUER = issuer.url
+        report = asyncio.run(run(volunteers, capacity, duplicates, concurrency or 0, issuer))
+
+    problems = verify(report)
+    print(json.dumps(report, indent=2))
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        sys.exit(1)
+    if max_p99 and report["latencyMs"]["p99"] > max_p99:
+        print(f"❌ p99 {report['latencyMs']['p99']}ms is over the {max_p99}ms budget")
+        sys.exit(1)
+    print(f"✅ {report['requests']} joins, {report['concurrency']} at a time, no overbooking (p99 {report['latencyMs']['p99']}ms)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fire concurrent joins at one event and check seats are never overbooked.")
+    parser.add_argument("--volunteers", type=int, default=300)
+    parser.add_argument("--capacity", type=int, default=50)
+    parser.add_argument("--duplicates", type=int, default=20, help="volunteers that send their join twice")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help=f"joins in flight at once; 0 = all (default, {SQLITE_THREADPOOL_CONCURRENCY} for SQLite with DB_ASYNC=false)")
+    parser.add_argument("--max-p99", type=float, default=0, help="fail if p99 latency (ms) is above this; 0 = report only")
+    args = parser.parse_args()
+    main(args.volunteers, args.capacity, args.duplicates, args.concurrency, args.max_p99)
@@ -0,0 +1,242 @@
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import List, Optional
+
+# Add parent directory to path to allow importing api modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'umission_load_live.db')}")
+os.environ.setdefault("DEBUG", "false")
+os.environ["AUTO_CONCLUDE_BACKGROUND"] = "false"
+os.environ["SIGNUP_MODE"] = "instant"
+os.environ["LIVE_BACKEND"] = "memory"
+# Short heartbeats so the run can check them
+os.environ.setdefault("LIVE_HEARTBEAT_SECONDS", "1")
+
+import httpx
+from sqlalchemy import delete
+from sqlmodel import Session, SQLModel
+
+from api.config import settings
+from api.database import get_engine
+from api.live import broker, publish_registration
+from api.models import Event, Registration, UserBadge, UserStats, WaitlistCounter
+from fake_issuer import FakeIssuer
+
+# ==========================================
+# Live Updates Load Test
+# ==========================================
+# Holds --subscribers idle SSE streams on GET /api/live in-process (the ASGI app driven
+# directly: httpx's ASGI transport buffers whole responses) and checks:
+#   - memory held per open stream (tracemalloc and RSS), against --max-kb-per-connection
+#   - one join fans its capacity update out to every stream, and the joiner's own stream
+#     gets the registration
+#   - idle streams get heartbeats
+#   - a subscriber that falls too far behind gets "resync" instead of growing a queue
+#   - streams over LIVE_MAX_SUBSCRIBERS are refused with 503 + Retry-After
+#   - every subscription is released when the clients disconnect
+
+EVENT_ID = "load-live-event"
+
+
+def seed(capacity: int):
+    engine = get_engine()
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        for model in (Registration, WaitlistCounter, UserBadge, UserStats):
+            session.exec(delete(model))
+        session.exec(delete(Event).where(Event.id == EVENT_ID))
+        session.add(Event(
+            id=EVENT_ID, title="Live updates load test", date=datetime.date.today() + datetime.timedelta(days=7),
+            location="Dewan Tunku Canselor", category="Community", maxVolunteers=capacity,
+            description="Many volunteers watching one event", organizerId="org-live", organizerName="Live Club"
+        ))
+        session.commit()
+
+
+def rss_kb() -> Optional[int]:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+class Stream:
+    """One SSE client: runs the ASGI app for GET /api/live and collects what it sends."""
+
+    def __init__(self, app, query: str):
+        self.status: Optional[int] = None
+        self.headers: dict = {}
+        self.body = ""
+        self.received = asyncio.Event()
+        self._disconnect = asyncio.Event()
+        self._requested = False
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+            "path": "/api/live", "raw_path": b"/api/live", "root_path": "", "query_string": query.encode(),
+            "headers": [(b"host", b"load"), (b"accept", b"text/event-stream")],
+            "client": ("127.0.0.1", 50000), "server": ("load", 80),
+        }
+        self.task = asyncio.create_task(app(scope, self._receive, self._send))
+
+    async def _receive(self):
+        if not self._requested:
+            self._requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self._disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def _send(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+            self.headers = {k.decode().lower(): v.decode() for k, v in message.get("headers", [])}
+        elif message["type"] == "http.response.body":
+            self.body += message.get("body", b"").decode()
+        self.received.set()
+
+    async def wait_for(self, text: str, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while text not in self.body:
+            if self.task.done():
+                return text in self.body
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self.received.clear()
+            try:
+                await asyncio.wait_for(self.received.wait(), remaining)
+            except asyncio.TimeoutError:
+                return text in self.body
+        return True
+
+    async def close(self):
+        self._disconnect.set()
+        await asyncio.wait_for(self.task, 10)
+
+
+async def run(subscribers: int, issuer: FakeIssuer) -> dict:
+    from api.index import app
+
+    problems: List[str] = []
+    joiner = "user_live_joiner"
+    token = issuer.mint(joiner)
+    settings.LIVE_MAX_SUBSCRIBERS = subscribers + 1  # Room for the joiner's own stream, then full
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load", timeout=60) as client:
+        # Warm imports, the pool and the JWKS cache so they don't count as per-connection memory
+        warm = Stream(app, f"events={EVENT_ID}&access_token={token}")
+        await warm.wait_for("event: capacity", 10)
+        await warm.close()
+
+        tracemalloc.start()
+        rss_before = rss_kb()
+        traced_before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        streams = [Stream(app, f"events={EVENT_ID}") for _ in range(subscribers)]
+        opened = await asyncio.gather(*(s.wait_for("event: capacity", 60) for s in streams))
+        open_seconds = time.perf_counter() - started
+        traced_after = tracemalloc.get_traced_memory()[0]
+        rss_after = rss_kb()
+        tracemalloc.stop()
+        if not all(opened):
+            problems.append(f"{opened.count(False)} of {subscribers} streams did not get their snapshot")
+        if any(s.headers.get("content-type", "").split(";")[0] != "text/event-stream" for s in streams):
+            problems.append("streams not served as text/event-stream")
+
+        own = Stream(app, f"events={EVENT_ID}&access_token={token}")
+        await own.wait_for("event: capacity", 10)
+
+        # Over LIVE_MAX_SUBSCRIBERS: refused up front
+        refused = Stream(app, f"events={EVENT_ID}")
+        refused_ok = await refused.wait_for("Too many", 10) and refused.status == 503 and "retry-after" in refused.headers
+        if not refused_ok:
+            problems.append(f"stream over the limit answered {refused.status} without Retry-After")
+
+        # Fan-out: one join, every watcher sees the new seat count
+        for s in streams:
+            s.body = ""
+        started = time.perf_counter()
+        response = await client.post(f"/api/events/{EVENT_ID}/join", json={"userId": joiner, "userName": joiner},
+                                     headers={"Authorization": f"Bearer {token}"})
+        if response.status_code != 200:
+            problems.append(f"join answered {response.status_code}: {response.text[:200]}")
+        delivered = await asyncio.gather(*(s.wait_for('"currentVolunteers":1', 10) for s in streams))
+        fan_out_ms = (time.perf_counter() - started) * 1000
+        if not all(delivered):
+            problems.append(f"{delivered.count(False)} of {subscribers} streams missed the capacity update")
+        if not await own.wait_for("event: registration", 5):
+            problems.append("the joiner's stream did not get its registration")
+
+        # Idle streams: heartbeats keep them open
+        if not await streams[0].wait_for(": keepalive", settings.LIVE_HEARTBEAT_SECONDS * 3):
+            problems.append("no heartbeat on an idle stream")
+
+        # A burst the client can't keep up with: resync, not an unbounded queue
+        for i in range(settings.LIVE_MAX_PENDING + 1):
+            publish_registration(joiner, f"burst-{i}", EVENT_ID, "confirmed")
+        resynced = await own.wait_for("event: resync", 5)
+        try:
+            await asyncio.wait_for(asyncio.shield(own.task), 5)
+        except asyncio.TimeoutError:
+            resynced = False
+        if not resynced:
+            problems.append("an overflowing stream was not told to resync and closed")
+
+        await asyncio.gather(*(s.close() for s in streams + [own, refused]))
+        await asyncio.sleep(0)
+        if broker.subscribers != 0 or broker.topics:
+            problems.append(f"{broker.subscribers} subscriptions left after every client disconnected")
+
+    traced_kb = (traced_after - traced_before) / 1024 / subscribers
+    rss_per_kb = (rss_after - rss_before) / subscribers if rss_before is not None and rss_after is not None else None
+    return {
+        "report": {
+            "database": settings.DATABASE_URL.split("://")[0],
+            "asyncDriver": settings.DB_ASYNC,
+            "subscribers": subscribers,
+            "openSeconds": round(open_seconds, 3),
+            "kbPerConnection": {"traced": round(traced_kb, 2), "rss": round(rss_per_kb, 2) if rss_per_kb is not None else None},
+            "fanOutMs": round(fan_out_ms, 1),
+            "heartbeatSeconds": settings.LIVE_HEARTBEAT_SECONDS,
+            "live": broker.stats(),
+        },
+        "problems": problems,
+    }
+
+
+def main(subscribers: int, max_kb: float):
+    seed(capacity=10)
+    with FakeIssuer() as issuer:
+        settings.CLERK_ISSUER = issuer.url
+        result = asyncio.run(run(subscribers, issuer))
+
+    report, problems = result["report"], result["problems"]
+    print(json.dumps(report, indent=2))
+    if max_kb and report["kbPerConnection"]["traced"] > max_kb:
+        problems.append(f"{report['kbPerConnection']['traced']} KB per open stream is over the {max_kb:g} KB budget")
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        sys.exit(1)
+    print(f"✅ {subscribers} live streams, {report['kbPerConnection']['traced']} KB each, "
+          f"update fanned out in {report['fanOutMs']}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hold many idle /api/live streams and check memory, fan-out and cleanup.")
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--max-kb-per-connection", type=float, default=64,
+                        help="fail if the Python memory held per open stream (KB) is above this; 0 = report only")
+    args = parser.parse_args()
+    main(args.subscribers, args.max_kb_per_connection)
@@ -0,0 +1,89 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ==========================================
+# Import-Time Profile
+# ==========================================
+# Imports the app in fresh interpreters under `python -X importtime` and reports the modules
+# with the highest cumulative import cost (the module plus everything it pulled in first),
+# and the self time summed per top-level package. The minimum over --runs is kept per module,
+# which filters out scheduler noise. Use it to find what a serverless cold start pays for;
+# scripts/bench_cold_start.py enforces the overall budget.
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+def child_env() -> dict:
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'umission_cold_start.db')}")
+    env.setdefault("DEBUG", "false")
+    env["AUTO_CONCLUDE_BACKGROUND"] = "false"
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+    return env
+
+def profile_once(module: str) -> List[dict]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=child_env(), capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise SystemExit(f"❌ import {module} failed:\n{completed.stderr[-2000:]}")
+    rows = []
+    for line in completed.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append({"module": name, "selfMs": int(self_us) / 1000, "cumulativeMs": int(cumulative_us) / 1000,
+                         "depth": len(indent) // 2})
+    return rows
+
+def profile(module: str, runs: int) -> Dict[str, dict]:
+    """Per module: the fastest of `runs` measurements."""
+    best: Dict[str, dict] = {}
+    for _ in range(runs):
+        for row in profile_once(module):
+            current = best.get(row["module"])
+            if current is None or row["cumulativeMs"] < current["cumulativeMs"]:
+                best[row["module"]] = row
+    return best
+
+def by_package(rows: Dict[str, dict]) -> Dict[str, float]:
+    totals: Dict[str, float] = {}
+    for row in rows.values():
+        package = row["module"].split(".")[0]
+        totals[package] = totals.get(package, 0.0) + row["selfMs"]
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report the modules that cost the most to import (python -X importtime).")
+    parser.add_argument("--module", default="api.index", help="module to import (default: the Vercel entry point)")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters to profile; the fastest run per module is kept")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    rows = profile(args.module, args.runs)
+    total = rows[args.module]["cumulativeMs"] if args.module in rows else sum(row["selfMs"] for row in rows.values())
+    top = sorted(rows.values(), key=lambda row: -row["cumulativeMs"])[:args.top]
+    packages = by_package(rows)
+
+    if args.json:
+        print(json.dumps({"module": args.module, "totalMs": round(total, 1), "top": top,
+                          "packagesSelfMs": {name: round(ms, 1) for name, ms in packages.items()}}, indent=2))
+        sys.exit(0)
+
+    print(f"⏱ import {args.module}: {total:.1f} ms (best of {args.runs})\n")
+    print(f"{'cumulative':>11} {'self':>9}  module")
+    for row in top:
+        print(f"{row['cumulativeMs']:>9.1f}ms {row['selfMs']:>7.1f}ms  {'  ' * row['depth']}{row['module']}")
+    print(f"\n{'self':>11}  package")
+    for name, ms in list(packages.items())[:args.top]:
+        print(f"{ms:>9.1f}ms  {name}")
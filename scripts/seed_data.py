@@ -0,0 +1,234 @@
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, Iterator, List
+
+# Add parent directory to path to allow importing api modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Default to a throwaway SQLite file; set DATABASE_URL to seed Postgres instead
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'umission_seed.db')}")
+os.environ.setdefault("DEBUG", "false")
+os.environ["AUTO_CONCLUDE_BACKGROUND"] = "false"
+
+from sqlalchemy import insert, text
+from sqlmodel import Session, SQLModel
+
+from api.database import get_engine, is_sqlite
+from api.jobs import rebuild_user_stats
+from api.migrations import schema_version, upgrade
+from api.models import Bookmark, Event, EventStatus, Feedback, LocationCategory, Registration, RegistrationStatus
+
+# ==========================================
+# Deterministic Synthetic Data
+# ==========================================
+# Same seed + same sizes = the same rows (ids, dates relative to --anchor, statuses, ratings),
+# so benchmark runs on different machines or commits compare like with like.
+# Denormalized counters (currentVolunteers, ratingSum/ratingCount, UserStats) are computed
+# consistently with the generated rows, exactly as the API would have maintained them.
+
+PROFILES: Dict[str, Dict[str, int]] = {
+    "small": {"events": 2_000, "registrations": 40_000, "feedbacks": 10_000, "bookmarks": 20_000},
+    "medium": {"events": 10_000, "registrations": 300_000, "feedbacks": 75_000, "bookmarks": 150_000},
+    "large": {"events": 50_000, "registrations": 2_000_000, "feedbacks": 500_000, "bookmarks": 1_000_000},
+}
+
+CATEGORIES = ["Environment", "Education", "Community", "Health", "Animal Welfare", "Arts & Culture", "Sports"]
+LOCATIONS = {
+    LocationCategory.RESIDENTIAL_COLLEGE.value: ["Kolej Kediaman 12", "Kolej Kediaman 4", "Kolej Kediaman 8"],
+    LocationCategory.FACULTY.value: ["Faculty of Computer Science", "Faculty of Engineering", "Faculty of Medicine"],
+    LocationCategory.OUTDOOR.value: ["Rimba Ilmu", "Tasik Varsiti", "Dataran DTC"],
+    LocationCategory.OTHER.value: ["Dewan Tunku Canselor", "Perpustakaan Utama", "Student Union"],
+}
+TITLE_WORDS = ["Beach", "River", "Campus", "Library", "Food", "Blood", "Tree", "Coding", "Tutoring", "Charity"]
+TITLE_ACTIONS = ["Cleanup", "Drive", "Workshop", "Planting", "Marathon", "Bazaar", "Camp", "Mentoring"]
+CAPACITIES = [10, 20, 30, 50, 100]
+
+CHUNK = 5000
+
+def event_id(i: int) -> str:
+    return f"evt-{i:06d}"
+
+def user_id(i: int) -> str:
+    return f"user_{i:07d}"
+
+def organizer_id(i: int) -> str:
+    return f"org_{i:05d}"
+
+def sizes_for(profile: str, **overrides) -> Dict[str, int]:
+    sizes = dict(PROFILES[profile])
+    sizes.update({key: value for key, value in overrides.items() if value is not None})
+    sizes["users"] = max(100, sizes["registrations"] // 40)
+    sizes["organizers"] = max(5, sizes["events"] // 100)
+    return sizes
+
+def _chunks(rows: Iterator[dict]) -> Iterator[List[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == CHUNK:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def generate_events(sizes: Dict[str, int], seed: int, anchor: datetime.date) -> List[dict]:
+    rng = random.Random(f"{seed}:events")
+    events = []
+    for i in range(sizes["events"]):
+        location_category = rng.choice(list(LOCATIONS))
+        day = anchor + datetime.timedelta(days=rng.randrange(-365, 365))
+        org = rng.randrange(sizes["organizers"])
+        events.append({
+            "id": event_id(i),
+            "title": f"{rng.choice(TITLE_WORDS)} {rng.choice(TITLE_ACTIONS)} #{i}",
+            "date": day,
+            "location": rng.choice(LOCATIONS[location_category]),
+            "locationCategory": location_category,
+            "category": rng.choice(CATEGORIES),
+            "maxVolunteers": rng.choice(CAPACITIES),
+            "currentVolunteers": 0,
+            "description": f"Join us for event {i}. " + " ".join(rng.choices(TITLE_WORDS + TITLE_ACTIONS, k=30)),
+            "organizerId": organizer_id(org),
+            "organizerName": f"Club {org}",
+            "imageUrl": f"https://picsum.photos/seed/{i}/800/400",
+            "tasks": "Register at the booth\nFollow the team lead\nSign out",
+            "whatsappLink": f"https://chat.whatsapp.com/bench{i}",
+            "welcomeMessage": "Thanks for joining, see you there!",
+            "status": EventStatus.COMPLETED.value if day < anchor else EventStatus.UPCOMING.value,
+            "ratingSum": 0,
+            "ratingCount": 0,
+            "version": 1,
+            "updatedAt": datetime.datetime.combine(day, datetime.time()) - datetime.timedelta(days=30),
+        })
+    return events
+
+def _per_user(total: int, users: int, user: int) -> int:
+    return total // users + (user < total % users)
+
+def generate_registrations(sizes: Dict[str, int], seed: int, events: List[dict], feedbacks: List[dict]) -> Iterator[dict]:
+    """
+    Unique (userId, eventId) pairs. Seats are respected: a 'confirmed' draw on a full event
+    becomes 'pending'. Every registration whose index crosses a feedbacks/registrations step
+    also gets a review (collected into `feedbacks`), which keeps both unique constraints exact.
+    """
+    rng = random.Random(f"{seed}:registrations")
+    n_events, n_regs = len(events), sizes["registrations"]
+    n_feedbacks = min(sizes["feedbacks"], n_regs)
+    n = 0
+    for user in range(sizes["users"]):
+        uid = user_id(user)
+        for index in rng.sample(range(n_events), min(n_events, _per_user(n_regs, sizes["users"], user))):
+            event = events[index]
+            draw = rng.random()
+            status = RegistrationStatus.CONFIRMED if draw < 0.6 else RegistrationStatus.PENDING if draw < 0.9 else RegistrationStatus.REJECTED
+            if status == RegistrationStatus.CONFIRMED:
+                if event["currentVolunteers"] >= event["maxVolunteers"]:
+                    status = RegistrationStatus.PENDING
+                else:
+                    event["currentVolunteers"] += 1
+            if (n + 1) * n_feedbacks // n_regs > n * n_feedbacks // n_regs:
+                rating = rng.choice([3, 4, 4, 5, 5, 5, 2, 1])
+                event["ratingSum"] += rating
+                event["ratingCount"] += 1
+                feedbacks.append({
+                    "id": f"fb-{len(feedbacks):08d}", "eventId": event["id"], "userId": uid,
+                    "rating": rating, "comment": rng.choice(["Great event!", "Well organised.", "Could be better.", "Loved it"]),
+                })
+            yield {
+                "id": f"reg-{n:08d}", "eventId": event["id"], "userId": uid, "status": status.value,
+                "joinedAt": (event["date"] - datetime.timedelta(days=rng.randrange(1, 60))).isoformat(),
+                "userName": f"Student {user}", "userAvatar": None, "waitlistPosition": None,
+            }
+            n += 1
+
+def generate_bookmarks(sizes: Dict[str, int], seed: int) -> Iterator[dict]:
+    rng = random.Random(f"{seed}:bookmarks")
+    n = 0
+    for user in range(sizes["users"]):
+        for index in rng.sample(range(sizes["events"]), min(sizes["events"], _per_user(sizes["bookmarks"], sizes["users"], user))):
+            yield {"id": f"bm-{n:08d}", "userId": user_id(user), "eventId": event_id(index)}
+            n += 1
+
+def seed_database(sizes: Dict[str, int], seed: int = 42, anchor: datetime.date = None, reset: bool = False) -> dict:
+    """Creates the schema and loads the synthetic rows. Returns what was written (timings included)."""
+    anchor = anchor or datetime.date.today()
+    engine = get_engine()
+    if is_sqlite():
+        path = engine.url.database
+        engine.dispose()
+        if path and os.path.exists(path):
+            os.remove(path)
+    elif reset:
+        SQLModel.metadata.drop_all(engine)
+        schema_version.drop(engine, checkfirst=True)
+    else:
+        raise SystemExit("❌ Refusing to seed a non-SQLite database without --reset (it drops every table).")
+    # The same schema production gets (tables, search index, hot-path indexes)
+    upgrade(engine)
+
+    started = time.perf_counter()
+    events = generate_events(sizes, seed, anchor)
+    feedbacks: List[dict] = []
+    with engine.begin() as conn:
+        registrations = 0
+        for batch in _chunks(generate_registrations(sizes, seed, events, feedbacks)):
+            conn.execute(insert(Registration), batch)
+            registrations += len(batch)
+        for batch in _chunks(iter(events)):
+            conn.execute(insert(Event), batch)
+        for batch in _chunks(iter(feedbacks)):
+            conn.execute(insert(Feedback), batch)
+        bookmarks = 0
+        for batch in _chunks(generate_bookmarks(sizes, seed)):
+            conn.execute(insert(Bookmark), batch)
+            bookmarks += len(batch)
+    loaded = time.perf_counter()
+
+    with Session(engine) as session:
+        rebuild_user_stats(session)
+    with engine.connect() as conn:
+        conn.execute(text("ANALYZE"))
+        conn.commit()
+
+    return {
+        "seed": seed,
+        "anchor": anchor.isoformat(),
+        "database": engine.dialect.name,
+        "events": len(events),
+        "registrations": registrations,
+        "feedbacks": len(feedbacks),
+        "bookmarks": bookmarks,
+        "users": sizes["users"],
+        "organizers": sizes["organizers"],
+        "loadSeconds": round(loaded - started, 2),
+        "indexSeconds": round(time.perf_counter() - loaded, 2),
+    }
+
+def add_seed_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--anchor", type=datetime.date.fromisoformat, default=None,
+                        help="'today' for the generated dates (YYYY-MM-DD, default: today)")
+    for name in ("events", "registrations", "feedbacks", "bookmarks"):
+        parser.add_argument(f"--{name}", type=int, default=None, help=f"override the profile's {name} count")
+    parser.add_argument("--reset", action="store_true", help="allow dropping and re-creating a non-SQLite database")
+
+def seed_from_args(args) -> dict:
+    sizes = sizes_for(args.profile, events=args.events, registrations=args.registrations,
+                      feedbacks=args.feedbacks, bookmarks=args.bookmarks)
+    return seed_database(sizes, args.seed, args.anchor, args.reset)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed a database with deterministic synthetic events, registrations, feedback and bookmarks.")
+    add_seed_arguments(parser)
+    args = parser.parse_args()
+    print(f"🌱 Seeding {get_engine().url.render_as_string(hide_password=True)} ({args.profile} profile, seed {args.seed})...")
+    print(json.dumps(seed_from_args(args), indent=2))
+    print("✅ Seed complete.")
@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { useQuery, keepPreviousData } from '@tanstack/react-query';
 
-import { getEvents, getUserBookmarks, joinEvent, toggleBookmark, getUserRegistrations, getEvent } from '../../services/api';
+import { getEvents, getUserBookmarks, joinEvent, setBookmark, getUserRegistrations, getEvent } from '../../services/api';
 import { Event, User, UserRole, Registration } from '../../types';
 import { SkeletonLoader } from '../../components/SkeletonLoader';
 import { EventDetailsModal } from './components/EventDetailsModal';
@@ -127,7 +127,7 @@ export const EventFeed: React.FC<Props> = ({ user, onNavigate }) => {
     setBookmarkingId(eventId);
 
     try {
-      await toggleBookmark(user.id, eventId);
+      await setBookmark(eventId, !isCurrentlyBookmarked);
     } catch (e) {
       console.error("Bookmark failed", e);
       // Revert on failure
@@ -303,6 +303,17 @@ export const EventFeed: React.FC<Props> = ({ user, onNavigate }) => {
                           );
                         }
 
+                        if (status === 'waitlisted') {
+                          return (
+                            <button
+                              disabled
+                              className="w-full h-11 rounded-xl font-bold text-sm bg-blue-50 text-blue-600 border border-blue-100 cursor-not-allowed flex items-center justify-center gap-2"
+                            >
+                              <span>⏱ Waitlisted #{reg?.waitlistPosition}</span>
+                            </button>
+                          );
+                        }
+
                         if (status === 'rejected') {
                           return (
                             <button
@@ -2,10 +2,8 @@ import React, { useState } from 'react';
 import { useQuery, useQueryClient } from '@tanstack/react-query';
 
 import {
-  getBookmarkedEventsDetail,
   getFeedbacks,
-  getUserBadges,
-  getUserRegistrations,
+  getMySummary,
   submitFeedback,
   updateFeedback,
   getEvent
@@ -35,29 +33,18 @@ export const VolunteerDashboard: React.FC<Props> = ({ user }) => {
   const queryClient = useQueryClient();
 
   // --- Data Fetching (React Query) ---
-  const { data: registrations = [], isLoading: loadingRegs } = useQuery({
-    queryKey: ['userRegistrations', user.id],
-    queryFn: () => getUserRegistrations(user.id),
+  // One request for registrations, badges and saved events (GET /users/me/summary)
+  const { data: summary, isLoading: loading } = useQuery({
+    queryKey: ['mySummary', user.id],
+    queryFn: () => getMySummary(['registrations', 'badges', 'bookmarks']),
     staleTime: 1000 * 60 * 5
   });
-
-  const { data: badges = [] } = useQuery({
-    queryKey: ['userBadges', user.id],
-    queryFn: () => getUserBadges(user.id),
-    staleTime: 1000 * 60 * 30
-  });
-
-  const { data: bookmarkedEvents = [] } = useQuery({
-    queryKey: ['bookmarkedEventsDetail', user.id],
-    queryFn: () => getBookmarkedEventsDetail(),
-    staleTime: 1000 * 60 * 5
-  });
-
-  const loading = loadingRegs;
+  const registrations = summary?.registrations ?? [];
+  const badges = summary?.badges ?? [];
+  const bookmarkedEvents = summary?.bookmarkedEvents ?? [];
 
   const refreshData = () => {
-    queryClient.invalidateQueries({ queryKey: ['userRegistrations', user.id] });
-    queryClient.invalidateQueries({ queryKey: ['userBadges', user.id] });
+    queryClient.invalidateQueries({ queryKey: ['mySummary', user.id] });
   };
 
   // --- State: UI ---
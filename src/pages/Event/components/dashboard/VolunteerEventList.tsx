@@ -20,6 +20,7 @@ const getStatusPill = (status: string) => {
         case 'confirmed': return <span className="inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-bold bg-green-100 text-green-700">✓ Approved</span>;
         case 'pending': return <span className="inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-bold bg-yellow-100 text-yellow-700">⏳ Pending</span>;
         case 'rejected': return <span className="inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-bold bg-red-100 text-red-700">✕ Rejected</span>;
+        case 'waitlisted': return <span className="inline-flex items-center px-2.5 py-0.5 rounded-full text-xs font-bold bg-blue-100 text-blue-700">⏱ Waitlisted</span>;
         default: return null;
     }
 };
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { Event, Registration, Badge, Feedback, EventWithStats } from '../types';
+import { Event, Registration, Badge, Feedback, EventWithStats, Page, RatingSummary, LeaderboardEntry, BulkRegistrationResponse, UserSummary, UserSummarySection, BookmarkChange, BookmarkDelta, BulkEventImportResponse } from '../types';
 
 // ============================================================================
 // API Client Configuration
@@ -68,8 +68,23 @@ api.interceptors.response.use(
     NProgress.done();
     return response;
   },
-  (error) => {
+  async (error) => {
     NProgress.done();
+    // Shed by the server's admission control (503 + Retry-After): the request never ran, so an
+    // idempotent one is retried once after the advised delay (capped, with jitter)
+    const config = error.config;
+    const method = (config?.method || 'get').toLowerCase();
+    if (
+      error.response?.status === 503 &&
+      error.response.headers?.['retry-after'] &&
+      config && !config._shedRetried &&
+      ['get', 'head', 'put', 'delete'].includes(method)
+    ) {
+      config._shedRetried = true;
+      const seconds = Math.min(Number(error.response.headers['retry-after']) || 1, 5);
+      await new Promise((resolve) => setTimeout(resolve, seconds * 1000 + Math.random() * 500));
+      return api(config);
+    }
     return Promise.reject(error);
   }
 );
@@ -102,6 +117,28 @@ export const getEvents = async (
   return data;
 };
 
+/**
+ * Fetch one page of events using cursor (keyset) pagination.
+ * Start with an empty cursor; deep pages cost the same as the first one.
+ */
+export const getEventsPage = async (
+  cursor: string = '',
+  limit: number = 20,
+  filters: { status?: string; category?: string; locationCategory?: string; search?: string } = {}
+): Promise<Page<Event>> => {
+  const params = new URLSearchParams();
+  if (filters.status) params.append('status', filters.status);
+  if (filters.category && filters.category !== 'All') params.append('category', filters.category);
+  if (filters.locationCategory && filters.locationCategory !== 'All') params.append('locationCategory', filters.locationCategory);
+  if (filters.search) params.append('search', filters.search);
+
+  params.append('cursor', cursor);
+  params.append('limit', limit.toString());
+
+  const { data } = await api.get(`/events?${params.toString()}`);
+  return data;
+};
+
 /**
  * Fetch a single event by ID.
  */
@@ -136,6 +173,22 @@ export const createEvent = async (eventData: Partial<Event>): Promise<Event> =>
   return data;
 };
 
+/**
+ * Create many events at once from event bodies or a CSV file (header row = field names).
+ * Invalid rows are reported per row; with `atomic` any invalid row cancels the whole import.
+ */
+export const bulkCreateEvents = async (
+  events: Partial<Event>[] | File,
+  options: { atomic?: boolean; organizerName?: string } = {}
+): Promise<BulkEventImportResponse> => {
+  const isFile = events instanceof File;
+  const { data } = await api.post('/events:bulk', isFile ? await events.text() : events, {
+    params: options,
+    headers: isFile ? { 'Content-Type': 'text/csv' } : undefined,
+  });
+  return data;
+};
+
 export const updateEvent = async (eventId: string, eventData: Partial<Event>): Promise<Event> => {
   const { data } = await api.put(`/events/${eventId}`, eventData);
   return data;
@@ -168,6 +221,14 @@ export const updateRegistrationStatus = async (registrationId: string, status: '
   return data;
 };
 
+export const bulkUpdateRegistrationStatus = async (
+  eventId: string,
+  updates: { registrationId: string; status: Registration['status'] }[]
+): Promise<BulkRegistrationResponse> => {
+  const { data } = await api.patch(`/events/${eventId}/registrations`, updates);
+  return data;
+};
+
 export const getUserRegistrations = async (userId: string): Promise<Registration[]> => {
   const { data } = await api.get(`/users/${userId}/registrations`);
   return data;
@@ -185,6 +246,24 @@ export const toggleBookmark = async (userId: string, eventId: string): Promise<s
   return data;
 };
 
+/**
+ * Set or clear one bookmark of the signed-in user. Idempotent, so safe to retry.
+ */
+export const setBookmark = async (eventId: string, bookmarked: boolean): Promise<BookmarkChange> => {
+  const url = `/users/me/bookmarks/${encodeURIComponent(eventId)}`;
+  const { data } = bookmarked ? await api.put(url) : await api.delete(url);
+  return data;
+};
+
+/**
+ * Apply queued bookmark changes and get everything that changed after `since`
+ * (the `version` of the previous sync; omit it for the full list).
+ */
+export const syncBookmarks = async (add: string[], remove: string[], since?: number): Promise<BookmarkDelta> => {
+  const { data } = await api.post('/users/me/bookmarks:sync', { add, remove, since });
+  return data;
+};
+
 /**
  * Fetch full event details for all bookmarked items (Optimized batch fetch).
  */
@@ -193,6 +272,17 @@ export const getBookmarkedEventsDetail = async (): Promise<Event[]> => {
   return data;
 };
 
+// --- Dashboard Summary ---
+
+/**
+ * Registrations, bookmarks, badges and feedback prompts of the signed-in user in one request.
+ * Pass `include` to fetch only the sections a view renders.
+ */
+export const getMySummary = async (include?: UserSummarySection[]): Promise<UserSummary> => {
+  const { data } = await api.get('/users/me/summary', { params: include ? { include: include.join(',') } : {} });
+  return data;
+};
+
 // --- Badges ---
 
 export const getUserBadges = async (userId: string): Promise<Badge[]> => {
@@ -200,6 +290,11 @@ export const getUserBadges = async (userId: string): Promise<Badge[]> => {
   return data;
 };
 
+export const getLeaderboard = async (cursor = '', limit = 20): Promise<Page<LeaderboardEntry>> => {
+  const { data } = await api.get('/leaderboard', { params: { limit, ...(cursor ? { cursor } : {}) } });
+  return data;
+};
+
 // ============================================================================
 // Feedback System
 // ============================================================================
@@ -209,6 +304,15 @@ export const getEventAverageRating = async (eventId: string): Promise<number> =>
   return data.average;
 };
 
+/**
+ * Fetch ratings for a whole page of events in one request.
+ */
+export const getEventRatings = async (eventIds: string[]): Promise<Record<string, RatingSummary>> => {
+  if (eventIds.length === 0) return {};
+  const { data } = await api.get('/events/ratings', { params: { ids: eventIds.join(',') } });
+  return data;
+};
+
 export const getFeedbacks = async (userId?: string, eventId?: string): Promise<Feedback[]> => {
   const params = new URLSearchParams();
   if (userId) params.append('userId', userId);
@@ -57,6 +57,19 @@ export interface Event {
   // Organizer Info
   organizerId: string;
   organizerName: string;
+
+  // Denormalized rating counters (average = ratingSum / ratingCount)
+  ratingSum?: number;
+  ratingCount?: number;
+
+  // Change tracking (bumped on every write; drives ETag / Last-Modified)
+  version?: number;
+  updatedAt?: string;
+}
+
+export interface RatingSummary {
+  average: number;
+  count: number;
 }
 
 export interface EventWithStats extends Event {
@@ -65,6 +78,19 @@ export interface EventWithStats extends Event {
   feedbackCount: number;
 }
 
+// Cursor-paginated response. Pass nextCursor back to fetch the following page (null = last page).
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
+export interface LeaderboardEntry {
+  userId: string;
+  userName?: string;
+  userAvatar?: string;
+  completedMissions: number;
+}
+
 // ==========================================
 // Interaction Domain (Registrations, Feedback)
 // ==========================================
@@ -73,8 +99,10 @@ export interface Registration {
   id: string;
   eventId: string;
   userId: string;
-  status: 'pending' | 'confirmed' | 'rejected';
+  status: 'pending' | 'confirmed' | 'rejected' | 'waitlisted';
   joinedAt: string;
+  // 1-based ticket while waitlisted (instant signup mode)
+  waitlistPosition?: number | null;
 
   // Flattened event details (Joined from backend)
   eventTitle?: string;
@@ -89,6 +117,64 @@ export interface Registration {
   userAvatar?: string;
 }
 
+export interface BookmarkChange {
+  eventId: string;
+  bookmarked: boolean;
+  // false when the bookmark was already in that state (retries are harmless)
+  changed: boolean;
+  version: number;
+}
+
+// POST /users/me/bookmarks:sync: what changed after the client's version (everything when `full`)
+export interface BookmarkDelta {
+  version: number;
+  full: boolean;
+  added: string[];
+  removed: string[];
+}
+
+// POST /events:bulk: ids of the created events (row order) and why the other rows were skipped
+export interface BulkEventImportResponse {
+  created: string[];
+  errors: { row: number; errors: { field: string | null; message: string }[] }[];
+  summary: { received: number; created: number; failed: number };
+}
+
+// A completed event the volunteer attended but hasn't reviewed yet
+export interface FeedbackPrompt {
+  registrationId: string;
+  eventId: string;
+  eventTitle: string;
+  eventDate: string;
+}
+
+export type UserSummarySection = 'registrations' | 'bookmarks' | 'badges' | 'feedbackPrompts';
+
+// GET /users/me/summary: only the requested sections are present
+export interface UserSummary {
+  registrations?: Registration[];
+  bookmarks?: string[];
+  bookmarkedEvents?: Event[];
+  badges?: Badge[];
+  feedbackPrompts?: FeedbackPrompt[];
+}
+
+export interface BulkRegistrationResult {
+  registrationId: string;
+  status?: Registration['status'];
+  result: 'updated' | 'unchanged' | 'not_found' | 'duplicate' | 'invalid_status' | 'quota_exceeded';
+}
+
+export interface BulkRegistrationResponse {
+  eventId: string;
+  currentVolunteers: number;
+  maxVolunteers: number;
+  summary: Partial<Record<BulkRegistrationResult['result'], number>>;
+  results: BulkRegistrationResult[];
+  // Waitlisted registrations confirmed into seats the batch freed
+  promoted: string[];
+}
+
 export interface Feedback {
   id: string;
   eventId: string;